@@ -0,0 +1,103 @@
+"""Benchmark cold config loads through ``get_config``.
+
+Each measurement starts from an empty in-process cache, as a fresh ``lizzy``
+process would, for configs with 10, 1k and 10k ``gitlab.components``. It
+compares a bare ``json.load`` with ``get_config`` parsing and merging the
+JSON, and with ``get_config`` loading the validated snapshot, both without
+and with a profile overlay.
+
+Run with ``python benchmarks/bench_config_snapshot.py``.
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from lizzy.helpers.config import _cache, get_config, set_profile, snapshot_path
+
+COMPONENT_COUNTS = (10, 1_000, 10_000)
+REPEATS = 20
+
+
+def make_config(component_count: int) -> dict:
+    """Build a config with ``component_count`` GitLab components."""
+    return {
+        "aws": {"accounts": [{"name": "dev", "id": "123456789"}]},
+        "gitlab": {
+            "api_token": "token",
+            "components": [
+                {
+                    "name": f"component-{index}",
+                    "project_name_with_namespace": f"group/project-{index}",
+                    "branch": "develop",
+                }
+                for index in range(component_count)
+            ],
+        },
+    }
+
+
+def best_of(func, setup=lambda: None) -> float:
+    """Return the fastest of ``REPEATS`` runs in milliseconds."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def cold_get_config(path: Path, profile: str, use_snapshot: bool) -> float:
+    """Time ``get_config`` from an empty cache, with or without a snapshot."""
+
+    def setup():
+        _cache.clear()
+        if not use_snapshot:
+            snapshot_path(path, profile).unlink(missing_ok=True)
+
+    os.environ["LIZZY_CONFIG_SNAPSHOT"] = "1" if use_snapshot else "0"
+    set_profile(profile)
+    try:
+        get_config()
+        return best_of(get_config, setup)
+    finally:
+        set_profile(None)
+        del os.environ["LIZZY_CONFIG_SNAPSHOT"]
+
+
+def main() -> None:
+    print(
+        f"{'components':>10} {'profile':>8} {'json.load ms':>13} "
+        f"{'get_config ms':>14} {'snapshot ms':>12} {'speedup':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        overlay = Path(tmp) / "work.json"
+        overlay.write_text(json.dumps({"gitlab": {"username": "worker"}}))
+        for component_count in COMPONENT_COUNTS:
+            path = Path(tmp) / f"config-{component_count}.json"
+            path.write_text(json.dumps(make_config(component_count), indent=4))
+
+            def load(path=path):
+                with open(path) as f:
+                    json.load(f)
+
+            json_ms = best_of(load)
+            with patch("lizzy.helpers.config.config_path", return_value=path), patch(
+                "lizzy.helpers.config.profile_path", return_value=overlay
+            ):
+                for profile in (None, "work"):
+                    parse_ms = cold_get_config(path, profile, use_snapshot=False)
+                    snapshot_ms = cold_get_config(path, profile, use_snapshot=True)
+                    print(
+                        f"{component_count:>10} {profile or '-':>8} {json_ms:>13.3f} "
+                        f"{parse_ms:>14.3f} {snapshot_ms:>12.3f} "
+                        f"{parse_ms / snapshot_ms:>7.1f}x"
+                    )
+
+
+if __name__ == "__main__":
+    main()
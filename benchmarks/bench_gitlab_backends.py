@@ -0,0 +1,180 @@
+"""Benchmark GitLab round-trips of the merge-approved backends.
+
+Counts the HTTP requests each backend needs to check every open merge
+request of the user in a group: the REST scan over every project, the REST
+group-level listing and the batched GraphQL query. The client is an
+in-process fake that counts one request per page of 20 (REST) or per
+GraphQL page, so the numbers are exact and need no GitLab instance.
+
+Run with ``python benchmarks/bench_gitlab_backends.py``.
+"""
+
+import math
+from types import SimpleNamespace
+
+import click
+
+from lizzy.helpers.gitlab import (
+    GRAPHQL_PAGE_SIZE,
+    graphql_merge_candidates,
+    scan_group_merge_requests,
+    scan_projects,
+)
+
+REST_PAGE_SIZE = 20
+# (projects in the group, projects with open MRs by the user, MRs per project)
+SCENARIOS = ((10, 3, 2), (100, 10, 3), (500, 20, 5))
+
+
+class Counter:
+    """Count round-trips across the fake client."""
+
+    def __init__(self):
+        self.requests = 0
+
+    def pages(self, items: list) -> list:
+        self.requests += max(1, math.ceil(len(items) / REST_PAGE_SIZE))
+        return items
+
+    def one(self, value):
+        self.requests += 1
+        return value
+
+
+def make_mr(counter: Counter, path: str, iid: int, project_id: int):
+    """Return a green, approved merge request by the user."""
+    detail = SimpleNamespace(
+        pipelines=SimpleNamespace(
+            list=lambda **kwargs: counter.one([SimpleNamespace(status="success")])
+        ),
+        approvals=SimpleNamespace(
+            get=lambda: counter.one(
+                SimpleNamespace(approved_by=[{"user": {"username": "approver"}}])
+            )
+        ),
+        merge=lambda: None,
+    )
+    return SimpleNamespace(
+        iid=iid,
+        title=f"{path} !{iid}",
+        web_url=f"https://gitlab.example/{path}/-/merge_requests/{iid}",
+        author={"username": "me"},
+        project_id=project_id,
+        references={"full": f"{path}!{iid}"},
+        detail=detail,
+    )
+
+
+def make_gitlab(counter: Counter, project_count: int, active: int, mrs_per_project: int):
+    """Return a fake client and group for one scenario."""
+    projects, listings, merge_requests = [], {}, []
+    for project_id in range(project_count):
+        path = f"group/project-{project_id}"
+        mrs = [
+            make_mr(counter, path, iid, project_id)
+            for iid in range(1, mrs_per_project + 1)
+            if project_id < active
+        ]
+        merge_requests.extend(mrs)
+        projects.append(SimpleNamespace(id=project_id, name=path))
+        listings[project_id] = listings[path] = mrs
+
+    def project(project_id, lazy=False):
+        mrs = listings[project_id]
+        proj = SimpleNamespace(
+            mergerequests=SimpleNamespace(
+                list=lambda **kwargs: counter.pages(mrs),
+                get=lambda iid, lazy=False: (
+                    SimpleNamespace(merge=lambda: None)
+                    if lazy
+                    else counter.one(mrs[iid - 1].detail)
+                ),
+            )
+        )
+        return proj if lazy else counter.one(proj)
+
+    def post(url, json, **kwargs):
+        first, after = json["variables"]["first"], int(json["variables"]["after"] or 0)
+        nodes = [
+            {
+                "iid": str(mr.iid),
+                "title": mr.title,
+                "webUrl": mr.web_url,
+                "project": {"fullPath": mr.references["full"].split("!")[0]},
+                "author": {"username": "me"},
+                "headPipeline": {"status": "SUCCESS"},
+                "approvedBy": {"nodes": [{"username": "approver"}]},
+            }
+            for mr in merge_requests[after : after + first]
+        ]
+        more = after + first < len(merge_requests)
+        page = {
+            "pageInfo": {"hasNextPage": more, "endCursor": str(after + first)},
+            "nodes": nodes,
+        }
+        data = {"data": {"group": {"mergeRequests": page}}}
+        return counter.one(SimpleNamespace(status_code=200, json=lambda: data))
+
+    gl = SimpleNamespace(
+        url="https://gitlab.example",
+        private_token="token",
+        timeout=None,
+        session=SimpleNamespace(post=post),
+        projects=SimpleNamespace(get=project),
+    )
+    group = SimpleNamespace(
+        full_path="group",
+        projects=SimpleNamespace(list=lambda **kwargs: counter.pages(projects)),
+        mergerequests=SimpleNamespace(list=lambda **kwargs: counter.pages(merge_requests)),
+    )
+    return gl, group
+
+
+def rest_projects(gl, group):
+    """List the MRs of every project (the default REST scan)."""
+    return scan_projects(gl, group.projects.list(include_subgroups=True, all=True), "me")
+
+
+def rest_group(gl, group):
+    """List the user's MRs with the group endpoint, then check each over REST."""
+    return scan_group_merge_requests(gl, group, "me")
+
+
+def graphql(gl, group):
+    """Fetch the MRs with their pipeline and approvers in GraphQL pages."""
+    return graphql_merge_candidates(gl, group.full_path, "me")
+
+
+def measure(backend, scenario) -> tuple:
+    """Return (round-trips, candidates found) for one backend and scenario."""
+    counter = Counter()
+    gl, group = make_gitlab(counter, *scenario)
+    candidates = backend(gl, group)
+    return counter.requests, len(candidates)
+
+
+def main() -> None:
+    print(
+        f"{'projects':>9} {'MRs':>5} {'REST projects':>14} {'REST group':>11} "
+        f"{'GraphQL':>8} {'fewer':>6}"
+    )
+    echo, click.echo = click.echo, lambda *args, **kwargs: None
+    try:
+        for scenario in SCENARIOS:
+            backends = (rest_projects, rest_group, graphql)
+            counts = [measure(backend, scenario) for backend in backends]
+            assert len({found for _, found in counts}) == 1, counts
+            projects_calls, group_calls, graphql_calls = (calls for calls, _ in counts)
+            project_count, active, mrs_per_project = scenario
+            fewer = projects_calls / graphql_calls
+            print(
+                f"{project_count:>9} {active * mrs_per_project:>5} {projects_calls:>14} "
+                f"{group_calls:>11} {graphql_calls:>8} {fewer:>5.0f}x"
+            )
+    finally:
+        click.echo = echo
+    print(f"\nPages hold {REST_PAGE_SIZE} items over REST, {GRAPHQL_PAGE_SIZE} over GraphQL.")
+
+
+if __name__ == "__main__":
+    main()
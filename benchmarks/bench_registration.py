@@ -0,0 +1,84 @@
+"""Benchmark command registration with and without flat alias duplicates.
+
+Before aliases were resolved at dispatch time, every ``register()`` built each
+command twice: once under its group and once as a flat ``"group command"``
+entry on the root group. This compares both styles as command modules are
+added.
+
+Run with ``python benchmarks/bench_registration.py``.
+"""
+
+import time
+import tracemalloc
+
+import click
+
+SUBCOMMANDS_PER_MODULE = 5
+MODULE_COUNTS = (6, 25, 100)
+REPEATS = 20
+
+
+def register_module(root: click.Group, index: int, with_aliases: bool) -> None:
+    """Register one synthetic command module the way commands/*.py do."""
+
+    @root.group(name=f"module{index}")
+    def group():
+        """Synthetic command group."""
+
+    for sub in range(SUBCOMMANDS_PER_MODULE):
+
+        @group.command(name=f"command{sub}")
+        @click.option("--value", help="Synthetic option")
+        def command(value):
+            """Synthetic command."""
+
+        if with_aliases:
+
+            @root.command(name=f"module{index} command{sub}")
+            @click.option("--value", help="Synthetic option")
+            def alias(value):
+                """Synthetic command."""
+
+
+def build_tree(module_count: int, with_aliases: bool) -> click.Group:
+    """Build a root group with ``module_count`` synthetic modules."""
+    root = click.Group(name="lizzy")
+    for index in range(module_count):
+        register_module(root, index, with_aliases)
+    return root
+
+
+def measure(module_count: int, with_aliases: bool) -> tuple:
+    """Return (best build time in ms, retained memory in KiB)."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        build_tree(module_count, with_aliases)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    tree = build_tree(module_count, with_aliases)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return best * 1000, retained / 1024
+
+
+def main() -> None:
+    print(
+        f"{'modules':>8} {'commands':>9} {'dup ms':>8} {'alias ms':>9} "
+        f"{'dup KiB':>9} {'alias KiB':>10} {'saved':>6}"
+    )
+    for module_count in MODULE_COUNTS:
+        dup_ms, dup_kib = measure(module_count, with_aliases=True)
+        alias_ms, alias_kib = measure(module_count, with_aliases=False)
+        commands = module_count * SUBCOMMANDS_PER_MODULE
+        saved = 1 - alias_ms / dup_ms
+        print(
+            f"{module_count:>8} {commands:>9} {dup_ms:>8.2f} {alias_ms:>9.2f} "
+            f"{dup_kib:>9.1f} {alias_kib:>10.1f} {saved:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Command modules for the Lizzy CLI.
+
+Every ``BaseCommand`` subclass in this package is described in the cached
+command manifest (see ``lizzy.manifest``); modules are imported lazily.
+"""
@@ -1,6 +1,6 @@
 import click
 
-from lizzy.helpers.aws import get_aws_credentials, get_config_accounts
+from lizzy import output
 from lizzy.cli import BaseCommand
 
 
@@ -11,7 +11,7 @@ class AWSCommands(BaseCommand):
     def register(command_group):
         @command_group.group()
         def aws():
-            """Manage AWS operations: authenticate, fargate-restart, fargate-restart-all"""
+            """Manage AWS operations: authenticate, fargate-restart, fargate-restart-all, fargate-restart-matching, inventory, watch"""
             pass
 
         @aws.command()
@@ -20,35 +20,190 @@ class AWSCommands(BaseCommand):
             AWSCommands._authenticate()
 
         @aws.command(name="fargate-restart")
-        def fargate_restart():
+        @click.option("--cluster", help="Cluster name, ARN or glob; prompts when omitted.")
+        @click.option("--service", help="Service name, ARN or glob; prompts when omitted.")
+        @click.option(
+            "--plan",
+            is_flag=True,
+            help="Only estimate tasks, duration and API calls; redeploy nothing.",
+        )
+        def fargate_restart(cluster, service, plan):
             """Restart an AWS Fargate task of a specific service."""
-            AWSCommands._fargate_restart()
+            AWSCommands._fargate_restart(cluster, service, plan)
 
         @aws.command(name="fargate-restart-all")
-        def fargate_restart_all():
+        @click.option("--cluster", help="Cluster name, ARN or glob; prompts when omitted.")
+        @click.option(
+            "--family",
+            "families",
+            multiple=True,
+            help="Only restart services whose task definition family matches (repeatable).",
+        )
+        @click.option(
+            "--wave-size",
+            default=None,
+            type=click.IntRange(min=1),
+            help="Restart this many services at a time, waiting for each wave to be stable.",
+        )
+        @click.option(
+            "--wait-timeout",
+            default=900,
+            show_default=True,
+            type=click.IntRange(min=1),
+            help="Seconds to wait for a wave to become stable.",
+        )
+        @click.option(
+            "--continue-on-failure",
+            is_flag=True,
+            help="Keep starting waves after a wave fails.",
+        )
+        @click.option(
+            "--plan",
+            is_flag=True,
+            help="Only estimate tasks, duration and API calls; redeploy nothing.",
+        )
+        def fargate_restart_all(
+            cluster, families, wave_size, wait_timeout, continue_on_failure, plan
+        ):
             """Restart all AWS Fargate tasks."""
-            AWSCommands._fargate_restart_all()
+            AWSCommands._fargate_restart_all(
+                wave_size, wait_timeout, continue_on_failure, cluster, families, plan
+            )
 
-        # Register individual commands that show in main help with space syntax
-        @command_group.command(name="aws authenticate")
-        def aws_authenticate_main():
-            """Authenticate AWS CLI with the provided credentials."""
-            AWSCommands._authenticate()
+        @aws.command(name="fargate-restart-matching")
+        @click.option(
+            "--service",
+            "services",
+            multiple=True,
+            required=True,
+            help="Service name glob, e.g. 'api-*' (repeatable).",
+        )
+        @click.option(
+            "--account",
+            "accounts",
+            multiple=True,
+            default=("*",),
+            show_default=True,
+            help="Account name or id glob from aws.accounts (repeatable).",
+        )
+        @click.option(
+            "--region",
+            "regions",
+            multiple=True,
+            help="AWS region (repeatable); defaults to aws.regions.",
+        )
+        @click.option(
+            "--cluster",
+            "clusters",
+            multiple=True,
+            default=("*",),
+            show_default=True,
+            help="Cluster name glob (repeatable).",
+        )
+        @click.option(
+            "--account-concurrency",
+            default=4,
+            show_default=True,
+            type=int,
+            help="Accounts processed in parallel.",
+        )
+        @click.option(
+            "--workers",
+            default=None,
+            type=int,
+            help="Concurrent redeploys per account (default aws.redeploy_workers).",
+        )
+        @click.option(
+            "--plan",
+            is_flag=True,
+            help="Only estimate tasks, duration and API calls; redeploy nothing.",
+        )
+        def fargate_restart_matching(
+            services, accounts, regions, clusters, account_concurrency, workers, plan
+        ):
+            """Restart matching services across accounts and regions without prompting."""
+            AWSCommands._fargate_restart_matching(
+                services, accounts, regions, clusters, account_concurrency, workers, plan
+            )
 
-        @command_group.command(name="aws fargate-restart")
-        def aws_fargate_restart_main():
-            """Restart an AWS Fargate task of a specific service."""
-            AWSCommands._fargate_restart()
+        @aws.command()
+        @click.option(
+            "--account",
+            "accounts",
+            multiple=True,
+            default=("*",),
+            show_default=True,
+            help="Account name or id glob from aws.accounts (repeatable).",
+        )
+        @click.option(
+            "--region",
+            "regions",
+            multiple=True,
+            help="AWS region (repeatable); defaults to aws.regions.",
+        )
+        @click.option(
+            "--cluster",
+            "clusters",
+            multiple=True,
+            default=("*",),
+            show_default=True,
+            help="Cluster name glob (repeatable).",
+        )
+        @click.option(
+            "--service",
+            "services",
+            multiple=True,
+            default=("*",),
+            show_default=True,
+            help="Service name glob (repeatable).",
+        )
+        @click.option(
+            "--launch-type",
+            type=click.Choice(["FARGATE", "EC2", "EXTERNAL"]),
+            help="Only list services of this launch type.",
+        )
+        @click.option("--refresh", is_flag=True, help="Refresh every region, even fresh ones.")
+        @click.option("--offline", is_flag=True, help="Only read the local snapshot.")
+        def inventory(accounts, regions, clusters, services, launch_type, refresh, offline):
+            """List ECS services from the local inventory snapshot."""
+            AWSCommands._inventory(
+                accounts, regions, clusters, services, launch_type, refresh, offline
+            )
 
-        @command_group.command(name="aws fargate-restart-all")
-        def aws_fargate_restart_all_main():
-            """Restart all AWS Fargate tasks."""
-            AWSCommands._fargate_restart_all()
+        @aws.command()
+        @click.option("--cluster", help="Cluster name, ARN or glob; prompts when omitted.")
+        @click.option(
+            "--service",
+            "services",
+            multiple=True,
+            default=("*",),
+            show_default=True,
+            help="Service name glob (repeatable).",
+        )
+        @click.option(
+            "--interval",
+            default=5,
+            show_default=True,
+            type=click.FloatRange(min=1),
+            help="Initial seconds between polls; grows while nothing changes.",
+        )
+        @click.option("--timeout", type=click.FloatRange(min=1), help="Stop after this many seconds.")
+        @click.option(
+            "--until-stable/--forever",
+            default=True,
+            show_default=True,
+            help="Stop once every service is stable or failed.",
+        )
+        def watch(cluster, services, interval, timeout, until_stable):
+            """Stream deployment status and events of ECS services."""
+            AWSCommands._watch(cluster, services, interval, timeout, until_stable)
 
     @staticmethod
     def _authenticate():
         """Authenticate AWS CLI with the provided credentials."""
-        click.echo("Authenticating AWS CLI.")
+        from lizzy.helpers.aws import get_aws_credentials, get_config_accounts
+
+        output.echo("Authenticating AWS CLI.")
         (
             aws_access_key_id,
             aws_secret_access_key,
@@ -56,26 +211,97 @@ class AWSCommands(BaseCommand):
             role_arn,
         ) = get_aws_credentials(get_config_accounts())
         # Set as environment variables
-        click.echo("Setting AWS CLI environment variables:")
-        click.echo(f'export AWS_ACCESS_KEY_ID="{aws_access_key_id}"')
-        click.echo(f'export AWS_SECRET_ACCESS_KEY="{aws_secret_access_key}"')
-        click.echo(f'export AWS_SESSION_TOKEN="{aws_session_token}"')
-        click.echo(f'export AWS_ROLE_ARN="{role_arn}"')
-        click.echo("AWS CLI has been authenticated.")
+        output.echo("Setting AWS CLI environment variables:")
+        output.emit(
+            "credentials",
+            f'export AWS_ACCESS_KEY_ID="{aws_access_key_id}"\n'
+            f'export AWS_SECRET_ACCESS_KEY="{aws_secret_access_key}"\n'
+            f'export AWS_SESSION_TOKEN="{aws_session_token}"\n'
+            f'export AWS_ROLE_ARN="{role_arn}"',
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            aws_session_token=aws_session_token,
+            role_arn=role_arn,
+        )
+        output.echo("AWS CLI has been authenticated.")
 
     @staticmethod
-    def _fargate_restart():
+    def _fargate_restart(cluster=None, service=None, plan=False):
         """Restart an AWS Fargate task of a specific service."""
         from lizzy.helpers.aws import run_aws_fargate_restart
 
-        click.echo("Restarting AWS Fargate task.")
-        run_aws_fargate_restart(all_services=False)
+        output.echo("Planning AWS Fargate restart." if plan else "Restarting AWS Fargate task.")
+        run_aws_fargate_restart(all_services=False, cluster=cluster, service=service, plan=plan)
 
     @staticmethod
-    def _fargate_restart_all():
+    def _fargate_restart_all(
+        wave_size=None,
+        wait_timeout=900,
+        continue_on_failure=False,
+        cluster=None,
+        families=(),
+        plan=False,
+    ):
         """Restart all AWS Fargate tasks."""
         from lizzy.helpers.aws import run_aws_fargate_restart
 
-        click.echo("Restarting all AWS Fargate tasks...")
-        run_aws_fargate_restart(all_services=True)
-        click.echo("All AWS Fargate services have been restarted.")
+        verb = "Planning restart of" if plan else "Restarting"
+        output.echo(f"{verb} all AWS Fargate tasks...")
+        run_aws_fargate_restart(
+            all_services=True,
+            wave_size=wave_size,
+            wait_timeout=wait_timeout,
+            abort_on_failure=not continue_on_failure,
+            cluster=cluster,
+            families=families,
+            plan=plan,
+        )
+        if not plan:
+            output.echo("All AWS Fargate services have been restarted.")
+
+    @staticmethod
+    def _fargate_restart_matching(
+        services, accounts, regions, clusters, account_concurrency, workers, plan=False
+    ):
+        """Restart matching services across accounts and regions without prompting."""
+        from lizzy.helpers.aws import run_aws_fargate_restart_matching
+
+        verb = "Planning restart of" if plan else "Restarting"
+        output.echo(f"{verb} services matching {', '.join(services)}...")
+        run_aws_fargate_restart_matching(
+            accounts,
+            services,
+            regions=regions,
+            cluster_patterns=clusters,
+            account_concurrency=account_concurrency,
+            workers=workers,
+            plan=plan,
+        )
+
+    @staticmethod
+    def _inventory(accounts, regions, clusters, services, launch_type, refresh, offline):
+        """List ECS services from the local inventory snapshot."""
+        from lizzy.helpers.aws import run_aws_inventory
+
+        run_aws_inventory(
+            accounts,
+            regions,
+            cluster_patterns=clusters,
+            service_patterns=services,
+            launch_type=launch_type,
+            refresh=refresh,
+            offline=offline,
+        )
+
+    @staticmethod
+    def _watch(cluster, services, interval, timeout, until_stable):
+        """Stream deployment status and events of ECS services."""
+        from lizzy.helpers.aws import run_aws_watch
+
+        run_aws_watch(
+            cluster,
+            services,
+            interval=interval,
+            timeout=timeout,
+            until_stable=until_stable,
+        )
@@ -1,5 +1,4 @@
-import click
-
+from lizzy import output
 from lizzy.cli import BaseCommand
 
 
@@ -23,29 +22,18 @@ class ChefCommands(BaseCommand):
             """Modify the Datadog version in Chef configurations."""
             ChefCommands._modify_datadog_version()
 
-        # Register individual commands that show in main help with space syntax
-        @command_group.command(name="chef modify-chef-version")
-        def chef_modify_chef_version_main():
-            """Modify the Chef version in Chef configurations."""
-            ChefCommands._modify_chef_version()
-
-        @command_group.command(name="chef modify-datadog-version")
-        def chef_modify_datadog_version_main():
-            """Modify the Datadog version in Chef configurations."""
-            ChefCommands._modify_datadog_version()
-
     @staticmethod
     def _modify_chef_version():
         """Modify the Chef version in Chef configurations."""
         from lizzy.helpers.chef import update_chef_version
-        click.echo("Modifying Chef version in Chef configurations.")
+        output.echo("Modifying Chef version in Chef configurations.")
         update_chef_version()
-        click.echo("Chef version has been updated successfully.")
+        output.echo("Chef version has been updated successfully.")
 
     @staticmethod
     def _modify_datadog_version():
         """Modify the Datadog version in Chef configurations."""
         from lizzy.helpers.chef import update_datadog_version
-        click.echo("Modifying Datadog version in Chef configurations.")
+        output.echo("Modifying Datadog version in Chef configurations.")
         update_datadog_version()
-        click.echo("Datadog version in Chef has been updated successfully.")
\ No newline at end of file
+        output.echo("Datadog version in Chef has been updated successfully.")
\ No newline at end of file
@@ -0,0 +1,77 @@
+import click
+
+from lizzy.cli import BaseCommand
+
+
+class DaemonCommands(BaseCommand):
+    """Manage the background lizzy daemon."""
+
+    @staticmethod
+    def register(command_group):
+        @command_group.group()
+        def daemon():
+            """Manage the lizzy daemon: start, stop, status"""
+            pass
+
+        @daemon.command()
+        @click.option(
+            "--idle-timeout",
+            default=900,
+            show_default=True,
+            type=int,
+            help="Seconds without requests before the daemon exits (0 to never exit).",
+        )
+        def start(idle_timeout):
+            """Start the daemon that keeps lizzy warm between commands."""
+            DaemonCommands._start(idle_timeout)
+
+        @daemon.command()
+        def stop():
+            """Stop the running daemon."""
+            DaemonCommands._stop()
+
+        @daemon.command()
+        def status():
+            """Show whether the daemon is running."""
+            DaemonCommands._status()
+
+    @staticmethod
+    def _start(idle_timeout):
+        """Start the daemon unless one is already running."""
+        from lizzy import daemon
+
+        status = daemon.request({"op": "ping"})
+        if status is not None:
+            click.echo(f"Daemon already running (pid {status['pid']}).")
+            return
+        daemon.start_daemon(idle_timeout)
+        status = daemon.wait_until_ready()
+        if status is None:
+            raise click.ClickException(
+                f"Daemon did not start, see {daemon.log_path()}."
+            )
+        click.echo(f"Daemon started (pid {status['pid']}).")
+
+    @staticmethod
+    def _stop():
+        """Ask the running daemon to shut down."""
+        from lizzy import daemon
+
+        if daemon.request({"op": "shutdown"}) is None:
+            click.echo("Daemon is not running.")
+        else:
+            click.echo("Daemon stopped.")
+
+    @staticmethod
+    def _status():
+        """Print the daemon's pid, uptime and request count."""
+        from lizzy import daemon
+
+        status = daemon.request({"op": "ping"})
+        if status is None:
+            click.echo("Daemon is not running.")
+            return
+        click.echo(
+            f"Daemon running (pid {status['pid']}), up {status['uptime']}s, "
+            f"{status['requests']} requests served, socket {daemon.socket_path()}."
+        )
@@ -1,5 +1,6 @@
 import click
 
+from lizzy import output
 from lizzy.cli import BaseCommand
 
 
@@ -34,113 +35,97 @@ class GitlabCommands(BaseCommand):
             GitlabCommands._merge_approved_yolo()
 
         @gitlab.command(name="remove-merged-branches")
-        def remove_merged_branches():
+        @click.option(
+            "--dry-run", is_flag=True, help="Only count the merged branches that would be removed."
+        )
+        @click.option(
+            "--protect",
+            multiple=True,
+            metavar="PATTERN",
+            help="Also keep branches matching this glob (repeatable).",
+        )
+        def remove_merged_branches(dry_run, protect):
             """Remove all merged branches in GitLab."""
-            GitlabCommands._remove_merged_branches()
+            GitlabCommands._remove_merged_branches(dry_run, protect)
 
         @gitlab.command(name="update-image-of-container")
         def update_image_of_container():
             """Update the image of a container in a GitLab CI/CD pipeline."""
             GitlabCommands._update_image_of_container()
 
-        # Register individual commands that show in main help with space syntax
-        @command_group.command(name="gitlab develop-to-main")
-        def gitlab_develop_to_main_main():
-            """Create merge requests to switch from develop to main branch."""
-            GitlabCommands._develop_to_main()
-
-        @command_group.command(name="gitlab main-to-develop")
-        def gitlab_main_to_develop_main():
-            """Create merge requests to switch from main to develop branch."""
-            GitlabCommands._main_to_develop()
-
-        @command_group.command(name="gitlab merge-approved")
-        def gitlab_merge_approved_main():
-            """Merge all approved merge requests from my user."""
-            GitlabCommands._merge_approved()
-
-        @command_group.command(name="gitlab remove-merged-branches")
-        def gitlab_remove_merged_branches_main():
-            """Remove all merged branches in GitLab."""
-            GitlabCommands._remove_merged_branches()
-
-        @command_group.command(name="gitlab update-image-of-container")
-        def gitlab_update_image_of_container_main():
-            """Update the image of a container in a GitLab CI/CD pipeline."""
-            GitlabCommands._update_image_of_container()
-
     @staticmethod
     def _develop_to_main():
         """Create merge requests to switch from develop to main branch."""
         from lizzy.helpers.gitlab import develop_to_main
         develop_to_main()
-        click.echo("Switched GitLab branches from develop to main.")
+        output.echo("Switched GitLab branches from develop to main.")
 
     @staticmethod
     def _main_to_develop():
         """Create merge requests to switch from main to develop branch."""
         from lizzy.helpers.gitlab import main_to_develop
         main_to_develop()
-        click.echo("Switched GitLab branches from main to develop.")
+        output.echo("Switched GitLab branches from main to develop.")
 
     @staticmethod
     def _merge_approved():
         """Merge all approved merge requests from my user."""
         from lizzy.helpers.gitlab import fetch_approved_merge_requests
         fetch_approved_merge_requests()
-        click.echo("Merged approved pull requests from GitLab.")
+        output.echo("Merged approved pull requests from GitLab.")
     
     @staticmethod
     def _merge_approved_yolo():
         """Merge all approved merge requests from my user."""
         from lizzy.helpers.gitlab import fetch_approved_merge_requests
         fetch_approved_merge_requests(yolo=True)
-        click.echo("Merged approved pull requests from GitLab.")
+        output.echo("Merged approved pull requests from GitLab.")
         
 
     @staticmethod
-    def _remove_merged_branches():
+    def _remove_merged_branches(dry_run=False, protect=()):
         """Remove all merged branches in GitLab."""
         from lizzy.helpers.gitlab import remove_merged_branches
-        remove_merged_branches()
-        click.echo("Removed merged branches from GitLab.")
+        remove_merged_branches(dry_run=dry_run, protect=protect)
+        if not dry_run:
+            output.echo("Removed merged branches from GitLab.")
 
     @staticmethod
     def _update_image_of_container():
         """Update the image of a container in a GitLab CI/CD pipeline."""
-        from lizzy.helpers.config import get_setting
+        from lizzy.helpers.config_model import get_config_model
         from lizzy.helpers.gitlab import setup_gitlab
         
-        components = get_setting("gitlab.components")
-        environments = get_setting("gitlab.environments")
-        components = components if components else []
+        config = get_config_model()
+        components = config.components
+        environments = config.environments
         if not components:
-            click.echo("No components found in configuration.")
+            output.echo("No components found in configuration.")
             return
 
         gl = setup_gitlab()
         
         # Get user inputs
-        component_name = click.prompt(
+        component_name = output.prompt(
             "Select a component",
-            type=click.Choice([comp["name"] for comp in components]),
+            type=click.Choice([comp.name for comp in components]),
             show_choices=True,
         )
         
-        selected_component = next(comp for comp in components if comp["name"] == component_name)
+        selected_component = config.component(component_name).as_dict()
         
-        environment = click.prompt(
+        environment = output.prompt(
             f"Select an environment for {component_name}",
             type=click.Choice(environments),
             show_choices=True,
         )
         
-        new_image = click.prompt(f"Enter the new image for {component_name} in {environment}")
+        new_image = output.prompt(f"Enter the new image for {component_name} in {environment}")
         
         # Update the component image
         GitlabCommands._process_gitlab_update(gl, selected_component, environment, new_image)
         
-        click.echo(f"Updated {component_name} image to {new_image} in {environment} environment.")
+        output.echo(f"Updated {component_name} image to {new_image} in {environment} environment.")
 
     @staticmethod
     def _process_gitlab_update(gl, component, environment, new_image):
@@ -179,10 +164,10 @@ class GitlabCommands(BaseCommand):
                     'description': f"Automated update of {component['name']} image to {new_image}"
                 })
                 
-                click.echo(f"Created merge request: {mr.web_url}")
+                output.echo(f"Created merge request: {mr.web_url}")
                 
             except Exception as e:
-                click.echo(f"Error updating file: {e}")
+                output.echo(f"Error updating file: {e}")
                 
         except Exception as e:
-            click.echo(f"Error processing GitLab update: {e}")
\ No newline at end of file
+            output.echo(f"Error processing GitLab update: {e}")
\ No newline at end of file
@@ -23,17 +23,6 @@ class SelfCommands(BaseCommand):
             """Update the Lizzy CLI itself."""
             SelfCommands._update()
 
-        # Register individual commands that show in main help with space syntax
-        @command_group.command(name="self config")
-        def self_config_main():
-            """Create or open the config file in ~/.lizzy/config.json using vim."""
-            SelfCommands._config()
-
-        @command_group.command(name="self update")
-        def self_update_main():
-            """Update the Lizzy CLI itself."""
-            SelfCommands._update()
-
     @staticmethod
     def _config():
         """Create or open the config file in ~/.lizzy/config.json using vim."""
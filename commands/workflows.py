@@ -36,23 +36,6 @@ class WorkflowsCommand(BaseCommand):
             """List all available workflows."""
             WorkflowsCommand._list_workflows()
 
-        # Register individual commands that show in main help with space syntax
-        @command_group.command(name="workflows create")
-        def workflows_create_main():
-            """Create a new workflow."""
-            WorkflowsCommand._create_workflow()
-
-        @command_group.command(name="workflows run")
-        @click.argument('workflow_name', required=False)
-        def workflows_run_main(workflow_name):
-            """Run a workflow by name."""
-            WorkflowsCommand._run_workflow(workflow_name)
-
-        @command_group.command(name="workflows list")
-        def workflows_list_main():
-            """List all available workflows."""
-            WorkflowsCommand._list_workflows()
-
     @staticmethod
     def _get_workflows_dir():
         """Get the workflows directory path."""
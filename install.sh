@@ -1,2 +1,3 @@
 pip uninstall -y lizzy-cli
-pip install -e .
\ No newline at end of file
+pip install -e .
+python -m lizzy.manifest
@@ -1 +1,2 @@
 # lizzy package init
+__version__ = "0.1.2"
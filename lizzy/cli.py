@@ -1,11 +1,14 @@
+import functools
 import importlib
 import inspect
 import pkgutil
-import sys
 
 import click
 
 import commands
+from lizzy import output, profiling
+from lizzy.helpers.config import set_profile
+from lizzy.manifest import load_manifest
 
 ASCII_ART = """
 ⠀⠀⠀⠀⠀⢀⣠⣤⡀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
@@ -38,13 +41,190 @@ class BaseCommand:
         raise NotImplementedError("Subclasses must implement the register method.")
 
 
-@click.group()
+def _command_classes(module):
+    """Yield the BaseCommand subclasses defined in a command module."""
+    for _, obj in inspect.getmembers(module):
+        if inspect.isclass(obj) and issubclass(obj, BaseCommand) and obj is not BaseCommand:
+            yield obj
+
+
+def _short_help(text: str, limit: int) -> str:
+    """Shorten a manifest help string the way click shortens docstrings."""
+    first_line = text.strip().split("\n", 1)[0]
+    if len(first_line) <= limit:
+        return first_line
+    return first_line[: max(limit - 3, 0)].rsplit(" ", 1)[0] + "..."
+
+
+class LazyGroup(click.Group):
+    """Click group that imports command modules only when a command is resolved.
+
+    ``manifest_loader`` returns a mapping of command name to a manifest entry
+    holding the owning ``module``, its ``help`` text and, for groups, its
+    subcommands. Listing and help rendering use the manifest; the module is
+    imported and registered on first lookup.
+
+    Flat names such as ``"aws authenticate"`` are aliases resolved at dispatch
+    time to the ``authenticate`` command of the ``aws`` group, so each command
+    is only built once.
+    """
+
+    def __init__(self, *args, manifest_loader=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._manifest_loader = manifest_loader
+        self._lazy_commands = None
+        self._loaded_modules = set()
+
+    @property
+    def lazy_commands(self) -> dict:
+        """Return the manifest entries, loading them on first access."""
+        if self._lazy_commands is None:
+            with profiling.phase("load manifest"):
+                self._lazy_commands = (
+                    self._manifest_loader() if self._manifest_loader else {}
+                )
+        return self._lazy_commands
+
+    def list_commands(self, ctx):
+        return sorted(set(self.commands) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if " " in cmd_name:
+            return self._resolve_alias(ctx, cmd_name)
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            self.load_module(self.lazy_commands[cmd_name]["module"])
+        return super().get_command(ctx, cmd_name)
+
+    def _resolve_alias(self, ctx, alias: str):
+        """Resolve a flat ``"group command"`` alias to the grouped command."""
+        group_name, _, sub_name = alias.partition(" ")
+        group = self.get_command(ctx, group_name)
+        if not isinstance(group, click.Group):
+            return None
+        return group.get_command(ctx, sub_name.strip())
+
+    def load_module(self, module_name: str) -> None:
+        """Import a command module and register its commands on this group."""
+        if module_name in self._loaded_modules:
+            return
+        self._loaded_modules.add(module_name)
+        with profiling.phase(f"load {module_name}"):
+            module = importlib.import_module(module_name)
+            for command_class in _command_classes(module):
+                command_class.register(self)
+
+    def invoke(self, ctx):
+        with profiling.phase("command"):
+            return super().invoke(ctx)
+
+    def help_rows(self, ctx) -> list:
+        """Return (name, help text) rows for every visible command and alias.
+
+        Commands that are not imported yet are described by their manifest
+        entry, so listing them does not load any command module.
+        """
+        rows = []
+        for name in self.list_commands(ctx):
+            entry = self.lazy_commands.get(name)
+            if entry is None:
+                command = self.commands[name]
+                if not command.hidden:
+                    rows.append((name, command.short_help or command.help or ""))
+                continue
+            rows.append((name, entry.get("help", "")))
+            for sub_name, sub_entry in sorted(entry.get("commands", {}).items()):
+                rows.append((f"{name} {sub_name}", sub_entry.get("help", "")))
+        return rows
+
+    def format_commands(self, ctx, formatter):
+        """Render the command list, aliases included, from the manifest."""
+        rows = self.help_rows(ctx)
+        if not rows:
+            return
+        limit = formatter.width - 6 - max(len(name) for name, _ in rows)
+        with formatter.section("Commands"):
+            formatter.write_dl(
+                [(name, _short_help(help_text, limit)) for name, help_text in rows]
+            )
+
+
+def _start_profiling(ctx, param, value):
+    """Start the run profiler and report when the root context closes."""
+    if not value or ctx.resilient_parsing:
+        return
+
+    def report():
+        profiler = profiling.stop()
+        fmt = ctx.meta.get("lizzy.profile_format") or "table"
+        if fmt == "table":
+            output.echo(profiler.summary_table(), err=True)
+        else:
+            path = profiler.write(fmt, ctx.meta.get("lizzy.profile_output"))
+            output.echo(f"Profile written to {path}", err=True)
+
+    profiling.start()
+    ctx.call_on_close(report)
+
+
+def _store_meta(ctx, param, value):
+    """Keep a --profile-run setting for the report written at exit."""
+    ctx.meta[f"lizzy.{param.name}"] = value
+
+
+@click.group(cls=LazyGroup, manifest_loader=load_manifest, invoke_without_command=True)
+@click.option(
+    "--profile-run",
+    is_flag=True,
+    is_eager=True,
+    expose_value=False,
+    callback=_start_profiling,
+    help="Profile imports, phases and HTTP calls of this run.",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(profiling.FORMATS),
+    default="table",
+    show_default=True,
+    expose_value=False,
+    callback=_store_meta,
+    help="Print a summary table or write a json or speedscope trace.",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False),
+    expose_value=False,
+    callback=_store_meta,
+    help="Trace file (default lizzy-profile.json or lizzy-profile.speedscope.json).",
+)
+@click.option(
+    "--profile",
+    envvar="LIZZY_PROFILE",
+    help="Config profile from ~/.lizzy/profiles/ to merge over config.json.",
+)
+@click.option(
+    "--output",
+    "output_mode",
+    type=click.Choice(output.MODES),
+    default="text",
+    show_default=True,
+    envvar="LIZZY_OUTPUT",
+    help="text for humans, json for NDJSON records.",
+)
 @click.pass_context
-def lizzy(ctx):
+def lizzy(ctx, profile, output_mode):
     """Lizzy CLI - A tool to manage configurations and automations."""
-    click.echo(ASCII_ART)
+    set_profile(profile)
+    token = output.set_mode(output_mode)
+    ctx.call_on_close(functools.partial(output.reset_mode, token))
+    ctx.call_on_close(output.flush)
+    if output.is_machine():
+        if ctx.invoked_subcommand is None:
+            for name, help_text in ctx.command.help_rows(ctx):
+                output.emit("command", name=name, help=help_text)
+        return
+    output.echo(ASCII_ART)
     if ctx.invoked_subcommand is None:
-        click.echo(ctx.get_help())
+        output.echo(ctx.get_help())
 
 
 def auto_register_commands(group: click.Group):
@@ -53,20 +233,12 @@ def auto_register_commands(group: click.Group):
         if is_pkg or module_name == "__init__" or module_name == "example_config":
             continue
         module = importlib.import_module(f"commands.{module_name}")
-        for _, obj in inspect.getmembers(module):
-            if (
-                inspect.isclass(obj)
-                and issubclass(obj, BaseCommand)
-                and obj is not BaseCommand
-            ):
-                obj.register(group)
-
+        for command_class in _command_classes(module):
+            command_class.register(group)
 
-auto_register_commands(lizzy)
 
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
-        click.echo(ASCII_ART)
-        lizzy.main(args=["--help"], standalone_mode=False)
-    else:
-        lizzy()
+    # Use the importable module so command modules share its BaseCommand.
+    from lizzy import cli
+
+    cli.lizzy()
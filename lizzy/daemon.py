@@ -0,0 +1,458 @@
+"""Persistent lizzy daemon and its thin client.
+
+The daemon keeps the command modules, helpers, config cache and SDK sessions
+imported and warm in one long-running process listening on a Unix socket.
+The ``lizzy`` entry point first offers each invocation to the daemon and only
+falls back to running in-process when no daemon is running or the request
+cannot be served remotely.
+
+The client side of this module only uses the standard library so forwarding a
+command costs an interpreter start and a socket round-trip, nothing more.
+
+Protocol: one JSON object per line. The client sends a request
+(``{"op": "run", "argv": [...], ...}``, ``{"op": "ping"}`` or
+``{"op": "shutdown"}``). For ``run`` the daemon streams ``{"stdout": ...}``,
+``{"stderr": ...}``, ``{"readline": true}`` and ``{"getpass": prompt}``
+messages (the client answers the latter two with ``{"stdin": ...}``, reading
+hidden input on its own terminal) and finishes with ``{"exit": code}``, or
+answers ``{"fallback": reason}`` when the client should run the command
+itself.
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+
+DEFAULT_IDLE_TIMEOUT = 900
+
+# Groups that depend on the caller's working directory or manage the daemon
+# itself always run in the calling process.
+LOCAL_ONLY_COMMANDS = {"daemon", "self", "workflows"}
+
+# Environment read by boto3, gimme-aws-creds and requests. The daemon only
+# serves clients whose values match its own, since os.environ is process-wide.
+CLIENT_ENV_PREFIXES = ("AWS_", "OKTA_", "GIMME_AWS_CREDS_")
+CLIENT_ENV_NAMES = {"HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY", "REQUESTS_CA_BUNDLE"}
+
+
+def socket_path() -> str:
+    """Return the daemon socket path (inside ~/.lizzy, like config_dir())."""
+    return os.path.join(os.path.expanduser("~"), ".lizzy", "daemon.sock")
+
+
+def log_path() -> str:
+    """Return the path of the daemon log file."""
+    return os.path.join(os.path.expanduser("~"), ".lizzy", "daemon.log")
+
+
+def client_environ() -> list:
+    """Return the AWS, Okta and proxy settings of this process as sorted pairs."""
+    return sorted(
+        [name, value]
+        for name, value in os.environ.items()
+        if name.startswith(CLIENT_ENV_PREFIXES) or name.upper() in CLIENT_ENV_NAMES
+    )
+
+
+def client_fingerprint() -> dict:
+    """Return the config selection, environment and cwd of the caller."""
+    return {
+        "profile": os.environ.get("LIZZY_PROFILE") or None,
+        "output": os.environ.get("LIZZY_OUTPUT") or None,
+        "env": sorted(
+            [name, value]
+            for name, value in os.environ.items()
+            if name.startswith("LIZZY__") and len(name) > len("LIZZY__")
+        ),
+        "environ": client_environ(),
+        "cwd": os.getcwd(),
+    }
+
+
+def runs_locally(argv: list) -> bool:
+    """Return whether an invocation has to run in the calling process."""
+    if not argv or argv[0].startswith("-"):
+        # Root options such as --profile change process-wide state.
+        return True
+    if "--help" in argv:
+        # click writes help text straight to sys.stdout, not to lizzy.output.
+        return True
+    return argv[0].split(" ", 1)[0] in LOCAL_ONLY_COMMANDS
+
+
+def should_forward(argv: list) -> bool:
+    """Return whether an invocation may be served by the daemon."""
+    if os.environ.get("LIZZY_NO_DAEMON") or not hasattr(socket, "AF_UNIX"):
+        return False
+    return not runs_locally(argv)
+
+
+def _connect(path: str = None, timeout: float = None):
+    """Connect to the daemon socket, or return None if nothing is listening."""
+    path = path or socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _send(stream, message: dict) -> None:
+    """Write one protocol message."""
+    stream.write((json.dumps(message) + "\n").encode())
+    stream.flush()
+
+
+def request(message: dict, path: str = None, timeout: float = 5):
+    """Send a control request (ping, shutdown) and return the reply, or None."""
+    sock = _connect(path, timeout)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rwb") as stream:
+        _send(stream, message)
+        line = stream.readline()
+    return json.loads(line) if line else None
+
+
+def _read_secret(prompt: str, stdin, stderr) -> str:
+    """Read a hidden answer without echoing it on the client's terminal."""
+    if stdin is sys.stdin:
+        import getpass
+
+        try:
+            return getpass.getpass(prompt, stream=stderr)
+        except EOFError:
+            return ""
+    stderr.write(prompt)
+    stderr.flush()
+    return stdin.readline().rstrip("\n")
+
+
+def run_client(argv: list, path: str = None, stdin=None, stdout=None, stderr=None):
+    """Run ``argv`` on the daemon and return its exit code.
+
+    Returns None when no daemon is available or it asks the caller to run the
+    command locally.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    sock = _connect(path)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rwb") as stream:
+        _send(
+            stream,
+            {
+                "op": "run",
+                "argv": argv,
+                "isatty": stdout.isatty(),
+                **client_fingerprint(),
+            },
+        )
+        for line in stream:
+            message = json.loads(line)
+            if "stdout" in message:
+                stdout.write(message["stdout"])
+                stdout.flush()
+            elif "stderr" in message:
+                stderr.write(message["stderr"])
+                stderr.flush()
+            elif "readline" in message:
+                _send(stream, {"stdin": stdin.readline()})
+            elif "getpass" in message:
+                _send(stream, {"stdin": _read_secret(message["getpass"], stdin, stderr)})
+            elif "exit" in message:
+                return message["exit"]
+            elif "fallback" in message:
+                return None
+    return None
+
+
+def main() -> None:
+    """Console entry point: use the daemon when possible, else run locally."""
+    argv = sys.argv[1:]
+    if should_forward(argv):
+        exit_code = run_client(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from lizzy.cli import lizzy
+
+    lizzy(prog_name="lizzy")
+
+
+# --- Server side -------------------------------------------------------------
+
+
+class _SessionStream:
+    """Text stream that sends writes to a session's client."""
+
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, session, key: str):
+        self._session = session
+        self._key = key
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            raise TypeError("write() argument must be str")
+        if text:
+            self._session.send({self._key: text})
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return self._session.isatty
+
+
+class _Session:
+    """One client connection served by a daemon thread.
+
+    The session is the console of the command it runs (see
+    ``lizzy.output.redirect``): output is streamed to the client and prompts
+    are answered by it. Worker threads of the command reach the same session
+    through the context they inherit, so concurrent sessions stay apart.
+    """
+
+    def __init__(self, rfile, wfile, isatty: bool):
+        from lizzy.output import NdjsonStream
+
+        self.rfile = rfile
+        self.wfile = wfile
+        self.isatty = isatty
+        self.stdout = NdjsonStream(_SessionStream(self, "stdout"))
+        self.stderr = _SessionStream(self, "stderr")
+
+    def send(self, message: dict) -> None:
+        _send(self.wfile, message)
+
+    def _ask(self, message: dict) -> str:
+        self.send(message)
+        line = self.rfile.readline()
+        return json.loads(line).get("stdin", "") if line else ""
+
+    def readline(self) -> str:
+        return self._ask({"readline": True})
+
+    def getpass(self, prompt: str) -> str:
+        # The daemon has no terminal to turn echo off on; the client does.
+        return self._ask({"getpass": prompt})
+
+
+def _warm_up() -> None:
+    """Import every command module and helper and load the config."""
+    import importlib
+
+    from lizzy.cli import lizzy
+
+    for entry in lizzy.lazy_commands.values():
+        lizzy.load_module(entry["module"])
+    for helper in ("aws", "datadog", "gitlab", "terraform", "chef"):
+        try:
+            importlib.import_module(f"lizzy.helpers.{helper}")
+        except Exception as e:  # An optional SDK failing must not stop the daemon.
+            print(f"Could not preload lizzy.helpers.{helper}: {e}", file=sys.stderr)
+    try:
+        from lizzy.helpers.config import get_config
+
+        get_config()
+    except Exception as e:
+        print(f"Could not preload config: {e}", file=sys.stderr)
+
+
+def _fingerprint_matches(message: dict) -> bool:
+    """Return whether the client would run the command like this daemon.
+
+    Besides the config and output selection, the client's AWS and Okta
+    environment and its working directory must match the daemon's: they are
+    process-wide, so a command cannot be given its own copy of them.
+    """
+    from lizzy.helpers.config import active_profile, env_overrides
+
+    return (
+        message.get("profile") == active_profile()
+        and message.get("output") == (os.environ.get("LIZZY_OUTPUT") or None)
+        and message.get("env") == [list(item) for item in env_overrides()]
+        and message.get("environ") == client_environ()
+        and message.get("cwd") == os.getcwd()
+    )
+
+
+def _run_command(argv: list) -> int:
+    """Run a lizzy command in this process and return its exit code."""
+    import traceback
+
+    import click
+
+    from lizzy import output
+    from lizzy.cli import lizzy
+
+    try:
+        lizzy.main(args=argv, prog_name="lizzy", standalone_mode=False)
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show(file=output.stream(err=True))
+        return e.exit_code
+    except click.Abort:
+        output.echo("Aborted!", err=True)
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        traceback.print_exc(file=output.stream(err=True))
+        return 1
+    return 0
+
+
+def make_server(path: str = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+    """Create the daemon server bound to ``path``."""
+    import socketserver
+    import threading
+
+    from lizzy import output
+
+    path = path or socket_path()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            message = json.loads(line)
+            server = self.server
+            server.last_activity = time.monotonic()
+            op = message.get("op")
+            if op == "ping":
+                _send(self.wfile, server.status())
+            elif op == "shutdown":
+                _send(self.wfile, {"ok": True})
+                threading.Thread(target=server.shutdown, daemon=True).start()
+            elif op == "run":
+                self.run(message)
+            server.last_activity = time.monotonic()
+
+        def run(self, message):
+            argv = message.get("argv", [])
+            if runs_locally(argv):
+                _send(self.wfile, {"fallback": "command runs locally"})
+                return
+            if not _fingerprint_matches(message):
+                _send(self.wfile, {"fallback": "environment differs"})
+                return
+            session = _Session(self.rfile, self.wfile, bool(message.get("isatty")))
+            self.server.track(session, active=True)
+            try:
+                with output.redirect(session):
+                    exit_code = _run_command(argv)
+            finally:
+                self.server.track(session, active=False)
+            self.server.requests_served += 1
+            _send(self.wfile, {"exit": exit_code})
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self):
+            if os.path.exists(path):
+                os.unlink(path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            super().__init__(path, Handler)
+            os.chmod(path, 0o600)
+            self.started = time.time()
+            self.last_activity = time.monotonic()
+            self.requests_served = 0
+            self.idle_timeout = idle_timeout
+            self._sessions = set()
+            self._lock = threading.Lock()
+
+        @property
+        def active_count(self) -> int:
+            with self._lock:
+                return len(self._sessions)
+
+        def track(self, session: _Session, active: bool) -> None:
+            with self._lock:
+                if active:
+                    self._sessions.add(session)
+                else:
+                    self._sessions.discard(session)
+
+        def status(self) -> dict:
+            return {
+                "pid": os.getpid(),
+                "uptime": round(time.time() - self.started, 1),
+                "requests": self.requests_served,
+                "active": self.active_count,
+                "idle_timeout": self.idle_timeout,
+            }
+
+        def service_actions(self):
+            idle = time.monotonic() - self.last_activity
+            if self.idle_timeout and idle > self.idle_timeout and not self.active_count:
+                threading.Thread(target=self.shutdown, daemon=True).start()
+
+        def server_close(self):
+            super().server_close()
+            if os.path.exists(path):
+                os.unlink(path)
+
+    return Server()
+
+
+def serve(path: str = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """Warm up and serve requests until shut down or idle for too long."""
+    _warm_up()
+    server = make_server(path, idle_timeout)
+    try:
+        server.serve_forever(poll_interval=1)
+    finally:
+        server.server_close()
+
+
+def start_daemon(idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> int:
+    """Start the daemon in the background and return its pid."""
+    import subprocess
+
+    os.makedirs(os.path.dirname(log_path()), exist_ok=True)
+    with open(log_path(), "ab") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "lizzy.daemon", "--idle-timeout", str(idle_timeout)],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    return process.pid
+
+
+def wait_until_ready(timeout: float = 10) -> dict:
+    """Wait for the daemon to answer a ping and return its status."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = request({"op": "ping"})
+        if status is not None:
+            return status
+        time.sleep(0.1)
+    return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m lizzy.daemon")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    parser.add_argument("--socket", default=None)
+    args = parser.parse_args()
+    serve(args.socket, args.idle_timeout)
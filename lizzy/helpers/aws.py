@@ -1,36 +1,376 @@
+import contextlib
+import functools
+import threading
+from concurrent.futures import as_completed
+
 import gimme_aws_creds.main
 import gimme_aws_creds.ui
 import click
-from lizzy.helpers.config import get_setting
+from lizzy import output, profiling
+from lizzy.helpers.concurrency import ContextThreadPoolExecutor
+from lizzy.helpers.config import get_int, get_list, get_setting
+from lizzy.helpers import credential_cache, picker
+from lizzy.helpers.inventory import DEFAULT_TTL, Inventory
+from lizzy.helpers.picker import resolve
+from lizzy.helpers.config_model import get_config_model
 import boto3
+import botocore.session
+from botocore.config import Config
+from botocore.credentials import (
+    CredentialProvider,
+    CredentialResolver,
+    RefreshableCredentials,
+)
 from botocore.exceptions import BotoCoreError, ClientError
+from lizzy.helpers.ecs import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_ROUND_SECONDS,
+    DEFAULT_MAX_WATCH_INTERVAL,
+    DEFAULT_WATCH_INTERVAL,
+    DEFAULT_WAIT_TIMEOUT,
+    TargetResult,
+    force_redeploy_services,
+    list_cluster_arns,
+    list_service_records,
+    matches,
+    plan_restart,
+    restart_in_waves,
+    select_records,
+    service_name,
+    watch_services,
+)
 
+DEFAULT_ACCOUNT_CONCURRENCY = 4
 
-def get_aws_credentials(account_name: str) -> tuple:
-    """Authenticate AWS CLI using the account name."""
+DEFAULT_MAX_POOL_CONNECTIONS = 20
 
-    account = get_account_by_name(account_name)
 
-    pattern = "|".join(sorted({account["id"]}))
+class _RefreshingCredentialProvider(CredentialProvider):
+    """Credential provider serving an account's credentials as RefreshableCredentials."""
+
+    METHOD = "lizzy"
+    CANONICAL_NAME = "customLizzy"
+
+    def __init__(self, metadata: dict, refresh):
+        super().__init__()
+        self._metadata = metadata
+        self._refresh = refresh
+
+    def load(self) -> RefreshableCredentials:
+        return RefreshableCredentials.create_from_metadata(
+            metadata=self._metadata, refresh_using=self._refresh, method=self.METHOD
+        )
+
+
+class AwsClientFactory:
+    """Per-process cache of boto3 sessions and clients.
+
+    Sessions are cached per (account, region) and clients per (account,
+    region, service), so endpoint resolution, model loading and connection
+    pool setup happen once per process instead of once per call. Credentials
+    registered with an expiration and a ``refresh`` callback are wrapped in
+    botocore's RefreshableCredentials: cached clients renew them shortly
+    before they expire instead of failing halfway through a long run.
+    """
+
+    def __init__(self, max_pool_connections: int = None):
+        self.max_pool_connections = max_pool_connections
+        self._lock = threading.RLock()
+        self._credentials = {}
+        self._accounts = {}
+        self._sessions = {}
+        self._clients = {}
+
+    def register(
+        self,
+        account: str,
+        access_key_id: str,
+        secret_access_key: str,
+        session_token: str = None,
+        expiration: str = None,
+        refresh=None,
+    ) -> None:
+        """Register the credentials of an account.
+
+        ``refresh`` returns new ``(access_key_id, secret_access_key,
+        session_token, expiration)`` credentials when these expire.
+        """
+        credentials = (access_key_id, secret_access_key, session_token, expiration, refresh)
+        with self._lock:
+            if self._credentials.get(account, credentials)[:3] != credentials[:3]:
+                self._drop(account)
+            self._credentials[account] = credentials
+            self._accounts[access_key_id] = account
+
+    def account_for(self, access_key_id: str) -> str:
+        """Return the account registered for an access key (the key itself if unknown)."""
+        with self._lock:
+            return self._accounts.get(access_key_id, access_key_id)
+
+    def _drop(self, account: str) -> None:
+        """Forget the cached sessions and clients of an account."""
+        for cache in (self._sessions, self._clients):
+            for key in [key for key in cache if key[0] == account]:
+                del cache[key]
+
+    def _refresh(self, account: str, refresh) -> dict:
+        """Fetch new credentials for an account in botocore's metadata format."""
+        access_key_id, secret_access_key, session_token, expiration = refresh()
+        with self._lock:
+            self._accounts[access_key_id] = account
+            self._credentials[account] = (
+                access_key_id,
+                secret_access_key,
+                session_token,
+                expiration,
+                refresh,
+            )
+        return {
+            "access_key": access_key_id,
+            "secret_key": secret_access_key,
+            "token": session_token,
+            "expiry_time": expiration,
+        }
+
+    def _new_session(self, account: str, region: str) -> boto3.session.Session:
+        access_key_id, secret_access_key, session_token, expiration, refresh = (
+            self._credentials[account]
+        )
+        core = botocore.session.get_session()
+        if expiration and refresh:
+            provider = _RefreshingCredentialProvider(
+                metadata={
+                    "access_key": access_key_id,
+                    "secret_key": secret_access_key,
+                    "token": session_token,
+                    "expiry_time": expiration,
+                },
+                refresh=lambda: self._refresh(account, refresh),
+            )
+            core.register_component("credential_provider", CredentialResolver([provider]))
+        else:
+            core.set_credentials(access_key_id, secret_access_key, session_token)
+        return boto3.session.Session(botocore_session=core, region_name=region)
+
+    def session(self, account: str, region: str = None) -> boto3.session.Session:
+        """Return the cached boto3 session of an account and region."""
+        with self._lock:
+            key = (account, region)
+            if key not in self._sessions:
+                self._sessions[key] = self._new_session(account, region)
+            return self._sessions[key]
+
+    def client(self, service: str, account: str, region: str = None):
+        """Return the cached boto3 client of an account, region and service."""
+        with self._lock:
+            key = (account, region, service)
+            if key not in self._clients:
+                if self.max_pool_connections is None:
+                    self.max_pool_connections = get_int(
+                        "aws.max_pool_connections", DEFAULT_MAX_POOL_CONNECTIONS
+                    )
+                self._clients[key] = self.session(account, region).client(
+                    service,
+                    config=Config(max_pool_connections=self.max_pool_connections),
+                )
+            return self._clients[key]
+
+    def clear(self) -> None:
+        """Drop every cached credential, session and client."""
+        with self._lock:
+            self._credentials.clear()
+            self._accounts.clear()
+            self._sessions.clear()
+            self._clients.clear()
+
+
+_client_factory = None
+_client_factory_lock = threading.Lock()
+
+
+def get_client_factory() -> AwsClientFactory:
+    """Return the process-wide client factory.
+
+    Its connection pool size comes from ``aws.max_pool_connections`` and is
+    read when the first client is built.
+    """
+    global _client_factory
+    with _client_factory_lock:
+        if _client_factory is None:
+            _client_factory = AwsClientFactory()
+        return _client_factory
+
+
+def aws_client(
+    service: str,
+    aws_access_key_id: str,
+    aws_secret_access_key: str,
+    aws_session_token: str = None,
+    region: str = None,
+):
+    """Return a cached client for the account these credentials belong to."""
+    factory = get_client_factory()
+    account = factory.account_for(aws_access_key_id)
+    if account == aws_access_key_id:
+        factory.register(account, aws_access_key_id, aws_secret_access_key, aws_session_token)
+    return factory.client(service, account, region)
+
+
+class _ConsoleUserInterface(gimme_aws_creds.ui.CLIUserInterface):
+    """gimme-aws-creds UI that prompts and reports through ``lizzy.output``.
+
+    The Okta prompts, including the hidden password prompt, then reach the
+    console of the running command, which is the client of a daemon session.
+    """
+
+    def result(self, result):
+        output.echo(result)
+
+    def prompt(self, message=None):
+        if message is not None:
+            output.echo(message, nl=False, err=True)
+
+    def message(self, message):
+        output.echo(message, err=True)
+
+    def notify(self, message):
+        output.echo(message, err=True)
+
+    def read_input(self, hidden=False):
+        if hidden:
+            return output.getpass("")
+        return output.readline().rstrip("\n")
+
+
+def _gimme(account_ids) -> gimme_aws_creds.main.GimmeAWSCreds:
+    """Return a gimme-aws-creds flow selecting the roles of these accounts."""
+    pattern = "|".join(sorted({str(account_id) for account_id in account_ids}))
     pattern = f"/:({pattern}):/"
-    ui = gimme_aws_creds.ui.CLIUserInterface(argv=["", "--roles", pattern])
-    creds = gimme_aws_creds.main.GimmeAWSCreds(ui=ui)
-    creds = creds.iter_selected_aws_credentials().__next__()
+    ui = _ConsoleUserInterface(argv=["", "--roles", pattern])
+    return gimme_aws_creds.main.GimmeAWSCreds(ui=ui)
+
+
+def _login(account_name: str, account_id: str) -> dict:
+    """Run the gimme-aws-creds flow for the roles of one account."""
+    with profiling.phase(f"aws auth {account_name}"):
+        return _gimme([account_id]).iter_selected_aws_credentials().__next__()
+
+
+def _login_accounts(account_ids) -> dict:
+    """Run one gimme-aws-creds flow for several accounts.
+
+    There is a single Okta login (and MFA prompt); gimme-aws-creds then
+    fetches the selected roles in parallel. Returns the first role's
+    credentials of every account, by account id.
+    """
+    account_ids = list(account_ids)
+    found = {}
+    with profiling.phase(f"aws auth {len(account_ids)} accounts"):
+        for creds in _gimme(account_ids).iter_selected_aws_credentials():
+            found.setdefault(creds["role"]["arn"].split(":")[4], creds)
+    return found
+
+
+def _fetch_credentials(account_name: str) -> dict:
+    """Return STS credentials for an account, from the encrypted cache when fresh."""
+    account = get_account_by_name(account_name)
+    cache = credential_cache.open_cache()
+    if cache is None:
+        return _login(account_name, account["id"])
+    with cache.locked():
+        creds = cache.get(account["id"])
+        if creds is None:
+            creds = _login(account_name, account["id"])
+            cache.put(account["id"], creds)
+    return creds
+
+
+def _credentials_tuple(creds: dict) -> tuple:
+    """Return (key, secret, token, expiration) from gimme-aws-creds output."""
     return (
         creds["credentials"]["aws_access_key_id"],
         creds["credentials"]["aws_secret_access_key"],
         creds["credentials"]["aws_session_token"],
+        creds["credentials"].get("expiration"),
+    )
+
+
+def get_aws_credentials(account_name: str) -> tuple:
+    """Authenticate AWS CLI using the account name.
+
+    The credentials are also registered with the client factory, so clients
+    built from them are shared and refreshed when they expire.
+    """
+    return _register_credentials(account_name, _fetch_credentials(account_name))
+
+
+def _register_credentials(account_name: str, creds: dict) -> tuple:
+    """Register an account's credentials with the client factory."""
+    access_key_id, secret_access_key, session_token, expiration = _credentials_tuple(creds)
+    get_client_factory().register(
+        account_name,
+        access_key_id,
+        secret_access_key,
+        session_token,
+        expiration,
+        refresh=lambda: _credentials_tuple(_fetch_credentials(account_name)),
+    )
+    return (
+        access_key_id,
+        secret_access_key,
+        session_token,
         creds["role"]["arn"],
     )
 
 
+def authenticate_accounts(account_names) -> dict:
+    """Authenticate several accounts with at most one Okta login.
+
+    Accounts with fresh credentials in the encrypted cache are reused; the
+    others are fetched together by :func:`_login_accounts` before any
+    per-account work is fanned out, so threads never wait on each other's
+    logins. Every account is registered with the client factory. Returns
+    an error message per account that could not be authenticated.
+    """
+    errors, account_ids, found = {}, {}, {}
+    for name in account_names:
+        try:
+            account_ids[name] = get_account_by_name(name)["id"]
+        except Exception as e:
+            errors[name] = str(e)
+
+    cache = credential_cache.open_cache()
+    with cache.locked() if cache else contextlib.nullcontext():
+        if cache:
+            for name, account_id in account_ids.items():
+                creds = cache.get(account_id)
+                if creds is not None:
+                    found[name] = creds
+        missing = {name: a for name, a in account_ids.items() if name not in found}
+        if missing:
+            try:
+                by_id = _login_accounts(missing.values())
+            except Exception as e:
+                by_id = {}
+                errors.update({name: str(e) for name in missing})
+            for name, account_id in missing.items():
+                creds = by_id.get(str(account_id))
+                if creds is None:
+                    errors.setdefault(name, "no role matched the account")
+                    continue
+                found[name] = creds
+                if cache:
+                    cache.put(account_id, creds)
+
+    for name, creds in found.items():
+        _register_credentials(name, creds)
+    return errors
+
+
 def get_account_by_name(account_name: str) -> dict:
     """Retrieve AWS account details by name."""
-    accounts = get_aws_accounts()
-    for account in accounts:
-        if account["name"] == account_name:
-            return account
-    raise ValueError(f"Account with name {account_name} not found.")
+    return get_config_model().account(account_name).as_dict()
 
 
 def get_aws_accounts() -> list:
@@ -44,7 +384,7 @@ def get_config_accounts() -> list:
     labels = ""
     for account in accounts:
         labels += f"{account['id']} | {account['name']}\n"
-    account_name = click.prompt(
+    account_name = output.prompt(
         f"Select an AWS account to authenticate \n\n{labels}\n",
         type=click.Choice([str(f"{account['name']}") for account in accounts]),
         show_choices=True,
@@ -57,10 +397,7 @@ def get_clusters(
         aws_secret_access_key: str,
         aws_session_token: str):
     """Retrieve a list of ECS clusters."""
-    ecs = boto3.client("ecs",
-        aws_access_key_id=aws_access_key_id,
-        aws_secret_access_key=aws_secret_access_key,
-        aws_session_token=aws_session_token,)
+    ecs = aws_client("ecs", aws_access_key_id, aws_secret_access_key, aws_session_token)
     try:
         clusters = []
         paginator = ecs.get_paginator("list_clusters")
@@ -68,49 +405,78 @@ def get_clusters(
             clusters.extend(page.get("clusterArns", []))
         return clusters
     except (BotoCoreError, ClientError) as e:
-        click.echo(f"Error fetching clusters: {e}")
+        output.echo(f"Error fetching clusters: {e}")
         return []
 
 
-def choose_cluster(clusters: list) -> str:
-    """Prompt user to choose a cluster from the list."""
-    click.echo("Available ECS Clusters:")
-    for idx, cluster in enumerate(clusters):
-        click.echo(f"{idx + 1}: {cluster}")
+def _choose(items: list, kind: str, selector: str = None) -> str:
+    """Return one item, chosen by ``selector`` or by the user.
+
+    ``selector`` is an exact name, ARN or glob that must match exactly one
+    item. Without it a fuzzy picker is shown on a terminal; otherwise the
+    numbered prompt is used, which also accepts a name or glob.
+    """
+    if selector is not None:
+        chosen = resolve(items, selector)
+        if len(chosen) != 1:
+            raise click.ClickException(
+                f"'{selector}' matches {len(chosen)} {kind}s; expected exactly one."
+            )
+        return chosen[0]
+    if picker.interactive():
+        return picker.pick(items, f"Select a {kind}")
+    output.echo(f"Available ECS {kind.capitalize()}s:")
+    for idx, item in enumerate(items):
+        output.echo(f"{idx + 1}: {item}")
     while True:
-        choice = click.prompt(f"Select a cluster [1-{len(clusters)}]: ")
-        if choice.isdigit() and 1 <= int(choice) <= len(clusters):
-            return clusters[int(choice) - 1]
-        click.echo("Invalid selection. Try again.")
+        choice = output.prompt(f"Select a {kind} [1-{len(items)}]: ")
+        if choice.isdigit() and 1 <= int(choice) <= len(items):
+            return items[int(choice) - 1]
+        chosen = resolve(items, choice)
+        if len(chosen) == 1:
+            return chosen[0]
+        output.echo("Invalid selection. Try again.")
 
 
-def get_fargate_services(cluster: str, aws_access_key_id: str, aws_secret_access_key: str, aws_session_token: str) -> list:
-    """Retrieve a list of Fargate services in a cluster."""
-    ecs = boto3.client("ecs",
-        aws_access_key_id=aws_access_key_id,
-        aws_secret_access_key=aws_secret_access_key,
-        aws_session_token=aws_session_token,)
+def choose_cluster(clusters: list, selector: str = None) -> str:
+    """Prompt user to choose a cluster from the list."""
+    return _choose(clusters, "cluster", selector)
+
+
+def get_fargate_service_records(
+    cluster: str,
+    aws_access_key_id: str,
+    aws_secret_access_key: str,
+    aws_session_token: str,
+    launch_type: str = "FARGATE",
+) -> list:
+    """Retrieve the Fargate services of a cluster as described ``ServiceRecord`` objects."""
+    ecs = aws_client("ecs", aws_access_key_id, aws_secret_access_key, aws_session_token)
     try:
-        services = []
-        paginator = ecs.get_paginator("list_services")
-        for page in paginator.paginate(cluster=cluster):
-            services.extend(page.get("serviceArns", []))
-        return services
+        return list_service_records(
+            ecs,
+            cluster,
+            launch_type,
+            max_workers=get_int("aws.redeploy_workers", DEFAULT_MAX_WORKERS),
+        )
     except (BotoCoreError, ClientError) as e:
-        click.echo(f"Error fetching services: {e}")
+        output.echo(f"Error fetching services: {e}")
         return []
 
 
-def choose_service(services: list) -> str:
+def get_fargate_services(cluster: str, aws_access_key_id: str, aws_secret_access_key: str, aws_session_token: str) -> list:
+    """Retrieve the ARNs of the Fargate services in a cluster."""
+    return [
+        record.arn
+        for record in get_fargate_service_records(
+            cluster, aws_access_key_id, aws_secret_access_key, aws_session_token
+        )
+    ]
+
+
+def choose_service(services: list, selector: str = None) -> str:
     """Prompt user to choose a service from the list."""
-    click.echo("Available ECS Services:")
-    for idx, service in enumerate(services):
-        click.echo(f"{idx + 1}: {service}")
-    while True:
-        choice = click.prompt(f"Select a service [1-{len(services)}]: ")
-        if choice.isdigit() and 1 <= int(choice) <= len(services):
-            return services[int(choice) - 1]
-        click.echo("Invalid selection. Try again.")
+    return _choose(services, "service", selector)
 
 
 def ecs_force_redeploy(
@@ -121,33 +487,476 @@ def ecs_force_redeploy(
     aws_session_token,
 ):
     """Force redeploy an ECS service."""
-    ecs = boto3.client(
-        "ecs",
-        aws_access_key_id=aws_access_key_id,
-        aws_secret_access_key=aws_secret_access_key,
-        aws_session_token=aws_session_token,
-    )
+    ecs = aws_client("ecs", aws_access_key_id, aws_secret_access_key, aws_session_token)
     try:
         response = ecs.describe_services(cluster=cluster, services=[service])
         if not response["services"]:
-            print("Service not found.")
+            output.echo("Service not found.")
             return
         task_def = response["services"][0]["taskDefinition"]
-        click.echo(f"Forcing new deployment for service: {service}")
+        output.echo(f"Forcing new deployment for service: {service}")
         ecs.update_service(
             cluster=cluster,
             service=service,
             taskDefinition=task_def,
             forceNewDeployment=True,
         )
-        click.echo("Force redeploy triggered.")
+        output.echo("Force redeploy triggered.")
     except (BotoCoreError, ClientError) as e:
-        click.echo(f"Error forcing redeploy: {e}")
+        output.echo(f"Error forcing redeploy: {e}")
+
 
 
+def report_redeploy_progress(result, done: int, total: int, **context) -> None:
+    """Print one progress line per finished service redeploy.
+
+    ``context`` (account, region, cluster) prefixes the line and is added to
+    the machine-readable record.
+    """
+    name = service_name(result.service)
+    prefix = " ".join(f"[{value}]" for value in context.values() if value)
+    prefix = f"{prefix} " if prefix else ""
+    if result.ok:
+        text = f"{prefix}[{done}/{total}] {name}: force redeploy triggered"
+    else:
+        text = f"{prefix}[{done}/{total}] {name}: failed ({result.error})"
+    output.emit(
+        "redeploy",
+        text,
+        **context,
+        service=result.service,
+        ok=result.ok,
+        error=result.error,
+        attempts=result.attempts,
+        done=done,
+        total=total,
+    )
 
-def run_aws_fargate_restart(all_services: bool=True)-> None:
-    """Restart AWS Fargate tasks."""
+
+def report_wave_progress(number: int, waves: int, results: list, seconds: float) -> None:
+    """Print one summary line per finished restart wave."""
+    stable = sum(1 for result in results if result.ok)
+    output.emit(
+        "wave",
+        f"Wave {number}/{waves}: {stable}/{len(results)} services stable "
+        f"in {seconds:.0f}s",
+        wave=number,
+        waves=waves,
+        stable=stable,
+        failed=len(results) - stable,
+        seconds=round(seconds, 3),
+    )
+    for result in results:
+        if not result.ok:
+            output.echo(f"  {service_name(result.service)}: {result.error}")
+
+
+def select_accounts(patterns) -> list:
+    """Return the configured AWS accounts whose name or id matches a glob."""
+    accounts = [
+        account
+        for account in get_config_model().accounts
+        if matches(account.name, patterns) or matches(account.id, patterns)
+    ]
+    if not accounts:
+        raise click.ClickException(
+            f"No AWS accounts in the config match {', '.join(patterns)}."
+        )
+    return accounts
+
+
+def _matching_records(ecs, cluster: str, service_patterns: tuple, workers: int) -> list:
+    """Return the ACTIVE Fargate services of a cluster matching a name glob."""
+    return [
+        record
+        for record in select_records(
+            list_service_records(ecs, cluster, "FARGATE", max_workers=workers)
+        )
+        if matches(record.arn, service_patterns)
+    ]
+
+
+def _restart_account(
+    account_name: str,
+    regions: tuple,
+    cluster_patterns: tuple,
+    service_patterns: tuple,
+    workers: int,
+) -> list:
+    """Restart the matching services of an authenticated account in every region."""
+    results = []
+    for region in regions:
+        ecs = get_client_factory().client("ecs", account_name, region)
+        try:
+            clusters = [c for c in list_cluster_arns(ecs) if matches(c, cluster_patterns)]
+        except (BotoCoreError, ClientError) as e:
+            results.append(TargetResult(account_name, region, error=f"listing clusters failed: {e}"))
+            continue
+        for cluster in clusters:
+            try:
+                records = _matching_records(ecs, cluster, service_patterns, workers)
+            except (BotoCoreError, ClientError) as e:
+                results.append(
+                    TargetResult(account_name, region, cluster, error=f"listing services failed: {e}")
+                )
+                continue
+            if not records:
+                continue
+            progress = functools.partial(
+                report_redeploy_progress,
+                account=account_name,
+                region=region,
+                cluster=service_name(cluster),
+            )
+            redeployed = force_redeploy_services(
+                ecs,
+                cluster,
+                [record.arn for record in records],
+                max_workers=workers,
+                progress=progress,
+                task_definitions={record.arn: record.task_definition for record in records},
+            )
+            results.append(TargetResult(account_name, region, cluster, tuple(redeployed)))
+    return results
+
+
+def report_fanout_results(results: list) -> None:
+    """Print one summary line per account, region and cluster, and the totals."""
+    for target in sorted(results, key=lambda t: (t.account, t.region or "", t.cluster or "")):
+        where = [target.account]
+        if target.region or target.cluster:
+            where.append(target.region or "default region")
+        if target.cluster:
+            where.append(service_name(target.cluster))
+        where = " / ".join(where)
+        text = f"{where}: {target.restarted} restarted, {target.failed} failed"
+        if target.error:
+            text += f" ({target.error})"
+        output.emit(
+            "target",
+            text,
+            account=target.account,
+            region=target.region,
+            cluster=target.cluster,
+            restarted=target.restarted,
+            failed=target.failed,
+            error=target.error,
+        )
+    restarted = sum(target.restarted for target in results)
+    failed = sum(target.failed for target in results)
+    output.emit(
+        "summary",
+        f"Total: {restarted} services restarted, {failed} failures.",
+        restarted=restarted,
+        failed=failed,
+    )
+
+
+def report_restart_plan(plan, contexts: dict = None) -> None:
+    """Print the per-service plan and its totals; nothing is redeployed.
+
+    ``contexts`` maps service ARNs to the account and region they live in.
+    """
+    contexts = contexts or {}
+    for service in plan.services:
+        record = service.record
+        context = contexts.get(record.arn, {})
+        prefix = "".join(f"[{value}] " for value in context.values() if value)
+        if service.blocked:
+            detail = (
+                f"blocked: {record.min_healthy_percent}%-{record.max_percent}% "
+                "leaves no room to replace tasks"
+            )
+        else:
+            detail = f"{service.rounds} rounds, ~{service.seconds / 60:.0f} min"
+        output.emit(
+            "plan",
+            f"{prefix}{service_name(record.cluster or '')} / {record.name}: "
+            f"{record.desired} tasks ({record.min_healthy_percent}%/{record.max_percent}%), "
+            f"{detail}",
+            **context,
+            cluster=record.cluster,
+            service=record.arn,
+            tasks=record.desired,
+            min_healthy_percent=record.min_healthy_percent,
+            max_percent=record.max_percent,
+            rounds=service.rounds,
+            seconds=service.seconds,
+        )
+    blocked = sum(1 for service in plan.services if service.blocked)
+    calls = ", ".join(f"{count} {name}" for name, count in plan.api_calls.items())
+    output.emit(
+        "summary",
+        f"Plan: {len(plan.services)} services, {plan.tasks} tasks to replace"
+        f"{f' in {plan.waves} waves' if plan.waves > 1 else ''}, "
+        f"~{plan.seconds / 60:.0f} min, API calls: {calls}."
+        + (f" {blocked} services cannot be restarted." if blocked else ""),
+        services=len(plan.services),
+        tasks=plan.tasks,
+        waves=plan.waves,
+        seconds=plan.seconds,
+        api_calls=plan.api_calls,
+        blocked=blocked,
+    )
+    output.echo("Dry run: no services were redeployed.")
+
+
+def _account_records(
+    account_name: str,
+    regions: tuple,
+    cluster_patterns: tuple,
+    service_patterns: tuple,
+    workers: int,
+) -> tuple:
+    """Describe the services ``_restart_account`` would restart, in every region.
+
+    Returns ``(records, contexts, errors)``.
+    """
+    records, contexts, errors = [], {}, []
+    for region in regions:
+        ecs = get_client_factory().client("ecs", account_name, region)
+        try:
+            for cluster in list_cluster_arns(ecs):
+                if not matches(cluster, cluster_patterns):
+                    continue
+                for record in _matching_records(ecs, cluster, service_patterns, workers):
+                    records.append(record)
+                    contexts[record.arn] = {"account": account_name, "region": region}
+        except (BotoCoreError, ClientError) as e:
+            errors.append(f"{account_name} / {region or 'default region'}: {e}")
+    return records, contexts, errors
+
+
+def run_aws_fargate_restart_matching(
+    account_patterns: tuple,
+    service_patterns: tuple,
+    regions: tuple = (),
+    cluster_patterns: tuple = ("*",),
+    account_concurrency: int = DEFAULT_ACCOUNT_CONCURRENCY,
+    workers: int = None,
+    plan: bool = False,
+) -> list:
+    """Restart matching services across accounts and regions without prompting.
+
+    Accounts are authenticated and processed in parallel, at most
+    ``account_concurrency`` at a time; within an account each cluster's
+    services are redeployed by at most ``workers`` threads. Regions default
+    to ``aws.regions`` (or the default AWS region). Returns the per-cluster
+    results after printing an aggregated report. With ``plan`` the matching
+    services are only described and the restart plan is returned instead.
+    """
+    accounts = select_accounts(account_patterns)
+    regions = tuple(regions) or tuple(get_list("aws.regions", ())) or (None,)
+    workers = workers or get_int("aws.redeploy_workers", DEFAULT_MAX_WORKERS)
+    auth_errors = authenticate_accounts([account.name for account in accounts])
+    accounts = [account for account in accounts if account.name not in auth_errors]
+
+    if plan:
+        records, contexts = [], {}
+        for name, error in auth_errors.items():
+            output.echo(f"Could not plan {name}: authentication failed: {error}", err=True)
+        with ContextThreadPoolExecutor(max_workers=max(1, account_concurrency)) as pool:
+            futures = [
+                pool.submit(
+                    _account_records,
+                    account.name,
+                    regions,
+                    tuple(cluster_patterns),
+                    tuple(service_patterns),
+                    workers,
+                )
+                for account in accounts
+            ]
+            for future in futures:
+                account_records, account_contexts, errors = future.result()
+                records.extend(account_records)
+                contexts.update(account_contexts)
+                for error in errors:
+                    output.echo(f"Could not plan {error}", err=True)
+        restart_plan = plan_restart(
+            records, round_seconds=get_int("aws.plan_round_seconds", DEFAULT_ROUND_SECONDS)
+        )
+        report_restart_plan(restart_plan, contexts)
+        return restart_plan
+
+    results = [
+        TargetResult(name, error=f"authentication failed: {error}")
+        for name, error in auth_errors.items()
+    ]
+    with ContextThreadPoolExecutor(max_workers=max(1, account_concurrency)) as pool:
+        futures = [
+            pool.submit(
+                _restart_account,
+                account.name,
+                regions,
+                tuple(cluster_patterns),
+                tuple(service_patterns),
+                workers,
+            )
+            for account in accounts
+        ]
+        for future in as_completed(futures):
+            results.extend(future.result())
+
+    report_fanout_results(results)
+    failed = sum(target.failed for target in results)
+    if failed:
+        raise click.ClickException(f"{failed} restarts failed.")
+    return results
+
+
+def _refresh_inventory(inventory: Inventory, account_name: str, regions: tuple) -> list:
+    """Refresh regions of one authenticated account; return the errors."""
+    errors = []
+    for region in regions:
+        try:
+            count = inventory.refresh(
+                get_client_factory().client("ecs", account_name, region),
+                account_name,
+                region,
+                max_workers=get_int("aws.redeploy_workers", DEFAULT_MAX_WORKERS),
+            )
+        except (BotoCoreError, ClientError) as e:
+            errors.append(f"{account_name} / {region or 'default region'}: {e}")
+            continue
+        output.echo(
+            f"Refreshed {account_name} / {region or 'default region'}: {count} services"
+        )
+    return errors
+
+
+def run_aws_inventory(
+    account_patterns: tuple = ("*",),
+    regions: tuple = (),
+    cluster_patterns: tuple = ("*",),
+    service_patterns: tuple = ("*",),
+    launch_type: str = None,
+    refresh: bool = False,
+    offline: bool = False,
+    account_concurrency: int = DEFAULT_ACCOUNT_CONCURRENCY,
+) -> list:
+    """List services from the local inventory, refreshing stale regions first.
+
+    Regions older than ``aws.inventory_ttl`` seconds (or every region with
+    ``refresh``) are refreshed, one account per thread, after one login for
+    all accounts with a stale region. ``offline`` only reads the snapshot.
+    Returns the matching service records.
+    """
+    accounts = select_accounts(account_patterns)
+    regions = tuple(regions) or tuple(get_list("aws.regions", ())) or (None,)
+    inventory = Inventory()
+    if not offline:
+        ttl = get_int("aws.inventory_ttl", DEFAULT_TTL)
+        stale = {
+            account.name: [
+                r for r in regions if refresh or inventory.is_stale(account.name, r, ttl)
+            ]
+            for account in accounts
+        }
+        stale = {name: stale_regions for name, stale_regions in stale.items() if stale_regions}
+        auth_errors = authenticate_accounts(stale) if stale else {}
+        errors = [f"{name}: authentication failed: {e}" for name, e in auth_errors.items()]
+        with ContextThreadPoolExecutor(max_workers=max(1, account_concurrency)) as pool:
+            futures = [
+                pool.submit(_refresh_inventory, inventory, name, stale_regions)
+                for name, stale_regions in stale.items()
+                if name not in auth_errors
+            ]
+            errors.extend(error for future in futures for error in future.result())
+        for error in errors:
+            output.echo(f"Inventory refresh failed for {error}", err=True)
+
+    records = []
+    for account in accounts:
+        for region in regions:
+            for record in inventory.services(
+                account.name, region, patterns=service_patterns, launch_type=launch_type
+            ):
+                if not matches(record.cluster, cluster_patterns):
+                    continue
+                records.append(record)
+                output.emit(
+                    "service",
+                    f"{account.name} / {region or 'default region'} / "
+                    f"{service_name(record.cluster)} / {record.name}: "
+                    f"{record.launch_type or '-'} {record.running}/{record.desired} running",
+                    account=account.name,
+                    region=region,
+                    cluster=record.cluster,
+                    service=record.arn,
+                    name=record.name,
+                    launch_type=record.launch_type,
+                    status=record.status,
+                    task_definition=record.task_definition,
+                    desired=record.desired,
+                    running=record.running,
+                    pending=record.pending,
+                )
+    if not records:
+        output.echo("No services in the inventory match.")
+    return records
+
+
+def _restart_in_waves(
+    ecs, cluster, services, wave_size, wait_timeout, abort_on_failure, task_definitions=None
+):
+    """Restart services in waves and print a throughput summary."""
+    output.echo(
+        f"Restarting {len(services)} services in cluster {cluster} "
+        f"in waves of {wave_size}..."
+    )
+    report = restart_in_waves(
+        ecs,
+        cluster,
+        services,
+        wave_size,
+        max_workers=get_int("aws.redeploy_workers", DEFAULT_MAX_WORKERS),
+        timeout=wait_timeout,
+        poll_interval=get_int("aws.stability_poll_interval", DEFAULT_POLL_INTERVAL),
+        abort_on_failure=abort_on_failure,
+        progress=report_redeploy_progress,
+        wave_progress=report_wave_progress,
+        task_definitions=task_definitions,
+    )
+    output.emit(
+        "summary",
+        f"{report.stable}/{len(report.results)} services stable in "
+        f"{report.elapsed:.0f}s ({report.throughput:.1f} services/min)",
+        stable=report.stable,
+        total=len(report.results),
+        waves=report.waves,
+        seconds=round(report.elapsed, 3),
+        services_per_minute=round(report.throughput, 2),
+        aborted=report.aborted,
+    )
+    failed = len(report.results) - report.stable
+    if report.aborted:
+        raise click.ClickException(
+            f"Restart aborted after a failed wave; {failed} services not stable."
+        )
+    if failed:
+        raise click.ClickException(f"{failed} services did not become stable.")
+
+
+def run_aws_fargate_restart(
+    all_services: bool = True,
+    wave_size: int = None,
+    wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+    abort_on_failure: bool = True,
+    cluster: str = None,
+    service: str = None,
+    families: tuple = None,
+    plan: bool = False,
+) -> None:
+    """Restart AWS Fargate tasks.
+
+    Only ACTIVE Fargate services are considered, optionally narrowed to
+    task definition ``families`` (globs). With ``wave_size`` all services
+    are restarted that many at a time, each wave waiting for its deployments
+    to become stable before the next starts. ``cluster`` and ``service``
+    select by exact name or glob instead of prompting. With ``plan`` the
+    restart is only estimated; no service is redeployed.
+    """
     (
                 aws_access_key_id,
                 aws_secret_access_key,
@@ -161,33 +970,67 @@ def run_aws_fargate_restart(all_services: bool=True)-> None:
         aws_session_token,
     )
     if not clusters:
-        click.echo("No ECS clusters found.")
+        output.echo("No ECS clusters found.")
         return
-    cluster = choose_cluster(clusters)
-    services = get_fargate_services(
-        cluster,
-        aws_access_key_id,
-        aws_secret_access_key,
-        aws_session_token,
+    cluster = choose_cluster(clusters, cluster)
+    records = select_records(
+        get_fargate_service_records(
+            cluster,
+            aws_access_key_id,
+            aws_secret_access_key,
+            aws_session_token,
+        ),
+        families=families,
     )
-    if not services:
-        click.echo("No services found in the selected cluster.")
+    if not records:
+        output.echo("No services found in the selected cluster.")
         return
-    click.echo(
-        f"Force redeploying all {len(services)} services in cluster {cluster}..."
-    )
-    if all_services:
-        for service in services:
-            ecs_force_redeploy(
-                cluster,
-                service,
-                aws_access_key_id,
-                aws_secret_access_key,
-                aws_session_token,
+    if plan:
+        if not all_services:
+            chosen = choose_service([record.arn for record in records], service)
+            records = [record for record in records if record.arn == chosen]
+        report_restart_plan(
+            plan_restart(
+                records,
+                wave_size=wave_size if all_services else None,
+                round_seconds=get_int("aws.plan_round_seconds", DEFAULT_ROUND_SECONDS),
+                poll_interval=get_int("aws.stability_poll_interval", DEFAULT_POLL_INTERVAL),
             )
-            click.echo("Force redeploy triggered for all services.")
+        )
+        return
+    services = [record.arn for record in records]
+    task_definitions = {record.arn: record.task_definition for record in records}
+    if all_services and wave_size:
+        _restart_in_waves(
+            aws_client("ecs", aws_access_key_id, aws_secret_access_key, aws_session_token),
+            cluster,
+            services,
+            wave_size,
+            wait_timeout,
+            abort_on_failure,
+            task_definitions,
+        )
+    elif all_services:
+        output.echo(
+            f"Force redeploying all {len(services)} services in cluster {cluster}..."
+        )
+        ecs = aws_client("ecs", aws_access_key_id, aws_secret_access_key, aws_session_token)
+        results = force_redeploy_services(
+            ecs,
+            cluster,
+            services,
+            max_workers=get_int("aws.redeploy_workers", DEFAULT_MAX_WORKERS),
+            progress=report_redeploy_progress,
+            task_definitions=task_definitions,
+        )
+        failed = [result for result in results if not result.ok]
+        if failed:
+            raise click.ClickException(
+                f"Force redeploy failed for {len(failed)} of {len(results)} services."
+            )
+        output.echo("Force redeploy triggered for all services.")
     else:
-        service = choose_service(services)
+        service = choose_service(services, service)
         ecs_force_redeploy(
             cluster,
             service,
@@ -195,4 +1038,80 @@ def run_aws_fargate_restart(all_services: bool=True)-> None:
             aws_secret_access_key,
             aws_session_token,
         )
-        click.echo("Force redeploy triggered for the selected service.")
+        output.echo("Force redeploy triggered for the selected service.")
+
+
+def report_watch_change(service: str, status: dict, events: list) -> None:
+    """Print a watched service's new status and its new service events."""
+    name = service_name(service)
+    if status["state"] == "missing":
+        text = f"{name}: not found"
+    else:
+        text = (
+            f"{name}: {status['state']}, {status['running']}/{status['desired']} running, "
+            f"{status['pending']} pending, {status['deployments']} deployments"
+        )
+        if status["rollout"]:
+            text += f", rollout {status['rollout'].lower().replace('_', ' ')}"
+    output.emit("status", text, service=service, **status)
+    for event in events:
+        output.emit(
+            "event",
+            f"  {name}: {event.get('message', '')}",
+            service=service,
+            id=event.get("id"),
+            created_at=event.get("createdAt"),
+            message=event.get("message"),
+        )
+
+
+def run_aws_watch(
+    cluster: str = None,
+    service_patterns: tuple = ("*",),
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    timeout: float = None,
+    until_stable: bool = True,
+) -> dict:
+    """Stream deployment status and service events of the selected services.
+
+    All watched services of the cluster are polled together, in batches of
+    ten per ``describe_services`` call, with an interval that backs off
+    while nothing changes. Returns the last status of every service.
+    """
+    (
+        aws_access_key_id,
+        aws_secret_access_key,
+        aws_session_token,
+        role_arn,
+    ) = get_aws_credentials(get_config_accounts())
+    clusters = get_clusters(aws_access_key_id, aws_secret_access_key, aws_session_token)
+    if not clusters:
+        output.echo("No ECS clusters found.")
+        return {}
+    cluster = choose_cluster(clusters, cluster)
+    services = [
+        record.arn
+        for record in get_fargate_service_records(
+            cluster, aws_access_key_id, aws_secret_access_key, aws_session_token
+        )
+        if matches(record.arn, service_patterns)
+    ]
+    if not services:
+        output.echo("No matching services found in the selected cluster.")
+        return {}
+    output.echo(f"Watching {len(services)} services in cluster {cluster} (Ctrl-C to stop)...")
+    ecs = aws_client("ecs", aws_access_key_id, aws_secret_access_key, aws_session_token)
+    statuses = watch_services(
+        ecs,
+        cluster,
+        services,
+        report_watch_change,
+        interval=interval,
+        max_interval=get_int("aws.watch_max_interval", DEFAULT_MAX_WATCH_INTERVAL),
+        timeout=timeout,
+        until_stable=until_stable,
+    )
+    failed = [s for s, status in statuses.items() if status["state"] in ("failed", "missing")]
+    if failed:
+        raise click.ClickException(f"{len(failed)} services failed to deploy.")
+    return statuses
@@ -40,7 +40,7 @@ from chef import ChefAPI, Environment
 import chef
 
 
-import click
+from lizzy import output
 
 
 def setup_chef_api() -> ChefAPI:
@@ -66,10 +66,10 @@ def get_chef_environment() -> str:
         raise ValueError("No Chef environments configured.")
     if len(environments) == 1:
         return environments[0]
-    click.echo("Multiple Chef environments found:")
+    output.echo("Multiple Chef environments found:")
     for idx, env in enumerate(environments, start=1):
-        click.echo(f"{idx}. {env}")
-    choice = click.prompt("Select an environment by number", type=int)
+        output.echo(f"{idx}. {env}")
+    choice = output.prompt("Select an environment by number", type=int)
     if 1 <= choice <= len(environments):
         return environments[choice - 1]
     else:
@@ -77,41 +77,41 @@ def get_chef_environment() -> str:
 
 def update_datadog_version() -> None:
     """Update the Datadog version in Chef configurations."""
-    click.echo("Updating Datadog version in Chef configurations.")
+    output.echo("Updating Datadog version in Chef configurations.")
     api = setup_chef_api()
     env = chef.Environment(get_chef_environment(), api=api)
-    if click.confirm("Do you want to fetch the latest Datadog version from GitHub?"):
+    if output.confirm("Do you want to fetch the latest Datadog version from GitHub?"):
         new_version = get_latest_datadog_version().replace("v", "")
         if not new_version:
-            click.echo("Could not fetch the latest Datadog version.")
+            output.echo("Could not fetch the latest Datadog version.")
             return
-        click.echo(f"Latest Datadog version found: {new_version}")
+        output.echo(f"Latest Datadog version found: {new_version}")
     else:
-        new_version = click.prompt("Enter the new Datadog version", type=str)
-    click.echo(f"Updating Datadog version from {env.override_attributes.get('datadog', {}).get('agent_version', 'not set')} to {new_version}")
-    click.confirm("Are you sure you want to proceed?", abort=True)
+        new_version = output.prompt("Enter the new Datadog version", type=str)
+    output.echo(f"Updating Datadog version from {env.override_attributes.get('datadog', {}).get('agent_version', 'not set')} to {new_version}")
+    output.confirm("Are you sure you want to proceed?", abort=True)
     env.override_attributes["datadog"]["agent_version"] = new_version
     env.save()
 
 def update_chef_version() -> None:
     """Update the Chef version in Chef configurations."""
-    click.echo("Updating Chef version in Chef configurations.")
+    output.echo("Updating Chef version in Chef configurations.")
     api = setup_chef_api()
     env = chef.Environment(get_chef_environment(), api=api)
 
     if "chef_client_updater" not in env.default_attributes:
         env.default_attributes["chef_client_updater"] = {}
-    if click.confirm("Do you want to fetch the latest Chef version from GitHub?"):
+    if output.confirm("Do you want to fetch the latest Chef version from GitHub?"):
         new_version = get_latest_chef_version().replace("v", "")
         if not new_version:
-            click.echo("Could not fetch the latest Chef version.")
+            output.echo("Could not fetch the latest Chef version.")
             return
-        click.echo(f"Latest Chef version found: {new_version}")
+        output.echo(f"Latest Chef version found: {new_version}")
     else:
-        new_version = click.prompt("Enter the new Chef version", type=str)
+        new_version = output.prompt("Enter the new Chef version", type=str)
         
-    click.echo(f"Updating Chef version from {env.default_attributes.get('chef_client_updater', {}).get('version', 'not set')} to {new_version}")
-    click.confirm("Are you sure you want to proceed?", abort=True)
+    output.echo(f"Updating Chef version from {env.default_attributes.get('chef_client_updater', {}).get('version', 'not set')} to {new_version}")
+    output.confirm("Are you sure you want to proceed?", abort=True)
     env.default_attributes["chef_client_updater"]["version"] = new_version
     env.save()
 
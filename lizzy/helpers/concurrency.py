@@ -0,0 +1,16 @@
+"""Thread pools that carry the running command's context into their workers."""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that runs each task in a copy of the submitter's context.
+
+    Context variables of the running command, such as its output mode and the
+    console it writes to (see :mod:`lizzy.output`), follow its work into the
+    pool, so commands served side by side by the daemon keep their output apart.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
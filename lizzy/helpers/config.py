@@ -1,9 +1,20 @@
+import functools
 import json
+import marshal
+import os
 import subprocess
+import threading
+from collections.abc import Mapping
 from pathlib import Path
 
 import click
 
+from lizzy import profiling
+
+
+class ConfigError(click.ClickException, ValueError):
+    """Raised when a config value is missing or has the wrong type."""
+
 
 def config_dir() -> str:
     """Return the path to the config directory."""
@@ -15,22 +26,289 @@ def config_path() -> str:
     return config_dir() / "config.json"
 
 
+def cache_dir() -> Path:
+    """Return the directory holding lizzy's local caches."""
+    return config_dir() / "cache"
+
+
 def example_config_path() -> str:
     """Return the path to the example config file."""
     return Path(__file__).parent / "example_config.json"
 
 
-def get_config():
-    """Load the config file, or the example config if it does not exist."""
-    if config_path().exists():
-        with open(config_path()) as f:
-            config = json.load(f)
-    else:
-        with open(example_config_path()) as f:
-            config = json.load(f)
+def profile_path(profile: str) -> Path:
+    """Return the path to the overlay file of a config profile."""
+    return config_dir() / "profiles" / f"{profile}.json"
+
+
+ENV_PREFIX = "LIZZY__"
+
+_profile = None
+
+
+def set_profile(profile: str = None) -> None:
+    """Select the config profile for this process (None uses LIZZY_PROFILE)."""
+    global _profile
+    _profile = profile
+
+
+def active_profile() -> str:
+    """Return the selected config profile, if any."""
+    return _profile or os.environ.get("LIZZY_PROFILE") or None
+
+
+def env_overrides() -> tuple:
+    """Return the ``LIZZY__SECTION__KEY=value`` overrides from the environment."""
+    return tuple(
+        sorted(
+            (name, value)
+            for name, value in os.environ.items()
+            if name.startswith(ENV_PREFIX) and len(name) > len(ENV_PREFIX)
+        )
+    )
+
+
+def _parse_env_value(value: str):
+    """Parse an override value as JSON, falling back to the raw string."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def deep_merge(base: dict, overlay: Mapping) -> dict:
+    """Merge ``overlay`` into ``base`` in place; nested objects are merged."""
+    for key, value in overlay.items():
+        if isinstance(value, Mapping) and isinstance(base.get(key), dict):
+            deep_merge(base[key], value)
+        elif isinstance(value, Mapping):
+            base[key] = deep_merge({}, value)
+        else:
+            base[key] = value
+    return base
+
+
+def apply_env_overrides(config: dict, overrides: tuple) -> dict:
+    """Apply environment overrides to a merged config in place."""
+    for name, value in overrides:
+        keys = name[len(ENV_PREFIX) :].lower().split("__")
+        target = config
+        for key in keys[:-1]:
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        target[keys[-1]] = _parse_env_value(value)
+    return config
+
+
+class FrozenConfig(Mapping):
+    """Read-only view of a parsed config object.
+
+    Nested objects and lists are frozen when they are first looked up, not
+    up front, so a cold start does not copy every component of a large
+    config just to read a few settings.
+    """
+
+    __slots__ = ("_data", "_frozen")
+
+    def __init__(self, data: dict):
+        self._data = data
+        self._frozen = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._frozen[key]
+        except KeyError:
+            value = self._frozen[key] = freeze(self._data[key])
+            return value
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"FrozenConfig({self._data!r})"
+
+
+def freeze(value):
+    """Return a read-only view of a parsed config value."""
+    if isinstance(value, dict):
+        return FrozenConfig(value)
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+SNAPSHOT_FORMAT = 2
+
+
+def snapshot_path(path, profile: str = None) -> Path:
+    """Return the path of the compiled snapshot kept next to a config file."""
+    path = Path(path)
+    if profile:
+        return path.with_name(f"{path.stem}.{profile}.snapshot")
+    return path.with_suffix(".snapshot")
+
+
+def snapshots_enabled() -> bool:
+    """Return whether compiled config snapshots should be used."""
+    return os.environ.get("LIZZY_CONFIG_SNAPSHOT", "1") != "0"
+
+
+def read_snapshot(snapshot: Path, key: tuple):
+    """Return the config stored in a snapshot for ``key``, or None if stale."""
+    try:
+        header, config = marshal.loads(snapshot.read_bytes())
+    except (OSError, ValueError, TypeError, EOFError):
+        return None
+    if header != (SNAPSHOT_FORMAT, *key):
+        return None
     return config
 
 
+def write_snapshot(snapshot: Path, key: tuple, config: dict) -> None:
+    """Write a compiled snapshot of the config, ignoring unwritable locations.
+
+    The snapshot holds API tokens, so it is only ever readable by its owner.
+    """
+    tmp_path = snapshot.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        data = marshal.dumps(((SNAPSHOT_FORMAT, *key), config))
+        fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, snapshot)
+    except (OSError, ValueError):
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_config_file(path) -> dict:
+    """Parse one JSON config file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def is_valid(config: dict) -> bool:
+    """Return whether a merged config passes schema validation."""
+    from lizzy.helpers.config_model import build_config_model
+
+    try:
+        build_config_model(config)
+    except ConfigError:
+        return False
+    return True
+
+
+def _file_key(path):
+    """Return (path, mtime, size) identifying a file version, or None."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def merge_sources(sources: list, overrides: tuple = ()) -> dict:
+    """Merge config files and environment overrides, in order.
+
+    Later files are merged into the first one in place, so only their own
+    keys are walked; with a single file and no overrides this is a plain
+    ``json.load``.
+    """
+    config = load_config_file(sources[0])
+    for path in sources[1:]:
+        deep_merge(config, load_config_file(path))
+    return apply_env_overrides(config, overrides)
+
+
+class ConfigCache:
+    """Process-wide cache of the merged, read-only config.
+
+    The config is the base file, deep-merged with the active profile's
+    overlay file and then ``LIZZY__`` environment overrides. The merged
+    result is cached in memory and, for the user's own config once it passes
+    validation, in a compiled snapshot next to it, both under the profile,
+    each file's path, mtime and size and the overrides. A cold start with an
+    unchanged config therefore loads the snapshot instead of parsing and
+    merging, and edits are picked up on the next lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._config = None
+
+    def _sources(self, profile: str) -> list:
+        """Return the config files to merge, in order."""
+        base = config_path() if config_path().exists() else example_config_path()
+        sources = [base]
+        if profile:
+            overlay = profile_path(profile)
+            if not overlay.exists():
+                raise ConfigError(f"Config profile {profile!r} not found at {overlay}.")
+            sources.append(overlay)
+        return sources
+
+    def get(self, use_snapshot: bool = True) -> Mapping:
+        """Return the cached config, re-merging if any source changed."""
+        profile = active_profile()
+        sources = self._sources(profile)
+        file_keys = tuple(_file_key(path) for path in sources)
+        overrides = env_overrides()
+        cacheable = all(file_key is not None for file_key in file_keys)
+        key = (profile, file_keys, overrides)
+
+        with self._lock:
+            if cacheable and key == self._key:
+                return self._config
+            # Only the user's config gets a snapshot; never write into the package,
+            # and never persist values that were only passed via LIZZY__ variables.
+            snapshot = None
+            if (
+                cacheable
+                and not overrides
+                and snapshots_enabled()
+                and sources[0] != example_config_path()
+            ):
+                snapshot = snapshot_path(sources[0], profile)
+            with profiling.phase("load config"):
+                merged = read_snapshot(snapshot, key) if snapshot and use_snapshot else None
+                if merged is None:
+                    merged = merge_sources(sources, overrides)
+                    if snapshot and is_valid(merged):
+                        write_snapshot(snapshot, key, merged)
+                config = freeze(merged)
+            if cacheable:
+                self._key, self._config = key, config
+            return config
+
+    def clear(self) -> None:
+        """Drop the cached config."""
+        with self._lock:
+            self._key = None
+            self._config = None
+
+
+_cache = ConfigCache()
+
+
+def get_config() -> Mapping:
+    """Load the config file, or the example config if it does not exist.
+
+    Profile overlays and environment overrides are merged in, and the result
+    is a read-only snapshot cached for the whole process.
+    """
+    return _cache.get()
+
+
+def reload() -> Mapping:
+    """Drop the cached config and parse the config files again."""
+    _cache.clear()
+    return _cache.get(use_snapshot=False)
+
+
 def edit_config():
     """Create or open the config file in ~/.lizzy/config.json using vim."""
     if not config_path().exists():
@@ -48,16 +326,61 @@ def edit_config():
         )
 
 
-def get_setting(setting: str = None):
-    """Get a specific setting from the config file."""
-    split = setting.split(".") if setting else []
+@functools.lru_cache(maxsize=256)
+def _split_setting(setting: str) -> tuple:
+    """Split a dotted setting name into its keys, once per distinct name."""
+    return tuple(setting.split("."))
 
-    if not split:
-        return None
+
+def get_setting(setting: str = None, default=None):
+    """Get a specific setting from the config file."""
+    if not setting:
+        return default
 
     config = get_config()
-    for key in split:
-        config = config.get(key)
+    for key in _split_setting(setting):
+        config = config.get(key) if isinstance(config, Mapping) else None
         if config is None:
-            return None
+            return default
     return config
+
+
+def _get_typed_setting(setting: str, expected_type: type, default):
+    """Get a setting and check that it has the expected type."""
+    value = get_setting(setting)
+    if value is None:
+        return default
+    accepted = {list: (list, tuple), dict: Mapping}.get(expected_type, expected_type)
+    if not isinstance(value, accepted) or (
+        expected_type is int and isinstance(value, bool)
+    ):
+        raise ConfigError(
+            f"Setting {setting} must be of type {expected_type.__name__}, "
+            f"got {type(value).__name__}."
+        )
+    return value
+
+
+def get_str(setting: str, default: str = None) -> str:
+    """Get a string setting."""
+    return _get_typed_setting(setting, str, default)
+
+
+def get_int(setting: str, default: int = None) -> int:
+    """Get an integer setting."""
+    return _get_typed_setting(setting, int, default)
+
+
+def get_bool(setting: str, default: bool = None) -> bool:
+    """Get a boolean setting."""
+    return _get_typed_setting(setting, bool, default)
+
+
+def get_list(setting: str, default: list = None) -> tuple:
+    """Get a list setting (a tuple once the config is frozen)."""
+    return _get_typed_setting(setting, list, default)
+
+
+def get_dict(setting: str, default: dict = None) -> Mapping:
+    """Get a dict setting (a read-only mapping once the config is frozen)."""
+    return _get_typed_setting(setting, dict, default)
@@ -0,0 +1,192 @@
+"""Typed, validated view of the config file.
+
+The raw config is validated once when it is loaded and indexed by name, so
+lookups such as "the AWS account called prod" are O(1) dict hits and schema
+problems are reported up front rather than as a KeyError halfway through a
+bulk operation.
+"""
+
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+
+from lizzy.helpers.config import ConfigError, get_config
+
+
+@dataclass(frozen=True, slots=True)
+class AwsAccount:
+    """An entry of ``aws.accounts``."""
+
+    name: str
+    id: str
+
+    def as_dict(self) -> dict:
+        """Return the account in its config file form."""
+        return {"name": self.name, "id": self.id}
+
+
+@dataclass(frozen=True, slots=True)
+class GitlabComponent:
+    """An entry of ``gitlab.components``."""
+
+    name: str
+    project_name_with_namespace: str = None
+    branch: str = None
+    project_id: str = None
+    file_path: str = None
+    image_pattern: str = None
+
+    def as_dict(self) -> dict:
+        """Return the component in its config file form."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if getattr(self, f.name) is not None
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigModel:
+    """Validated config with name indexes for accounts and components."""
+
+    accounts: tuple = ()
+    components: tuple = ()
+    environments: tuple = ()
+    _accounts_by_name: dict = field(init=False, repr=False, compare=False)
+    _components_by_name: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "_accounts_by_name", {a.name: a for a in self.accounts}
+        )
+        object.__setattr__(
+            self, "_components_by_name", {c.name: c for c in self.components}
+        )
+
+    def account(self, name: str) -> AwsAccount:
+        """Return the AWS account with the given name."""
+        try:
+            return self._accounts_by_name[name]
+        except KeyError:
+            raise ValueError(f"Account with name {name} not found.") from None
+
+    def component(self, name: str) -> GitlabComponent:
+        """Return the GitLab component with the given name."""
+        try:
+            return self._components_by_name[name]
+        except KeyError:
+            raise ValueError(f"Component with name {name} not found.") from None
+
+
+def _parse_accounts(raw, errors: list) -> tuple:
+    """Validate ``aws.accounts`` and return the parsed accounts."""
+    if raw is None:
+        return ()
+    if not isinstance(raw, (list, tuple)):
+        errors.append("aws.accounts must be a list.")
+        return ()
+    accounts = []
+    seen = set()
+    for index, entry in enumerate(raw):
+        where = f"aws.accounts[{index}]"
+        if not isinstance(entry, Mapping):
+            errors.append(f"{where} must be an object.")
+            continue
+        name, account_id = entry.get("name"), entry.get("id")
+        if not isinstance(name, str) or not name:
+            errors.append(f"{where}.name must be a non-empty string.")
+            continue
+        if not isinstance(account_id, (str, int)) or isinstance(account_id, bool):
+            errors.append(f"{where}.id must be a string.")
+            continue
+        if name in seen:
+            errors.append(f"{where}: duplicate account name {name!r}.")
+            continue
+        seen.add(name)
+        accounts.append(AwsAccount(name=name, id=str(account_id)))
+    return tuple(accounts)
+
+
+def _parse_components(raw, errors: list, required: tuple = ()) -> tuple:
+    """Validate ``gitlab.components`` and return the parsed components."""
+    if raw is None:
+        return ()
+    if not isinstance(raw, (list, tuple)):
+        errors.append("gitlab.components must be a list.")
+        return ()
+    known = {f.name for f in fields(GitlabComponent)}
+    components = []
+    seen = set()
+    for index, entry in enumerate(raw):
+        where = f"gitlab.components[{index}]"
+        if not isinstance(entry, Mapping):
+            errors.append(f"{where} must be an object.")
+            continue
+        name = entry.get("name")
+        if not isinstance(name, str) or not name:
+            errors.append(f"{where}.name must be a non-empty string.")
+            continue
+        where = f"gitlab.components[{index}] ({name})"
+        missing = [key for key in required if entry.get(key) in (None, "")]
+        if missing:
+            errors.append(f"{where} is missing {', '.join(missing)}.")
+            continue
+        if name in seen:
+            errors.append(f"{where}: duplicate component name.")
+            continue
+        seen.add(name)
+        components.append(
+            GitlabComponent(**{k: v for k, v in entry.items() if k in known})
+        )
+    return tuple(components)
+
+
+def _raise_errors(errors: list) -> None:
+    """Raise a single ConfigError describing every schema problem."""
+    if errors:
+        raise ConfigError(
+            "Invalid configuration:\n" + "\n".join(f"  - {e}" for e in errors)
+        )
+
+
+def validate_components(raw, required: tuple = ()) -> tuple:
+    """Validate a ``gitlab.components`` list, requiring the given keys."""
+    errors = []
+    components = _parse_components(raw, errors, required)
+    _raise_errors(errors)
+    return components
+
+
+def build_config_model(config: dict) -> ConfigModel:
+    """Validate a raw config dict and build the indexed model."""
+    errors = []
+    aws = config.get("aws") or {}
+    gitlab = config.get("gitlab") or {}
+    accounts = _parse_accounts(aws.get("accounts"), errors)
+    components = _parse_components(gitlab.get("components"), errors)
+    environments = gitlab.get("environments") or []
+    if not isinstance(environments, (list, tuple)) or not all(
+        isinstance(env, str) for env in environments
+    ):
+        errors.append("gitlab.environments must be a list of strings.")
+        environments = []
+    _raise_errors(errors)
+    return ConfigModel(
+        accounts=accounts, components=components, environments=tuple(environments)
+    )
+
+
+_lock = threading.Lock()
+_model_cache = (None, None)
+
+
+def get_config_model() -> ConfigModel:
+    """Return the validated config model, rebuilt only when the config changes."""
+    global _model_cache
+    config = get_config()
+    with _lock:
+        cached_config, model = _model_cache
+        if cached_config is not config:
+            model = build_config_model(config)
+            _model_cache = (config, model)
+        return model
@@ -0,0 +1,188 @@
+"""Encrypted on-disk cache of STS credentials.
+
+Running the gimme-aws-creds Okta flow for every command is slow and noisy.
+Credentials are cached per AWS account id and role ARN in
+``~/.lizzy/cache/sts.enc``, encrypted with Fernet. The key lives in the
+system keyring; without a usable keyring backend nothing is cached (and a
+warning says so), since a key stored next to the cache would not protect
+it. An exclusive ``flock`` serialises lookups and writes, so
+parallel lizzy processes wait for one Okta login instead of racing each
+other. Entries stop being served ``REFRESH_MARGIN`` before they expire.
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+from datetime import UTC, datetime, timedelta
+
+from lizzy.helpers.config import cache_dir
+
+# Matches botocore's advisory refresh window, so credentials refreshed by a
+# long-running client never come back from the cache about to expire.
+REFRESH_MARGIN = timedelta(minutes=15)
+KEYRING_SERVICE = "lizzy"
+KEYRING_USERNAME = "sts-credential-cache"
+
+
+def cache_path():
+    """Return the path of the encrypted credential cache."""
+    return cache_dir() / "sts.enc"
+
+
+def enabled() -> bool:
+    """Return whether the credential cache is enabled (LIZZY_CREDENTIAL_CACHE)."""
+    return os.environ.get("LIZZY_CREDENTIAL_CACHE", "1") != "0"
+
+
+class KeyringUnavailableError(RuntimeError):
+    """Raised when no system keyring backend can hold the encryption key."""
+
+
+def encryption_key() -> bytes:
+    """Return the Fernet key from the system keyring, creating it on first use."""
+    from cryptography.fernet import Fernet
+
+    try:
+        import keyring
+
+        key = keyring.get_password(KEYRING_SERVICE, KEYRING_USERNAME)
+        if key is None:
+            key = Fernet.generate_key().decode()
+            keyring.set_password(KEYRING_SERVICE, KEYRING_USERNAME, key)
+        return key.encode()
+    except Exception as e:
+        # No usable keyring backend (headless hosts, containers).
+        raise KeyringUnavailableError(str(e) or type(e).__name__) from e
+
+
+_warned = False
+
+
+def open_cache():
+    """Return the credential cache, or None when it is disabled or has no key.
+
+    Without a keyring backend the cache is skipped with a warning on stderr
+    (once per process) instead of keeping the key in a file next to it.
+    """
+    global _warned
+    if not enabled():
+        return None
+    try:
+        return CredentialCache(key=encryption_key())
+    except KeyringUnavailableError as e:
+        if not _warned:
+            _warned = True
+            from lizzy import output
+
+            output.echo(
+                f"Warning: AWS credentials are not cached, no system keyring is "
+                f"available ({e}). Install a keyring backend, or set "
+                f"LIZZY_CREDENTIAL_CACHE=0 to log in every time without this warning.",
+                err=True,
+            )
+        return None
+
+
+def parse_expiration(value: str):
+    """Parse an ISO 8601 expiration into an aware datetime, or None."""
+    if not value:
+        return None
+    try:
+        expiration = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if expiration.tzinfo is None:
+        expiration = expiration.replace(tzinfo=UTC)
+    return expiration
+
+
+def is_fresh(entry: dict, now: datetime = None) -> bool:
+    """Return whether a cached entry is still valid for REFRESH_MARGIN."""
+    expiration = parse_expiration(entry.get("credentials", {}).get("expiration"))
+    if expiration is None:
+        return False
+    return expiration - (now or datetime.now(UTC)) > REFRESH_MARGIN
+
+
+class CredentialCache:
+    """Encrypted cache of gimme-aws-creds results.
+
+    Use it inside :meth:`locked`, which holds an exclusive lock on the cache
+    for the whole lookup-login-store sequence.
+    """
+
+    def __init__(self, path=None, key: bytes = None):
+        self.path = path or cache_path()
+        self._key = key
+
+    def _fernet(self):
+        from cryptography.fernet import Fernet
+
+        if self._key is None:
+            self._key = encryption_key()
+        return Fernet(self._key)
+
+    @contextlib.contextmanager
+    def locked(self):
+        """Hold an exclusive lock on the cache across processes."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path.with_suffix(".lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield self
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _read(self) -> dict:
+        from cryptography.fernet import InvalidToken
+
+        try:
+            return json.loads(self._fernet().decrypt(self.path.read_bytes()))
+        except (OSError, ValueError, InvalidToken):
+            # Missing, corrupt or encrypted with a lost key: start over.
+            return {}
+
+    def _write(self, entries: dict) -> None:
+        token = self._fernet().encrypt(json.dumps(entries).encode())
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(token)
+        os.replace(tmp_path, self.path)
+
+    def get(self, account_id: str, role_arn: str = None):
+        """Return a fresh cached entry for the account (and role), or None."""
+        now = datetime.now(UTC)
+        for key, entry in self._read().items():
+            cached_account, _, cached_role = key.partition("|")
+            if cached_account != str(account_id):
+                continue
+            if role_arn is not None and cached_role != role_arn:
+                continue
+            if is_fresh(entry, now):
+                return entry
+        return None
+
+    def put(self, account_id: str, entry: dict) -> bool:
+        """Store an entry under its account id and role ARN; drop expired ones.
+
+        Entries without an expiration are not cached. Returns whether the
+        entry was stored.
+        """
+        if parse_expiration(entry.get("credentials", {}).get("expiration")) is None:
+            return False
+        now = datetime.now(UTC)
+        entries = {key: e for key, e in self._read().items() if is_fresh(e, now)}
+        entries[f"{account_id}|{entry['role']['arn']}"] = {
+            "credentials": dict(entry["credentials"]),
+            "role": {"arn": entry["role"]["arn"]},
+        }
+        self._write(entries)
+        return True
+
+    def clear(self) -> None:
+        """Remove every cached credential."""
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
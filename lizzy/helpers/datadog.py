@@ -1,10 +1,11 @@
 import json
 import re
 
-import click
 import requests
 
+from lizzy import output
 from lizzy.helpers.config import get_setting
+from lizzy.helpers.config_model import validate_components
 from lizzy.helpers.gitlab import setup_gitlab
 
 
@@ -57,7 +58,7 @@ def get_fetch_versions() -> dict:
 def print_fetch_versions() -> None:
     """Fetch the versions of the Datadog agent."""
     for tag in sorted(get_fetch_versions()):
-        click.echo(f"Datadog Agent: {tag}")
+        output.echo(f"Datadog Agent: {tag}")
 
 
 def get_highest_version() -> str:
@@ -68,20 +69,22 @@ def get_highest_version() -> str:
 
 def bump_datadog_components(version: str) -> None:
     """Bump the Datadog components to a specific version."""
-    components = get_setting("gitlab.components")
+    components = validate_components(
+        get_setting("gitlab.components"),
+        required=("project_name_with_namespace", "branch"),
+    )
     username = get_setting("gitlab.username")
     email = get_setting("gitlab.email")
-    components = components if components else []
     gl = setup_gitlab()
     for component in components:
         try:
-            click.echo(f"Bumping Datadog in component: {component['name']}")
+            output.echo(f"Bumping Datadog in component: {component.name}")
 
-            project = gl.projects.get(component["project_name_with_namespace"])
-            click.echo(f"Project: {project.name} - {component['branch']}")
+            project = gl.projects.get(component.project_name_with_namespace)
+            output.echo(f"Project: {project.name} - {component.branch}")
             path = "modules/fargate/templates/container_definition.tpl"
 
-            file = project.files.get(file_path=path, ref=component["branch"])
+            file = project.files.get(file_path=path, ref=component.branch)
             template = file.decode().decode("utf-8")
 
             image = get_datadog_image(json.loads(filter_content(template)))
@@ -89,12 +92,12 @@ def bump_datadog_components(version: str) -> None:
             if not image:
                 return False, "No datadog tag found"
             message = f"Update datadog to {version} from {image.split(':')[-1]}"
-            click.echo(f"Message: {message}")
+            output.echo(f"Message: {message}")
             feature_branch = f"feature/update-datadog-{version}"
 
             # Create feature branch from the develop branch
             project.branches.create(
-                {"branch": feature_branch, "ref": component["branch"]}
+                {"branch": feature_branch, "ref": component.branch}
             )
 
             commit_data = {
@@ -120,14 +123,14 @@ def bump_datadog_components(version: str) -> None:
             merge_request = project.mergerequests.create(
                 {
                     "source_branch": feature_branch,
-                    "target_branch": component["branch"],
+                    "target_branch": component.branch,
                     "title": message,
                 }
             )
 
-            click.echo(f"Merge request created: {merge_request.web_url}")
+            output.echo(f"Merge request created: {merge_request.web_url}")
         except Exception as e:
-            click.echo(f"Failed to bump Datadog in {component['name']}: {e}")
+            output.echo(f"Failed to bump Datadog in {component.name}: {e}")
 
 
 def filter_content(content: str) -> str:
@@ -0,0 +1,611 @@
+"""Concurrent ECS force-redeploy engine.
+
+Restarting every service of a cluster one ``describe_services`` plus one
+``update_service`` call at a time takes minutes on large clusters. The engine
+here shares one ECS client across a bounded thread pool, describes services
+in batches of ten (the API maximum) and retries throttled calls with
+exponential backoff and full jitter.
+"""
+
+import fnmatch
+import math
+import random
+import time
+from concurrent.futures import as_completed
+from dataclasses import dataclass
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from lizzy.helpers.concurrency import ContextThreadPoolExecutor
+
+DESCRIBE_BATCH_SIZE = 10
+DEFAULT_MAX_WORKERS = 8
+
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "TooManyRequestsException",
+        "RequestLimitExceeded",
+        "RequestThrottled",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RedeployResult:
+    """Outcome of forcing a new deployment of one service."""
+
+    service: str
+    ok: bool
+    error: str = None
+    attempts: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceRecord:
+    """Compact view of a described ECS service."""
+
+    arn: str
+    name: str
+    cluster: str
+    launch_type: str = None
+    status: str = None
+    task_definition: str = None
+    desired: int = 0
+    running: int = 0
+    pending: int = 0
+    min_healthy_percent: int = 100
+    max_percent: int = 200
+
+    @classmethod
+    def from_description(cls, service: dict) -> "ServiceRecord":
+        """Build a record from one ``describe_services`` entry."""
+        launch_type = service.get("launchType")
+        if launch_type is None and service.get("capacityProviderStrategy"):
+            # Capacity provider services carry no launch type; FARGATE and
+            # FARGATE_SPOT providers still run on Fargate.
+            providers = {s.get("capacityProvider", "") for s in service["capacityProviderStrategy"]}
+            if all(p.startswith("FARGATE") for p in providers):
+                launch_type = "FARGATE"
+        return cls(
+            arn=service.get("serviceArn", service["serviceName"]),
+            name=service["serviceName"],
+            cluster=service.get("clusterArn"),
+            launch_type=launch_type,
+            status=service.get("status"),
+            task_definition=service.get("taskDefinition"),
+            desired=service.get("desiredCount", 0),
+            running=service.get("runningCount", 0),
+            pending=service.get("pendingCount", 0),
+            min_healthy_percent=service.get("deploymentConfiguration", {}).get(
+                "minimumHealthyPercent", 100
+            ),
+            max_percent=service.get("deploymentConfiguration", {}).get("maximumPercent", 200),
+        )
+
+    @property
+    def family(self) -> str:
+        """Task definition family, e.g. ``api`` for ``.../task-definition/api:42``."""
+        if not self.task_definition:
+            return None
+        return self.task_definition.rsplit("/", 1)[-1].rsplit(":", 1)[0]
+
+
+def chunked(items: list, size: int):
+    """Yield consecutive slices of ``items`` with at most ``size`` entries."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Return whether a boto error means the request was throttled."""
+    if not isinstance(error, ClientError):
+        return False
+    return error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+def call_with_retry(
+    operation,
+    *,
+    max_attempts: int = 5,
+    base_delay: float = 0.5,
+    max_delay: float = 10.0,
+    sleep=time.sleep,
+    **kwargs,
+):
+    """Call ``operation(**kwargs)``, retrying throttled calls with full jitter.
+
+    Returns ``(response, attempts)``. Non-throttling errors, and throttling
+    errors on the last attempt, are raised.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return operation(**kwargs), attempt
+        except ClientError as e:
+            if attempt == max_attempts or not is_throttling_error(e):
+                raise
+            sleep(random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1))))
+
+
+@dataclass(frozen=True, slots=True)
+class TargetResult:
+    """Redeploy results for one cluster of one account and region."""
+
+    account: str
+    region: str = None
+    cluster: str = None
+    results: tuple = ()
+    error: str = None
+
+    @property
+    def restarted(self) -> int:
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.restarted + (1 if self.error else 0)
+
+
+def service_name(service: str) -> str:
+    """Return the service name of a service ARN (or the name itself)."""
+    return service.rsplit("/", 1)[-1]
+
+
+def matches(name: str, patterns) -> bool:
+    """Return whether a name or ARN matches any of the glob patterns.
+
+    Patterns are matched against both the full value and its last ARN
+    segment, so ``api-*`` selects ``arn:...:service/prod/api-gateway``.
+    """
+    short = service_name(name)
+    return any(
+        fnmatch.fnmatchcase(short, pattern) or fnmatch.fnmatchcase(name, pattern)
+        for pattern in patterns
+    )
+
+
+def list_cluster_arns(ecs) -> list:
+    """Return every cluster ARN visible to the client."""
+    arns = []
+    for page in ecs.get_paginator("list_clusters").paginate():
+        arns.extend(page.get("clusterArns", []))
+    return arns
+
+
+def list_service_arns(ecs, cluster: str) -> list:
+    """Return every service ARN of a cluster."""
+    arns = []
+    for page in ecs.get_paginator("list_services").paginate(cluster=cluster):
+        arns.extend(page.get("serviceArns", []))
+    return arns
+
+
+def describe_services(ecs, cluster: str, services: list, sleep=time.sleep) -> dict:
+    """Describe services in batches of ten and index them by service name.
+
+    Services missing from the response are left out of the result.
+    """
+    described = {}
+    for batch in chunked(list(services), DESCRIBE_BATCH_SIZE):
+        response, _ = call_with_retry(
+            ecs.describe_services, cluster=cluster, services=batch, sleep=sleep
+        )
+        for service in response.get("services", []):
+            described[service["serviceName"]] = service
+    return described
+
+
+def list_service_records(
+    ecs,
+    cluster: str,
+    launch_type: str = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    sleep=time.sleep,
+) -> list:
+    """List a cluster's services and describe them into ``ServiceRecord`` objects.
+
+    Batches of ten are described concurrently on the shared client. Records
+    keep the order of ``list_services``. ``launch_type`` is filtered after
+    the describe step rather than by ``list_services``, which would drop
+    capacity provider services: they have no launch type, and
+    :meth:`ServiceRecord.from_description` infers FARGATE for them.
+    """
+    arns = list_service_arns(ecs, cluster)
+    batches = list(chunked(arns, DESCRIBE_BATCH_SIZE))
+    described = {}
+    with ContextThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches) or 1))) as pool:
+        for batch in pool.map(lambda batch: describe_services(ecs, cluster, batch, sleep), batches):
+            described.update(batch)
+    records = [
+        ServiceRecord.from_description({"clusterArn": cluster, **described[service_name(arn)]})
+        for arn in arns
+        if service_name(arn) in described
+    ]
+    if launch_type:
+        records = [record for record in records if record.launch_type == launch_type]
+    return records
+
+
+def select_records(records: list, statuses=("ACTIVE",), families=None) -> list:
+    """Keep records with one of ``statuses`` whose task family matches a glob."""
+    return [
+        record
+        for record in records
+        if (not statuses or record.status in statuses)
+        and (not families or matches(record.family or "", families))
+    ]
+
+
+def force_redeploy_services(
+    ecs,
+    cluster: str,
+    services: list,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    progress=None,
+    sleep=time.sleep,
+    task_definitions: dict = None,
+) -> list:
+    """Force a new deployment of every service using a bounded worker pool.
+
+    ``ecs`` is a single boto3 ECS client shared by all workers (boto3
+    clients are thread-safe). ``progress(result, done, total)`` is called
+    after each service finishes. ``task_definitions`` maps services to
+    already known task definitions, which skips the describe calls. Returns
+    one ``RedeployResult`` per service, in the order of ``services``.
+    """
+    services = list(services)
+    total = len(services)
+    try:
+        if task_definitions is not None:
+            described = {
+                service_name(service): {"taskDefinition": task_definitions[service]}
+                for service in services
+                if service in task_definitions
+            }
+        else:
+            described = describe_services(ecs, cluster, services, sleep=sleep)
+    except (BotoCoreError, ClientError) as e:
+        results = [RedeployResult(service, False, f"describe failed: {e}") for service in services]
+        for done, result in enumerate(results, 1):
+            if progress:
+                progress(result, done, total)
+        return results
+
+    def redeploy(service: str) -> RedeployResult:
+        description = described.get(service_name(service))
+        if description is None:
+            return RedeployResult(service, False, "service not found")
+        try:
+            _, attempts = call_with_retry(
+                ecs.update_service,
+                cluster=cluster,
+                service=service,
+                taskDefinition=description["taskDefinition"],
+                forceNewDeployment=True,
+                sleep=sleep,
+            )
+        except (BotoCoreError, ClientError) as e:
+            return RedeployResult(service, False, str(e))
+        return RedeployResult(service, True, attempts=attempts)
+
+    results = {}
+    with ContextThreadPoolExecutor(max_workers=max(1, min(max_workers, total or 1))) as pool:
+        futures = {pool.submit(redeploy, service): service for service in services}
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results[futures[future]] = result
+            if progress:
+                progress(result, done, total)
+    return [results[service] for service in services]
+
+
+DEFAULT_WAIT_TIMEOUT = 900
+DEFAULT_POLL_INTERVAL = 15
+
+
+def deployment_state(service: dict) -> str:
+    """Classify a described service as "stable", "failed" or "pending".
+
+    A service is stable once its primary deployment is the only one left and
+    runs the desired number of tasks, the same condition as boto3's
+    ``services_stable`` waiter. A FAILED rollout (deployment circuit breaker)
+    is reported straight away instead of waiting for the timeout.
+    """
+    deployments = service.get("deployments", [])
+    if any(d.get("rolloutState") == "FAILED" for d in deployments):
+        return "failed"
+    if len(deployments) == 1 and service.get("runningCount") == service.get("desiredCount"):
+        return "stable"
+    return "pending"
+
+
+def wait_for_stable(
+    ecs,
+    cluster: str,
+    services: list,
+    timeout: float = DEFAULT_WAIT_TIMEOUT,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    sleep=time.sleep,
+    clock=time.monotonic,
+) -> dict:
+    """Poll services in batches of ten until every deployment settles.
+
+    Returns ``{service: state}`` where state is "stable", "failed",
+    "missing" or "timeout".
+    """
+    states = dict.fromkeys(services, "pending")
+    deadline = clock() + timeout
+    while True:
+        pending = [service for service, state in states.items() if state == "pending"]
+        if not pending:
+            return states
+        described = describe_services(ecs, cluster, pending, sleep=sleep)
+        for service in pending:
+            description = described.get(service_name(service))
+            states[service] = deployment_state(description) if description else "missing"
+        if all(states[service] != "pending" for service in pending):
+            return states
+        if clock() >= deadline:
+            return {
+                service: "timeout" if state == "pending" else state
+                for service, state in states.items()
+            }
+        sleep(poll_interval)
+
+
+@dataclass(frozen=True, slots=True)
+class WaveReport:
+    """Outcome of a wave-based restart."""
+
+    results: tuple
+    waves: int
+    elapsed: float
+    aborted: bool = False
+
+    @property
+    def stable(self) -> int:
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def throughput(self) -> float:
+        """Services brought back to a stable state per minute."""
+        return self.stable * 60 / self.elapsed if self.elapsed else 0.0
+
+
+def restart_in_waves(
+    ecs,
+    cluster: str,
+    services: list,
+    wave_size: int,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: float = DEFAULT_WAIT_TIMEOUT,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    abort_on_failure: bool = True,
+    progress=None,
+    wave_progress=None,
+    sleep=time.sleep,
+    clock=time.monotonic,
+    task_definitions: dict = None,
+) -> WaveReport:
+    """Restart services ``wave_size`` at a time, waiting for each wave to settle.
+
+    Every wave is force-redeployed concurrently and then polled until its
+    deployments are stable, failed or ``timeout`` seconds have passed. With
+    ``abort_on_failure`` the remaining waves are skipped after a failure.
+    ``wave_progress(number, total_waves, results, seconds)`` is called after
+    each wave. A result is only ``ok`` once its service is stable.
+    ``task_definitions`` is passed on to :func:`force_redeploy_services`.
+    """
+    services = list(services)
+    waves = list(chunked(services, max(1, wave_size)))
+    results = []
+    started = clock()
+    aborted = False
+    for number, wave in enumerate(waves, 1):
+        if aborted:
+            results.extend(
+                RedeployResult(service, False, "skipped after an earlier wave failed", 0)
+                for service in wave
+            )
+            continue
+        wave_started = clock()
+        redeployed = force_redeploy_services(
+            ecs,
+            cluster,
+            wave,
+            max_workers=max_workers,
+            progress=progress,
+            sleep=sleep,
+            task_definitions=task_definitions,
+        )
+        states = wait_for_stable(
+            ecs,
+            cluster,
+            [result.service for result in redeployed if result.ok],
+            timeout=timeout,
+            poll_interval=poll_interval,
+            sleep=sleep,
+            clock=clock,
+        )
+        wave_results = []
+        for result in redeployed:
+            state = states.get(result.service)
+            if result.ok and state != "stable":
+                error = (
+                    f"not stable after {timeout:g}s"
+                    if state == "timeout"
+                    else f"deployment {state}"
+                )
+                result = RedeployResult(result.service, False, error, result.attempts)
+            wave_results.append(result)
+        results.extend(wave_results)
+        if wave_progress:
+            wave_progress(number, len(waves), wave_results, clock() - wave_started)
+        if abort_on_failure and not all(result.ok for result in wave_results):
+            aborted = number < len(waves)
+    return WaveReport(tuple(results), len(waves), clock() - started, aborted)
+
+
+DEFAULT_ROUND_SECONDS = 180
+
+
+def replacement_rounds(desired: int, min_healthy_percent: int = 100, max_percent: int = 200):
+    """Return how many rolling steps replace every task, or None if none can.
+
+    ECS may run up to ``max_percent`` of the desired count and must keep
+    ``min_healthy_percent`` healthy, so each step replaces the difference.
+    """
+    if desired <= 0:
+        return 0
+    step = math.floor(desired * max_percent / 100) - math.ceil(desired * min_healthy_percent / 100)
+    if step <= 0:
+        return None
+    return math.ceil(desired / step)
+
+
+@dataclass(frozen=True, slots=True)
+class ServicePlan:
+    """Planned restart of one service."""
+
+    record: ServiceRecord
+    rounds: int
+    seconds: float
+
+    @property
+    def blocked(self) -> bool:
+        """Whether the deployment configuration leaves no room to replace tasks."""
+        return self.rounds is None
+
+
+@dataclass(frozen=True, slots=True)
+class RestartPlan:
+    """Estimated cost of restarting a set of services."""
+
+    services: tuple
+    waves: int
+    seconds: float
+    api_calls: dict
+
+    @property
+    def tasks(self) -> int:
+        return sum(plan.record.desired for plan in self.services)
+
+
+def plan_restart(
+    records: list,
+    wave_size: int = None,
+    round_seconds: float = DEFAULT_ROUND_SECONDS,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> RestartPlan:
+    """Estimate tasks replaced, duration and ECS calls of a restart, without making it.
+
+    Each rolling step is assumed to take ``round_seconds``. Services restart
+    concurrently, or one wave after the other with ``wave_size``, in which
+    case the stability polls are budgeted as well. Blocked services are
+    left out of the duration.
+    """
+    plans = []
+    for record in records:
+        rounds = replacement_rounds(
+            record.desired, record.min_healthy_percent, record.max_percent
+        )
+        plans.append(ServicePlan(record, rounds, (rounds or 0) * round_seconds))
+    waves = list(chunked(plans, wave_size)) if wave_size else [plans]
+    seconds = sum(max((plan.seconds for plan in wave), default=0) for wave in waves)
+    api_calls = {
+        "describe_services": math.ceil(len(plans) / DESCRIBE_BATCH_SIZE),
+        "update_service": len(plans),
+    }
+    if wave_size:
+        api_calls["describe_services"] += sum(
+            math.ceil(len(wave) / DESCRIBE_BATCH_SIZE)
+            * (math.ceil(max((plan.seconds for plan in wave), default=0) / poll_interval) + 1)
+            for wave in waves
+        )
+    return RestartPlan(tuple(plans), len(waves) if plans else 0, seconds, api_calls)
+
+
+DEFAULT_WATCH_INTERVAL = 5
+DEFAULT_MAX_WATCH_INTERVAL = 60
+
+
+def service_status(service: dict) -> dict:
+    """Return the fields of a described service that ``watch_services`` tracks."""
+    deployments = service.get("deployments", [])
+    primary = next((d for d in deployments if d.get("status") == "PRIMARY"), {})
+    return {
+        "status": service.get("status"),
+        "deployments": len(deployments),
+        "rollout": primary.get("rolloutState"),
+        "desired": service.get("desiredCount", 0),
+        "running": service.get("runningCount", 0),
+        "pending": service.get("pendingCount", 0),
+        "state": deployment_state(service),
+    }
+
+
+def watch_services(
+    ecs,
+    cluster: str,
+    services: list,
+    on_change,
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    max_interval: float = DEFAULT_MAX_WATCH_INTERVAL,
+    timeout: float = None,
+    until_stable: bool = True,
+    sleep=time.sleep,
+    clock=time.monotonic,
+) -> dict:
+    """Poll services and report status changes and new service events.
+
+    Every poll describes all watched services of the cluster in batches of
+    ten, whatever their number. ``on_change(service, status, events)`` is
+    called for services whose status changed or that logged events since
+    watching started (oldest first). The poll interval starts at ``interval``, grows by half
+    after every quiet poll up to ``max_interval`` and drops back as soon as
+    something changes. With ``until_stable`` watching ends once every
+    service is stable or failed; ``timeout`` bounds it in seconds. Returns
+    the last status of every service.
+    """
+    services = list(services)
+    statuses, seen_events, primed = {}, {}, set()
+    deadline = clock() + timeout if timeout is not None else None
+    delay = interval
+    while True:
+        described = describe_services(ecs, cluster, services, sleep=sleep)
+        changed = False
+        for service in services:
+            description = described.get(service_name(service))
+            if description is None:
+                status = {"status": "MISSING", "state": "missing"}
+                events = []
+            else:
+                status = service_status(description)
+                seen = seen_events.get(service)
+                events = []
+                for event in description.get("events", []):
+                    if event.get("id") == seen:
+                        break
+                    events.append(event)
+                if events:
+                    seen_events[service] = events[0].get("id")
+                if service not in primed:
+                    # The first poll only marks where watching started; older
+                    # events are history, not news.
+                    primed.add(service)
+                    events = []
+                events.reverse()
+            if status != statuses.get(service) or events:
+                changed = True
+                statuses[service] = status
+                on_change(service, status, events)
+        if until_stable and all(s["state"] != "pending" for s in statuses.values()):
+            return statuses
+        if deadline is not None and clock() >= deadline:
+            return statuses
+        delay = interval if changed else min(delay * 1.5, max_interval)
+        if deadline is not None:
+            delay = max(min(delay, deadline - clock()), 0)
+        sleep(delay)
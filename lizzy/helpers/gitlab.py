@@ -1,28 +1,157 @@
+import fnmatch
+import threading
+import time
+from dataclasses import dataclass, field
+
 import click
 import gitlab
+import requests
+from urllib3.util.retry import Retry
+
+from lizzy import output
+from lizzy.helpers.concurrency import ContextThreadPoolExecutor
+from lizzy.helpers.config import get_int, get_setting
+from lizzy.helpers.config_model import validate_components
+
+DEFAULT_GITLAB_URL = "https://gitlab.com"
+DEFAULT_SCAN_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 5
+RETRY_STATUSES = (429, 502, 503)
+RETRY_BACKOFF_FACTOR = 0.5
+DEFAULT_PROTECTED_BRANCHES = ("main", "develop", "master")
+MERGE_REQUEST_QUERIES = ("projects", "group")
+BACKENDS = ("rest", "graphql")
+GRAPHQL_PAGE_SIZE = 50
+
+# Pause all workers once fewer requests than this are left in the window.
+RATE_LIMIT_RESERVE = 10
+
+
+class GitlabRetry(Retry):
+    """Retry policy of the pooled GitLab session.
+
+    Idempotent requests are retried on 429, 502 and 503 with exponential
+    backoff, waiting for ``Retry-After`` when the server sends it. A 429 is
+    also retried for POST, since GitLab rejected the request unprocessed.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code == 429:
+            return bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def gitlab_retry(max_retries: int = DEFAULT_MAX_RETRIES) -> GitlabRetry:
+    """Return the retry policy for ``max_retries`` attempts."""
+    return GitlabRetry(
+        total=max_retries,
+        connect=max_retries,
+        status_forcelist=RETRY_STATUSES,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+class GitlabClientFactory:
+    """Per-process cache of GitLab clients.
+
+    One client is kept per (url, token), on a ``requests.Session`` whose
+    connection pool is sized to the largest worker count asked for so far,
+    so concurrent scans reuse keep-alive connections instead of opening and
+    discarding one per request. The session retries 429/502/503 (see
+    :class:`GitlabRetry`); python-gitlab's own 429 handling only kicks in
+    once those retries are used up.
+    """
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES):
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._pool_sizes = {}
+
+    def _mount(self, session: requests.Session, pool_size: int) -> None:
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=gitlab_retry(self.max_retries),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
 
-from lizzy.helpers.config import get_setting
+    def client(
+        self, url: str, private_token: str, workers: int = DEFAULT_SCAN_CONCURRENCY
+    ) -> gitlab.Gitlab:
+        """Return the cached client of a GitLab instance and token.
 
+        The pool grows when more ``workers`` are asked for than before.
+        """
+        with self._lock:
+            key = (url, private_token)
+            if key not in self._clients:
+                session = requests.Session()
+                self._clients[key] = (
+                    gitlab.Gitlab(url, private_token=private_token, session=session),
+                    session,
+                )
+                self._pool_sizes[key] = 0
+            gl, session = self._clients[key]
+            if workers > self._pool_sizes[key]:
+                self._mount(session, workers)
+                self._pool_sizes[key] = workers
+            return gl
 
-def setup_gitlab() -> gitlab.Gitlab:
-    """Set up and return a GitLab connection using the API token from the config."""
+    def clear(self) -> None:
+        """Close and drop every cached client."""
+        with self._lock:
+            for _, session in self._clients.values():
+                session.close()
+            self._clients.clear()
+            self._pool_sizes.clear()
+
+
+_client_factory = None
+_client_factory_lock = threading.Lock()
+
+
+def get_client_factory() -> GitlabClientFactory:
+    """Return the process-wide GitLab client factory."""
+    global _client_factory
+    with _client_factory_lock:
+        if _client_factory is None:
+            _client_factory = GitlabClientFactory(
+                get_int("gitlab.max_retries", DEFAULT_MAX_RETRIES)
+            )
+        return _client_factory
+
+
+def setup_gitlab(workers: int = None) -> gitlab.Gitlab:
+    """Return a GitLab connection using the URL and API token from the config.
+
+    The client is shared by the whole process (see :class:`GitlabClientFactory`).
+    ``gitlab.url`` selects a self-hosted instance, and the connection pool
+    holds ``workers`` connections, ``gitlab.scan_concurrency`` by default.
+    """
     api_token = get_setting("gitlab.api_token")
     if not api_token:
         raise ValueError("GitLab API token is not set in the configuration.")
-    gl = gitlab.Gitlab("https://gitlab.com", private_token=api_token)
-    return gl
+    url = get_setting("gitlab.url") or DEFAULT_GITLAB_URL
+    if workers is None:
+        workers = get_int("gitlab.scan_concurrency", DEFAULT_SCAN_CONCURRENCY)
+    return get_client_factory().client(url, api_token, workers)
 
 
 def develop_to_main() -> None:
     """Switch all specified GitLab repositories from 'develop' branch to 'main' branch."""
 
-    components = get_setting("gitlab.components")
-    components = components if components else []
+    components = validate_components(
+        get_setting("gitlab.components"), required=("project_name_with_namespace",)
+    )
     gl = setup_gitlab()
     for component in components:
         try:
-            print(f"Processing component: {component['name']}")
-            project = gl.projects.get(component["project_name_with_namespace"])
+            output.echo(f"Processing component: {component.name}")
+            project = gl.projects.get(component.project_name_with_namespace)
 
             merge_request = project.mergerequests.create(
                 {
@@ -31,21 +160,22 @@ def develop_to_main() -> None:
                     "title": "Develop to main",
                 }
             )
-            print(f"Merge request created: {merge_request.web_url}")
+            output.echo(f"Merge request created: {merge_request.web_url}")
         except Exception as e:
-            print(f"Failed to create merge request for {component['name']}: {e}")
+            output.echo(f"Failed to create merge request for {component.name}: {e}")
 
 
 def main_to_develop() -> None:
     """Switch all specified GitLab repositories from 'main' branch to 'develop' branch."""
 
-    components = get_setting("gitlab.components")
-    components = components if components else []
+    components = validate_components(
+        get_setting("gitlab.components"), required=("project_name_with_namespace",)
+    )
     gl = setup_gitlab()
     for component in components:
         try:
-            print(f"Processing component: {component['name']}")
-            project = gl.projects.get(component["project_name_with_namespace"])
+            output.echo(f"Processing component: {component.name}")
+            project = gl.projects.get(component.project_name_with_namespace)
 
             merge_request = project.mergerequests.create(
                 {
@@ -54,88 +184,624 @@ def main_to_develop() -> None:
                     "title": "Main to Develop",
                 }
             )
-            print(f"Merge request created: {merge_request.web_url}")
+            output.echo(f"Merge request created: {merge_request.web_url}")
         except Exception as e:
-            print(f"Failed to create merge request for {component['name']}: {e}")
+            output.echo(f"Failed to create merge request for {component.name}: {e}")
+
 
+def remove_merged_branches(dry_run: bool = False, protect: tuple = ()) -> list:
+    """Remove all merged branches in specified GitLab repositories.
 
-def remove_merged_branches() -> None:
-    """Remove all merged branches in specified GitLab repositories."""
+    Branches matching ``gitlab.protected_branches`` (``main``, ``develop``
+    and ``master`` by default) or ``protect`` are kept. Projects are cleaned
+    up concurrently, ``gitlab.scan_concurrency`` at a time, and a summary is
+    printed per project. Returns the ``BranchCleanup`` of every project.
+    """
     gl = setup_gitlab()
     approval_group_id = get_setting("gitlab.approval_group_id")
+    concurrency = get_int("gitlab.scan_concurrency", DEFAULT_SCAN_CONCURRENCY)
+    protected = tuple(get_setting("gitlab.protected_branches") or DEFAULT_PROTECTED_BRANCHES)
     group = gl.groups.get(approval_group_id)
 
+    limiter = RateLimiter()
+    limiter.install(gl)
     projects = group.projects.list(include_subgroups=True, all=True)
-    for project in projects:
-        click.echo(f"Found project: {project.name}, scanning for merged branches...")
+    cleanups = cleanup_merged_branches(
+        gl, projects, protected + tuple(protect), dry_run, concurrency, limiter
+    )
+    report_branch_cleanups(cleanups, dry_run)
+    return cleanups
+
+
+class RateLimiter:
+    """Shared pause driven by GitLab's ``RateLimit-*`` response headers.
+
+    Installed as a response hook on the client's requests session. When
+    ``RateLimit-Remaining`` drops below ``reserve`` every worker waits in
+    :meth:`wait` until ``RateLimit-Reset``; a 429 pauses them for its
+    ``Retry-After``. The session retries the 429 itself.
+    """
+
+    def __init__(self, reserve: int = RATE_LIMIT_RESERVE, clock=time.time, sleep=time.sleep):
+        self.reserve = reserve
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def install(self, gl) -> None:
+        """Watch the responses of a GitLab client's session.
+
+        The client is shared by the process, so a limiter installed by an
+        earlier run is replaced rather than kept alongside this one.
+        """
+        session = getattr(gl, "session", None)
+        if isinstance(session, requests.Session):
+            hooks = session.hooks.setdefault("response", [])
+            hooks[:] = [
+                hook
+                for hook in hooks
+                if not isinstance(getattr(hook, "__self__", None), RateLimiter)
+            ]
+            hooks.append(self.observe)
+
+    def observe(self, response, *args, **kwargs):
+        """Update the pause from one response's headers."""
+        headers = response.headers
+        resume_at = None
+        if response.status_code == 429 and headers.get("Retry-After", "").isdigit():
+            resume_at = self._clock() + int(headers["Retry-After"])
+        elif (
+            headers.get("RateLimit-Remaining", "").isdigit()
+            and headers.get("RateLimit-Reset", "").isdigit()
+            and int(headers["RateLimit-Remaining"]) < self.reserve
+        ):
+            resume_at = float(headers["RateLimit-Reset"])
+        if resume_at is not None:
+            with self._lock:
+                self._resume_at = max(self._resume_at, resume_at)
+        return response
+
+    def wait(self) -> None:
+        """Block while the rate limit window is nearly exhausted."""
+        with self._lock:
+            delay = self._resume_at - self._clock()
+        if delay > 0:
+            self._sleep(delay)
+
+
+@dataclass(frozen=True)
+class MergeCandidate:
+    """An open merge request by the user, green and approved by someone else."""
+
+    project: str
+    iid: int
+    title: str
+    web_url: str
+    author: str
+    approver: str
+    mr: object = field(compare=False, repr=False)
+
+
+@dataclass
+class ProjectScan:
+    """Candidates and log lines collected while scanning one project."""
+
+    project: str
+    candidates: list = field(default_factory=list)
+    messages: list = field(default_factory=list)
+
+
+def _approver(approvals, username: str):
+    """Return the first approver other than ``username``, or None."""
+    for approver in approvals.approved_by:
+        if approver["user"]["username"] != username:
+            return approver["user"]["username"]
+    return None
+
+
+def check_merge_request(proj, mr, project_name: str, username: str, limiter, log):
+    """Return a ``MergeCandidate`` if the MR's pipeline passed and someone else approved it."""
+    limiter.wait()
+    mr_detail = proj.mergerequests.get(mr.iid)
+    limiter.wait()
+    pipelines = mr_detail.pipelines.list(per_page=1, get_all=True)
+
+    if not pipelines:
+        log(f"No pipelines for MR {mr.title}")
+        return None
+    if pipelines[0].status != "success":
+        log(f"MR {mr.title} has failed jobs, skipping")
+        return None
+
+    limiter.wait()
+    approver = _approver(mr_detail.approvals.get(), username)
+    if approver is None:
+        return None
+    log(f"MR {mr.title} approved by {approver} created by {mr.author['username']}")
+    return MergeCandidate(
+        project_name,
+        mr.iid,
+        mr.title,
+        mr.web_url,
+        mr.author["username"],
+        approver,
+        mr_detail,
+    )
+
+
+def scan_project(gl, project, username: str, limiter: RateLimiter = None) -> ProjectScan:
+    """Find the mergeable merge requests of one project.
+
+    Messages are collected instead of printed, so concurrent scans can be
+    reported in project order.
+    """
+    limiter = limiter or RateLimiter()
+    scan = ProjectScan(project.name)
+    log = scan.messages.append
+    try:
+        log(f"Found project: {project.name}, scanning for approved MRs...")
+        limiter.wait()
         proj = gl.projects.get(project.id)
-        branches = proj.branches.list(all=True)
+        limiter.wait()
+        merge_requests = proj.mergerequests.list(state="opened", all=True)
+        if not merge_requests:
+            log(f"No open merge requests found for project: {project.name}")
+            return scan
+
+        for mr in merge_requests:
+            if mr.author["username"] != username:
+                log(f"Skipping MR {mr.title} by {mr.author['username']}")
+                continue
+            candidate = check_merge_request(proj, mr, project.name, username, limiter, log)
+            if candidate is not None:
+                scan.candidates.append(candidate)
+    except Exception as e:
+        log(f"Error processing project {project.name}: {e}")
+    return scan
+
+
+def scan_projects(
+    gl,
+    projects: list,
+    username: str,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    limiter: RateLimiter = None,
+) -> list:
+    """Scan projects concurrently and return their mergeable candidates.
+
+    At most ``concurrency`` projects are scanned at a time. Log lines are
+    printed per project in the order of ``projects`` and candidates are
+    returned in that order too, so confirmation and merging do not depend on
+    which scan finished first.
+    """
+    limiter = limiter or RateLimiter()
+    candidates = []
+    with ContextThreadPoolExecutor(max_workers=max(1, min(concurrency, len(projects) or 1))) as pool:
+        scans = pool.map(lambda project: scan_project(gl, project, username, limiter), projects)
+        for scan in scans:
+            for message in scan.messages:
+                output.echo(message)
+            candidates.extend(scan.candidates)
+    return candidates
+
+
+def _group_mr_project(mr) -> str:
+    """Return the project path of a group-level merge request."""
+    references = getattr(mr, "references", None) or {}
+    return references.get("full", "").split("!", 1)[0] or str(mr.project_id)
+
+
+def scan_group_merge_requests(
+    gl,
+    group,
+    username: str,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    limiter: RateLimiter = None,
+) -> list:
+    """Find mergeable MRs with one group-level query instead of one per project.
+
+    The group merge requests endpoint returns the user's open MRs across
+    all projects and subgroups in one paginated listing; pipeline and
+    approval details are then fetched concurrently for just those MRs.
+    Candidates are returned ordered by project and MR iid.
+    """
+    limiter = limiter or RateLimiter()
+    limiter.wait()
+    merge_requests = sorted(
+        group.mergerequests.list(state="opened", author_username=username, all=True),
+        key=lambda mr: (_group_mr_project(mr), mr.iid),
+    )
+    output.echo(f"Found {len(merge_requests)} open merge requests by {username} in the group.")
 
-        for branch in branches:
-            if branch.name not in ["main", "develop", "master"] and branch.merged:
-                click.echo(f"Removing merged branch: {branch.name}")
-                try:
-                    proj.branches.delete(branch.name)
-                except Exception as e:
-                    click.echo(f"Failed to remove branch {branch.name}: {e}")
+    def check(mr) -> ProjectScan:
+        scan = ProjectScan(_group_mr_project(mr))
+        try:
+            # A lazy project skips the GET /projects/:id round-trip.
+            proj = gl.projects.get(mr.project_id, lazy=True)
+            candidate = check_merge_request(
+                proj, mr, scan.project, username, limiter, scan.messages.append
+            )
+            if candidate is not None:
+                scan.candidates.append(candidate)
+        except Exception as e:
+            scan.messages.append(f"Error processing MR {mr.title}: {e}")
+        return scan
+
+    candidates = []
+    workers = max(1, min(concurrency, len(merge_requests) or 1))
+    with ContextThreadPoolExecutor(max_workers=workers) as pool:
+        for scan in pool.map(check, merge_requests):
+            for message in scan.messages:
+                output.echo(message)
+            candidates.extend(scan.candidates)
+    return candidates
+
+
+GROUP_MERGE_REQUESTS_QUERY = """
+query($group: ID!, $username: String!, $first: Int!, $after: String) {
+  group(fullPath: $group) {
+    mergeRequests(
+      state: opened, authorUsername: $username, includeSubgroups: true,
+      first: $first, after: $after
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        iid
+        title
+        webUrl
+        project { fullPath }
+        author { username }
+        headPipeline { status }
+        approvedBy { nodes { username } }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLError(Exception):
+    """Raised when the GitLab GraphQL API cannot answer a query."""
+
+
+def graphql_query(gl, query: str, variables: dict) -> dict:
+    """Run one GraphQL query on the client's session and return its ``data``."""
+    try:
+        response = gl.session.post(
+            f"{gl.url}/api/graphql",
+            json={"query": query, "variables": variables},
+            headers={"Authorization": f"Bearer {gl.private_token}"},
+            timeout=gl.timeout,
+        )
+    except requests.RequestException as e:
+        raise GraphQLError(str(e)) from e
+    if response.status_code != 200:
+        raise GraphQLError(f"HTTP {response.status_code}")
+    try:
+        payload = response.json()
+    except ValueError as e:
+        # An HTML proxy or maintenance page rather than a GraphQL response.
+        raise GraphQLError(f"invalid JSON response: {e}") from e
+    if not isinstance(payload, dict):
+        raise GraphQLError("invalid JSON response: not an object")
+    if payload.get("errors"):
+        raise GraphQLError("; ".join(error.get("message", "") for error in payload["errors"]))
+    return payload.get("data") or {}
+
+
+def _graphql_candidate(gl, node: dict, username: str, log):
+    """Return a ``MergeCandidate`` for one GraphQL MR node, or None."""
+    title = node["title"]
+    pipeline = node.get("headPipeline")
+    if not pipeline:
+        log(f"No pipelines for MR {title}")
+        return None
+    if pipeline["status"].lower() != "success":
+        log(f"MR {title} has failed jobs, skipping")
+        return None
+
+    approvers = [
+        approver["username"]
+        for approver in node["approvedBy"]["nodes"]
+        if approver["username"] != username
+    ]
+    if not approvers:
+        return None
+    author = node["author"]["username"]
+    log(f"MR {title} approved by {approvers[0]} created by {author}")
+    project = node["project"]["fullPath"]
+    iid = int(node["iid"])
+    # Lazy objects cost no requests; merging goes through REST as before.
+    mr = gl.projects.get(project, lazy=True).mergerequests.get(iid, lazy=True)
+    return MergeCandidate(project, iid, title, node["webUrl"], author, approvers[0], mr)
+
+
+def graphql_merge_candidates(
+    gl, group_path: str, username: str, limiter: RateLimiter = None
+) -> list:
+    """Find mergeable MRs with batched GraphQL queries.
 
+    Each page returns the head pipeline status, approvers and author of up
+    to ``GRAPHQL_PAGE_SIZE`` of the user's open MRs in the group, replacing
+    the three REST calls per MR. Candidates are ordered by project and iid.
+    """
+    limiter = limiter or RateLimiter()
+    nodes, after = [], None
+    while True:
+        limiter.wait()
+        data = graphql_query(
+            gl,
+            GROUP_MERGE_REQUESTS_QUERY,
+            {
+                "group": group_path,
+                "username": username,
+                "first": GRAPHQL_PAGE_SIZE,
+                "after": after,
+            },
+        )
+        if not data.get("group"):
+            raise GraphQLError(f"Group {group_path} not found")
+        page = data["group"]["mergeRequests"]
+        nodes.extend(page["nodes"])
+        if not page["pageInfo"]["hasNextPage"]:
+            break
+        after = page["pageInfo"]["endCursor"]
 
-def fetch_approved_merge_requests(yolo: bool = False) -> None:
-    """Fetch all approved merge requests from specified GitLab repositories."""
+    nodes.sort(key=lambda node: (node["project"]["fullPath"], int(node["iid"])))
+    output.echo(f"Found {len(nodes)} open merge requests by {username} in the group.")
+    candidates = []
+    for node in nodes:
+        candidate = _graphql_candidate(gl, node, username, output.echo)
+        if candidate is not None:
+            candidates.append(candidate)
+    return candidates
+
+
+def merge_candidates(candidates: list, yolo: bool = False) -> None:
+    """Merge candidates one by one, asking first unless ``yolo``."""
+    for candidate in candidates:
+        output.echo(f"Found approved merge request: {candidate.title} ({candidate.web_url})")
+        if yolo:
+            output.echo(f"Auto-merging MR {candidate.title}")
+        elif not output.confirm(f"Merge {candidate.title}?"):
+            continue
+        try:
+            candidate.mr.merge()
+            output.echo(f"Merged MR: {candidate.title}")
+        except Exception as e:
+            output.echo(f"Failed to merge MR {candidate.title}: {e}")
+
+
+def fetch_approved_merge_requests(yolo: bool = False, query: str = None) -> None:
+    """Fetch all approved merge requests from specified GitLab repositories.
+
+    With ``query="group"`` (or ``gitlab.merge_request_query``) the user's
+    open MRs come from one group-level listing; the default ``"projects"``
+    lists the MRs of every project. Either way the checks run concurrently
+    (``gitlab.scan_concurrency``, 8 by default) while honouring GitLab's
+    rate-limit headers, and merging happens afterwards, in project order.
+
+    ``gitlab.backend`` set to ``"graphql"`` fetches the MRs with their
+    pipeline status and approvers in batched GraphQL queries instead, and
+    falls back to the REST scan if the GraphQL API fails.
+    """
 
     gl = setup_gitlab()
     approval_group_id = get_setting("gitlab.approval_group_id")
     username = get_setting("gitlab.username")
+    concurrency = get_int("gitlab.scan_concurrency", DEFAULT_SCAN_CONCURRENCY)
     group = gl.groups.get(approval_group_id)
 
-    projects = group.projects.list(include_subgroups=True, all=True)
-    for project in projects:
+    query = query or get_setting("gitlab.merge_request_query") or "projects"
+    if query not in MERGE_REQUEST_QUERIES:
+        raise click.ClickException(
+            f"gitlab.merge_request_query must be one of {', '.join(MERGE_REQUEST_QUERIES)}."
+        )
+
+    backend = get_setting("gitlab.backend") or "rest"
+    if backend not in BACKENDS:
+        raise click.ClickException(f"gitlab.backend must be one of {', '.join(BACKENDS)}.")
+
+    limiter = RateLimiter()
+    limiter.install(gl)
+    if backend == "graphql":
         try:
-            click.echo(f"Found project: {project.name}, scanning for approved MRs...")
-            proj = gl.projects.get(project.id)
-            merge_requests = proj.mergerequests.list(state="opened", all=True)
-            if not merge_requests:
-                click.echo(f"No open merge requests found for project: {project.name}")
-                continue
+            candidates = graphql_merge_candidates(gl, group.full_path, username, limiter)
+        except GraphQLError as e:
+            output.echo(f"GraphQL query failed ({e}), falling back to REST.")
+        else:
+            merge_candidates(candidates, yolo)
+            return
 
-            for mr in merge_requests:
-                if mr.author["username"] != username:
-                    click.echo(f"Skipping MR {mr.title} by {mr.author['username']}")
-                    continue
-
-                mr_detail = proj.mergerequests.get(mr.iid)
-                pipelines = mr_detail.pipelines.list(per_page=1,get_all=True)
-
-                if not pipelines:
-                    click.echo(f"No pipelines for MR {mr.title}")
-                    continue
-                pipeline = pipelines[0]
-
-                if pipeline.status != "success":
-                    click.echo(f"MR {mr.title} has failed jobs, skipping")
-                    continue
-
-                approvals = mr_detail.approvals.get()
-
-                success = False
-                for approver in approvals.approved_by:
-                    if approver["user"]["username"] != username:
-                        success = True
-                        click.echo(
-                            f"MR {mr.title} approved by {approver['user']['username']} created by {mr.author['username']}"
-                        )
-                        break
-                if success:
-                    click.echo(f"Found approved merge request: {mr.title} ({mr.web_url})")
-                    if yolo:
-                        click.echo(f"Auto-merging MR {mr.title}")
-                        mr_detail.merge()
-                    else:
-                        if input(f"Merge {mr.title}? (y/n): ").lower() == "y":
-                            try:
-                                mr_detail.merge()
-                                click.echo(f"Merged MR: {mr.title}")
-                            except Exception as e:
-                                click.echo(f"Failed to merge MR {mr.title}: {e}")
-        except Exception as e:
-            click.echo(f"Error processing project {project.name}: {e}")
+    if query == "group":
+        candidates = scan_group_merge_requests(gl, group, username, concurrency, limiter)
+    else:
+        projects = group.projects.list(include_subgroups=True, all=True)
+        candidates = scan_projects(gl, projects, username, concurrency, limiter)
+    merge_candidates(candidates, yolo)
+
+
+@dataclass
+class BranchCleanup:
+    """Merged branches of one project and what happened to them."""
+
+    project: str
+    merged: list = field(default_factory=list)
+    kept: list = field(default_factory=list)
+    deleted: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+    bulk: bool = False
+    messages: list = field(default_factory=list)
+
+
+def is_protected(name: str, patterns) -> bool:
+    """Return whether a branch name matches any protected glob."""
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def plan_branch_cleanup(gl, project, protected, limiter: RateLimiter = None):
+    """List the merged branches of one project and decide how to delete them.
+
+    Returns ``(cleanup, proj)``. GitLab's ``delete_merged_branches`` endpoint
+    removes every merged branch that is neither protected in GitLab nor the
+    default branch; ``cleanup.bulk`` is set only when that is exactly the
+    set of branches we would delete one by one. :func:`_delete_planned`
+    checks this again right before the request.
+    """
+    limiter = limiter or RateLimiter()
+    cleanup = BranchCleanup(project.name)
+    cleanup.messages.append(f"Found project: {project.name}, scanning for merged branches...")
+    try:
+        limiter.wait()
+        proj = gl.projects.get(project.id, lazy=True)
+        limiter.wait()
+        branches = [branch for branch in proj.branches.list(all=True) if branch.merged]
+    except Exception as e:
+        cleanup.messages.append(f"Error processing project {project.name}: {e}")
+        return cleanup, None
+
+    for branch in branches:
+        target = cleanup.kept if is_protected(branch.name, protected) else cleanup.merged
+        target.append(branch.name)
+    cleanup.bulk = bool(cleanup.merged) and _bulk_deletable(branches) == set(cleanup.merged)
+    return cleanup, proj
+
+
+def _bulk_deletable(branches) -> set:
+    """Return the merged branches GitLab's ``delete_merged_branches`` would remove."""
+    return {
+        branch.name
+        for branch in branches
+        if branch.merged
+        and not getattr(branch, "protected", False)
+        and not getattr(branch, "default", False)
+    }
+
+
+def _delete(proj, name, limiter: RateLimiter):
+    """Delete one branch, or all merged ones when ``name`` is None; return the error."""
+    try:
+        limiter.wait()
+        if name is None:
+            proj.delete_merged_branches()
+        else:
+            proj.branches.delete(name)
+    except Exception as e:
+        return e
+    return None
+
+
+def _delete_planned(cleanup: BranchCleanup, proj, name, limiter: RateLimiter) -> list:
+    """Run one delete task; return ``(name, error)`` per request made.
+
+    A bulk task (``name`` None) lists the branches again first. If a branch
+    was merged or unprotected since planning, GitLab would now remove a
+    branch lizzy kept, so the planned branches are deleted one by one
+    instead. Only a branch merged between that listing and the bulk request
+    itself can still slip through.
+    """
+    if name is not None:
+        return [(name, _delete(proj, name, limiter))]
+    try:
+        limiter.wait()
+        current = _bulk_deletable(proj.branches.list(all=True))
+    except Exception as e:
+        return [(None, e)]
+    if current != set(cleanup.merged):
+        cleanup.bulk = False
+        cleanup.messages.append("Merged branches changed since listing, removing them one by one")
+        return [(branch, _delete(proj, branch, limiter)) for branch in cleanup.merged]
+    return [(None, _delete(proj, None, limiter))]
+
+
+def _record_delete(cleanup: BranchCleanup, name, error) -> None:
+    """Record the outcome of one delete request in a project's cleanup."""
+    if name is None:
+        if error is None:
+            cleanup.messages.append(
+                f"Queued removal of {len(cleanup.merged)} merged branches in one request"
+            )
+            cleanup.deleted.extend(cleanup.merged)
+        else:
+            cleanup.messages.append(f"Failed to remove merged branches: {error}")
+            cleanup.failed.extend(cleanup.merged)
+        return
+    cleanup.messages.append(f"Removing merged branch: {name}")
+    if error is None:
+        cleanup.deleted.append(name)
+    else:
+        cleanup.messages.append(f"Failed to remove branch {name}: {error}")
+        cleanup.failed.append(name)
+
+
+def cleanup_merged_branches(
+    gl,
+    projects: list,
+    protected=DEFAULT_PROTECTED_BRANCHES,
+    dry_run: bool = False,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    limiter: RateLimiter = None,
+) -> list:
+    """Delete the merged branches of many projects concurrently.
+
+    Projects are listed in parallel first. Then one pool runs a bulk delete
+    for every project where it is safe (checked again right before the
+    request, see :func:`_delete_planned`) and a delete per branch everywhere
+    else, so large projects do not serialise the run. With ``dry_run`` only
+    the listing happens. Cleanups are returned in project order.
+    """
+    limiter = limiter or RateLimiter()
+    workers = max(1, min(concurrency, len(projects) or 1))
+    with ContextThreadPoolExecutor(max_workers=workers) as pool:
+        planned = list(
+            pool.map(
+                lambda project: plan_branch_cleanup(gl, project, protected, limiter), projects
+            )
+        )
+    if dry_run:
+        return [cleanup for cleanup, _ in planned]
+
+    # A task deletes one branch, or every merged branch when its name is None.
+    tasks = []
+    for cleanup, proj in planned:
+        names = [None] if cleanup.bulk else cleanup.merged
+        tasks.extend((cleanup, proj, name) for name in names)
+    with ContextThreadPoolExecutor(max_workers=max(1, min(concurrency, len(tasks) or 1))) as pool:
+        results = list(pool.map(lambda task: _delete_planned(*task, limiter), tasks))
+
+    for (cleanup, _, _), outcomes in zip(tasks, results, strict=True):
+        for name, error in outcomes:
+            _record_delete(cleanup, name, error)
+    return [cleanup for cleanup, _ in planned]
+
+
+def report_branch_cleanups(cleanups: list, dry_run: bool = False) -> None:
+    """Print the log lines and a one-line summary of every project, then the totals."""
+    for cleanup in cleanups:
+        for message in cleanup.messages:
+            output.echo(message)
+        if dry_run:
+            for name in cleanup.merged:
+                output.echo(f"Would remove merged branch: {name}")
+            output.echo(
+                f"{cleanup.project}: {len(cleanup.merged)} merged branches would be removed, "
+                f"{len(cleanup.kept)} kept"
+            )
+        else:
+            output.echo(
+                f"{cleanup.project}: {len(cleanup.deleted)} removed, "
+                f"{len(cleanup.failed)} failed, {len(cleanup.kept)} kept"
+            )
+    merged = sum(len(cleanup.merged) for cleanup in cleanups)
+    if dry_run:
+        output.echo(
+            f"Dry run: {merged} merged branches would be removed in {len(cleanups)} projects."
+        )
+    else:
+        deleted = sum(len(cleanup.deleted) for cleanup in cleanups)
+        failed = sum(len(cleanup.failed) for cleanup in cleanups)
+        output.echo(
+            f"Removed {deleted} of {merged} merged branches in {len(cleanups)} projects "
+            f"({failed} failed)."
+        )
@@ -0,0 +1,180 @@
+"""Local SQLite snapshot of ECS clusters and services.
+
+Paging through ``list_clusters`` and ``list_services`` on every command is
+slow on large accounts. The inventory keeps the described services of every
+account and region in ``~/.lizzy/cache/inventory.sqlite3`` so ``lizzy aws
+inventory`` lists and filters them instantly, and offline. Restarts and
+their cluster and service pickers still list live, since they act on the
+current services and task definitions.
+
+Each account and region is refreshed on its own once it is older than the
+TTL. A refresh lists the clusters, then pages and describes the services of
+every cluster in parallel, and swaps the new rows in within one transaction.
+"""
+
+import contextlib
+import sqlite3
+import time
+
+from lizzy.helpers.concurrency import ContextThreadPoolExecutor
+from lizzy.helpers.config import cache_dir
+from lizzy.helpers.ecs import (
+    DEFAULT_MAX_WORKERS,
+    ServiceRecord,
+    list_cluster_arns,
+    list_service_records,
+    matches,
+)
+
+DEFAULT_TTL = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scopes (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    refreshed_at REAL NOT NULL,
+    PRIMARY KEY (account, region)
+);
+CREATE TABLE IF NOT EXISTS services (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    cluster TEXT NOT NULL,
+    arn TEXT NOT NULL,
+    name TEXT NOT NULL,
+    launch_type TEXT,
+    status TEXT,
+    task_definition TEXT,
+    desired INTEGER NOT NULL DEFAULT 0,
+    running INTEGER NOT NULL DEFAULT 0,
+    pending INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account, region, arn)
+);
+CREATE INDEX IF NOT EXISTS services_by_cluster ON services (account, region, cluster);
+"""
+
+SERVICE_COLUMNS = (
+    "arn",
+    "name",
+    "cluster",
+    "launch_type",
+    "status",
+    "task_definition",
+    "desired",
+    "running",
+    "pending",
+)
+
+
+def inventory_path():
+    """Return the path of the inventory database."""
+    return cache_dir() / "inventory.sqlite3"
+
+
+def _region_key(region: str) -> str:
+    """Store the default region as an empty string so it can be a key."""
+    return region or ""
+
+
+class Inventory:
+    """SQLite-backed snapshot of ECS services.
+
+    A connection is opened per call, so one inventory can be shared by the
+    threads of a multi-account refresh.
+    """
+
+    def __init__(self, path=None, clock=time.time):
+        self.path = path or inventory_path()
+        self._clock = clock
+        self._ready = False
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Yield a connection that commits on success and is always closed."""
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self._ready:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(SCHEMA)
+                self._ready = True
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def refreshed_at(self, account: str, region: str = None):
+        """Return when an account and region was last refreshed, or None."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT refreshed_at FROM scopes WHERE account = ? AND region = ?",
+                (account, _region_key(region)),
+            ).fetchone()
+        return row[0] if row else None
+
+    def is_stale(self, account: str, region: str = None, ttl: float = DEFAULT_TTL) -> bool:
+        """Return whether an account and region is missing or older than ``ttl``."""
+        refreshed_at = self.refreshed_at(account, region)
+        return refreshed_at is None or self._clock() - refreshed_at > ttl
+
+    def refresh(
+        self,
+        ecs,
+        account: str,
+        region: str = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        sleep=time.sleep,
+    ) -> int:
+        """Snapshot the services of every cluster of an account and region.
+
+        Clusters are paged and described in parallel on the shared client.
+        Returns the number of services stored.
+        """
+        clusters = list_cluster_arns(ecs)
+        snapshots = []
+        if clusters:
+            with ContextThreadPoolExecutor(max_workers=max(1, min(max_workers, len(clusters)))) as pool:
+                snapshots = list(
+                    pool.map(
+                        lambda cluster: list_service_records(ecs, cluster, sleep=sleep), clusters
+                    )
+                )
+        records = [record for snapshot in snapshots for record in snapshot]
+        now = self._clock()
+        key = (account, _region_key(region))
+        with self._connect() as connection:
+            connection.execute("DELETE FROM services WHERE account = ? AND region = ?", key)
+            connection.executemany(
+                f"INSERT INTO services (account, region, {', '.join(SERVICE_COLUMNS)}) "
+                f"VALUES (?, ?, {', '.join('?' * len(SERVICE_COLUMNS))})",
+                [
+                    (*key, *(getattr(record, column) for column in SERVICE_COLUMNS))
+                    for record in records
+                ],
+            )
+            connection.execute("INSERT OR REPLACE INTO scopes VALUES (?, ?, ?)", (*key, now))
+        return len(records)
+
+    def services(
+        self,
+        account: str,
+        region: str = None,
+        cluster: str = None,
+        patterns=None,
+        launch_type: str = None,
+    ) -> list:
+        """Return stored services, optionally filtered by cluster, name glob and launch type."""
+        query = f"SELECT {', '.join(SERVICE_COLUMNS)} FROM services WHERE account = ? AND region = ?"
+        params = [account, _region_key(region)]
+        if cluster is not None:
+            query += " AND cluster = ?"
+            params.append(cluster)
+        if launch_type is not None:
+            query += " AND launch_type = ?"
+            params.append(launch_type)
+        with self._connect() as connection:
+            rows = connection.execute(query + " ORDER BY cluster, name", params).fetchall()
+        records = [ServiceRecord(*row) for row in rows]
+        if patterns:
+            records = [record for record in records if matches(record.arn, patterns)]
+        return records
@@ -0,0 +1,152 @@
+"""Fuzzy selection of clusters and services.
+
+Candidates are indexed once by the trigrams and characters of their short
+name (the last ARN segment), so narrowing hundreds of services down on
+every keystroke only intersects a few small sets. Queries shorter than
+three characters, or with no substring match, fall back to an in-order
+subsequence match (``apgw`` finds ``api-gateway``) over the candidates
+containing every query character.
+
+:func:`resolve` handles exact names and globs for non-interactive use, and
+:func:`pick` is the keystroke-driven picker used when stdin and stdout are
+terminals.
+"""
+
+import sys
+
+import click
+
+from lizzy import output
+from lizzy.helpers.ecs import matches, service_name
+
+DEFAULT_VISIBLE = 15
+
+ENTER = ("\r", "\n")
+BACKSPACE = ("\x7f", "\b")
+UP = ("\x1b[A", "\x1bOA")
+DOWN = ("\x1b[B", "\x1bOB", "\t")
+INTERRUPT = ("\x03", "\x1b")
+
+
+def _trigrams(text: str) -> set:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _subsequence_span(query: str, key: str):
+    """Return the span of a greedy in-order match of ``query`` in ``key``, or None."""
+    position = start = -1
+    for char in query:
+        position = key.find(char, position + 1)
+        if position < 0:
+            return None
+        if start < 0:
+            start = position
+    return position - start + 1
+
+
+class FuzzyIndex:
+    """Trigram index over candidate short names."""
+
+    def __init__(self, candidates: list, key=service_name):
+        self.candidates = list(candidates)
+        self.keys = [key(candidate).lower() for candidate in self.candidates]
+        self._postings = {}
+        self._chars = {}
+        for index, text in enumerate(self.keys):
+            for trigram in _trigrams(text):
+                self._postings.setdefault(trigram, set()).add(index)
+            for char in set(text):
+                self._chars.setdefault(char, set()).add(index)
+
+    def _substring_matches(self, query: str) -> list:
+        postings = sorted(
+            (self._postings.get(trigram, set()) for trigram in _trigrams(query)), key=len
+        )
+        if not postings or not postings[0]:
+            return []
+        found = set.intersection(*postings)
+        return [index for index in found if query in self.keys[index]]
+
+    def _subsequence_matches(self, query: str) -> list:
+        postings = sorted((self._chars.get(char, set()) for char in set(query)), key=len)
+        found = set.intersection(*postings) if postings[0] else set()
+        spans = ((index, _subsequence_span(query, self.keys[index])) for index in found)
+        return [(index, span) for index, span in spans if span is not None]
+
+    def search(self, query: str, limit: int = None) -> list:
+        """Return candidates matching ``query``, best first.
+
+        Substring matches rank before subsequence matches; within each,
+        prefix matches and shorter names come first. An empty query returns
+        every candidate in its original order.
+        """
+        query = query.strip().lower()
+        if not query:
+            return self.candidates[:limit]
+        ranked = []
+        if len(query) >= 3:
+            for index in self._substring_matches(query):
+                key = self.keys[index]
+                ranked.append(((0, key.find(query) > 0, len(key), index), index))
+        if not ranked:
+            for index, span in self._subsequence_matches(query):
+                ranked.append(((1, span, len(self.keys[index]), index), index))
+        ranked.sort()
+        return [self.candidates[index] for _, index in ranked[:limit]]
+
+
+def resolve(candidates: list, selector: str) -> list:
+    """Return the candidates selected by an exact name or ARN, or by a glob."""
+    exact = [c for c in candidates if selector in (c, service_name(c))]
+    if exact:
+        return exact
+    return [c for c in candidates if matches(c, (selector,))]
+
+
+def interactive() -> bool:
+    """Return whether the keystroke picker can be used.
+
+    Keystrokes are read from this process's terminal, which a daemon session
+    does not have.
+    """
+    if output.is_remote():
+        return False
+    try:
+        return sys.stdin.isatty() and sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def pick(candidates: list, title: str, visible: int = DEFAULT_VISIBLE) -> str:
+    """Let the user narrow ``candidates`` by typing and pick one with Enter.
+
+    Up/Down (or Tab) move the selection, Backspace edits the query and
+    Escape or Ctrl-C aborts.
+    """
+    index = FuzzyIndex(candidates)
+    query, selected, drawn = "", 0, 0
+    while True:
+        found = index.search(query)
+        selected = min(selected, max(len(found) - 1, 0))
+        lines = [f"{title} ({len(found)}/{len(candidates)}): {query}"]
+        for position, candidate in enumerate(found[:visible]):
+            marker = ">" if position == selected else " "
+            lines.append(f"{marker} {service_name(candidate)}")
+        if drawn:
+            output.echo(f"\x1b[{drawn}F\x1b[J", nl=False)
+        output.echo("\n".join(lines))
+        drawn = len(lines)
+
+        key = click.getchar()
+        if key in ENTER and found:
+            return found[selected]
+        if key in INTERRUPT:
+            raise click.Abort()
+        if key in BACKSPACE:
+            query, selected = query[:-1], 0
+        elif key in UP:
+            selected = max(selected - 1, 0)
+        elif key in DOWN:
+            selected = max(min(selected + 1, min(len(found), visible) - 1), 0)
+        elif key.isprintable():
+            query, selected = query + key, 0
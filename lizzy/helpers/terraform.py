@@ -1,6 +1,7 @@
-import click
 import requests
 import concurrent.futures
+from lizzy import output
+from lizzy.helpers.concurrency import ContextThreadPoolExecutor
 from lizzy.helpers.config import get_setting
 import time
 
@@ -44,8 +45,8 @@ def get_workspaces():
     url = f"{BASE_URL}/api/v2/organizations/{organization}/workspaces"
 
     # Initial call to start the loop
-    print(f"Retrieving workspaces from {organization}")
-    print(f"GET {url}")
+    output.echo(f"Retrieving workspaces from {organization}")
+    output.echo(f"GET {url}")
     response = get_request(url)
     page = response.json()
 
@@ -54,7 +55,7 @@ def get_workspaces():
 
         # Follow pagination link if 'next' exists, else break
         if "next" in page["links"] and page["links"]["next"]:
-            click.echo(f"GET {page['links']['next']}")
+            output.echo(f"GET {page['links']['next']}")
             response = get_request(page["links"]["next"])
             page = response.json()
         else:
@@ -72,7 +73,7 @@ def get_notifications(workspace_id):
 
 def create_slack_notification(workspace_id, webhook_url):
     """Create a Slack notification configuration for a workspace."""
-    click.echo(f"Creating Slack notification for workspace {workspace_id}")
+    output.echo(f"Creating Slack notification for workspace {workspace_id}")
     url = f"{BASE_URL}/api/v2/workspaces/{workspace_id}/notification-configurations"
     payload = {
         "data": {
@@ -104,7 +105,7 @@ def set_slack_webhook() -> None:
         raise ValueError("Slack webhook URL is not set in the configuration.")
 
     for workspace in get_workspaces():
-        click.echo(f"Checking workspace {workspace['attributes']['name']}")
+        output.echo(f"Checking workspace {workspace['attributes']['name']}")
         workspace_id = workspace["id"]
         notifications = get_notifications(workspace_id)
         slack_configured = any(
@@ -114,15 +115,15 @@ def set_slack_webhook() -> None:
         if not slack_configured:
             result = create_slack_notification(workspace_id, slack_webhook_url)
             if result:
-                click.echo(
+                output.echo(
                     f"Slack webhook added to workspace {workspace['attributes']['name']}"
                 )
             else:
-                click.echo(
+                output.echo(
                     f"Failed to add Slack webhook to workspace {workspace['attributes']['name']}"
                 )
         else:
-            click.echo(
+            output.echo(
                 f"Slack webhook already configured for workspace {workspace['attributes']['name']}"
             )
 
@@ -133,18 +134,18 @@ def cancel_run(run_id: str, status: str, workspace_name: str) -> None:
 
     # For planned status, try to discard first since that's the proper action
     if status == "planned":
-        click.echo(f"Run {run_id} is in 'planned' status. Attempting to discard...")
+        output.echo(f"Run {run_id} is in 'planned' status. Attempting to discard...")
         discard_url = f"{BASE_URL}/api/v2/runs/{run_id}/actions/discard"
         discard_response = requests.post(discard_url, headers=get_headers())
 
         if discard_response.status_code == 200:
-            click.echo(f"✅ Successfully discarded run {run_id} (Status: {status})")
+            output.echo(f"✅ Successfully discarded run {run_id} (Status: {status})")
             return
         elif discard_response.status_code == 202:
-            click.echo(f"✅ Discard initiated for run {run_id} (Status: {status})")
+            output.echo(f"✅ Discard initiated for run {run_id} (Status: {status})")
             return
         else:
-            click.echo(
+            output.echo(
                 f"⚠️  Failed to discard run {run_id}: {discard_response.status_code}. Attempting to cancel..."
             )
 
@@ -153,15 +154,15 @@ def cancel_run(run_id: str, status: str, workspace_name: str) -> None:
     cancel_response = requests.post(cancel_url, headers=get_headers())
 
     if cancel_response.status_code == 200:
-        click.echo(f"✅ Successfully cancelled run {run_id} (Status: {status})")
+        output.echo(f"✅ Successfully cancelled run {run_id} (Status: {status})")
     elif cancel_response.status_code == 202:
-        click.echo(f"✅ Cancellation initiated for run {run_id} (Status: {status})")
+        output.echo(f"✅ Cancellation initiated for run {run_id} (Status: {status})")
     elif cancel_response.status_code == 409:
-        click.echo(
+        output.echo(
             f"⚠️  Run {run_id} is in a state that cannot be cancelled (Status: {status}). View it here: {run_link}"
         )
     else:
-        click.echo(
+        output.echo(
             f"❌ Failed to cancel run {run_id}: {cancel_response.status_code}. View it here: {run_link}"
         )
 
@@ -169,13 +170,13 @@ def cancel_run(run_id: str, status: str, workspace_name: str) -> None:
 def discard_plans() -> None:
     """Discard all non-terminal Terraform runs across all workspaces."""
     workspaces = get_workspaces()
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+    with ContextThreadPoolExecutor(max_workers=10) as executor:
         futures = []
 
         for workspace in workspaces:
             workspace_id = workspace["id"]
             workspace_name = workspace["attributes"]["name"]
-            click.echo(
+            output.echo(
                 f"Fetching non-terminal runs for workspace: {workspace_name} (ID: {workspace_id})"
             )
 
@@ -185,7 +186,7 @@ def discard_plans() -> None:
                 run_id = run["id"]
                 status = run["attributes"]["status"]
 
-                click.echo(
+                output.echo(
                     f"Run {run_id} in workspace {workspace_name} is in status {status}. Attempting cancellation..."
                 )
                 futures.append(
@@ -217,7 +218,7 @@ def fetch_non_terminal_runs_for_workspace(workspace_id: str) -> list:
             retry_after = int(
                 response.headers.get("Retry-After", 10)
             )  # Default retry wait time of 10 seconds
-            click.echo(f"Rate limit reached. Retrying after {retry_after} seconds...")
+            output.echo(f"Rate limit reached. Retrying after {retry_after} seconds...")
             time.sleep(retry_after)
             continue  # Retry the request after waiting
 
@@ -234,7 +235,7 @@ def fetch_non_terminal_runs_for_workspace(workspace_id: str) -> list:
 
             if not non_terminal_on_page:
                 # If all runs on this page are terminal, stop fetching more pages
-                click.echo(
+                output.echo(
                     "All runs on this page are in terminal states. Stopping further fetches."
                 )
                 break
@@ -242,7 +243,7 @@ def fetch_non_terminal_runs_for_workspace(workspace_id: str) -> list:
             non_terminal_runs.extend(non_terminal_on_page)
             url = response.json()["links"].get("next")
         else:
-            click.echo(
+            output.echo(
                 f"Error fetching runs for workspace {workspace_id}: {response.status_code}"
             )
             break
@@ -257,10 +258,10 @@ def discard_run(run_id: str, status: str, workspace_name: str) -> None:
     run_link = f"{BASE_URL}/app/{get_organization()}/{workspace_name}/runs/{run_id}"
 
     if discard_response.status_code == 200:
-        click.echo(f"✅ Successfully discarded run {run_id} (Status: {status})")
+        output.echo(f"✅ Successfully discarded run {run_id} (Status: {status})")
     elif discard_response.status_code == 202:
-        click.echo(f"✅ Discard initiated for run {run_id} (Status: {status})")
+        output.echo(f"✅ Discard initiated for run {run_id} (Status: {status})")
     else:
-        click.echo(
+        output.echo(
             f"❌ Failed to discard run {run_id}: {discard_response.status_code}. View it here: {run_link}"
         )
@@ -0,0 +1,122 @@
+"""Cached manifest of the command tree.
+
+The manifest records every command's name, help text, options and owning
+module so the root group can list and resolve commands without scanning or
+importing the ``commands`` package. It is generated on first run (or at
+install time with ``python -m lizzy.manifest``), cached under ``~/.lizzy/``
+and rebuilt whenever a command module changes or the package version bumps.
+"""
+
+import contextlib
+import json
+import os
+from pathlib import Path
+
+import click
+
+import commands
+import lizzy
+from lizzy.helpers.config import config_dir
+
+MANIFEST_FORMAT = 1
+
+
+def manifest_path() -> Path:
+    """Return the path to the cached command manifest."""
+    return config_dir() / "manifest.json"
+
+
+def commands_fingerprint() -> dict:
+    """Return the package version and command module mtimes."""
+    modules = {}
+    for path in commands.__path__:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".py") and entry.is_file():
+                    modules[entry.name] = entry.stat().st_mtime_ns
+    return {"version": lizzy.__version__, "modules": modules}
+
+
+def _describe_params(command: click.Command) -> list:
+    """Describe the options and arguments of a click command."""
+    return [
+        {
+            "name": param.name,
+            "kind": param.param_type_name,
+            "opts": list(param.opts),
+            "required": param.required,
+            "help": getattr(param, "help", None),
+        }
+        for param in command.params
+    ]
+
+
+def _describe_command(command: click.Command) -> dict:
+    """Describe a click command, recursing into groups."""
+    entry = {
+        "module": command.callback.__module__,
+        "help": command.help or "",
+        "options": _describe_params(command),
+    }
+    if isinstance(command, click.Group):
+        entry["commands"] = {
+            name: _describe_command(sub) for name, sub in command.commands.items()
+        }
+    return entry
+
+
+def build_manifest() -> dict:
+    """Import every command module and describe the resulting command tree."""
+    from lizzy.cli import auto_register_commands
+
+    group = click.Group()
+    auto_register_commands(group)
+    return {
+        name: _describe_command(command) for name, command in group.commands.items()
+    }
+
+
+def write_manifest(manifest: dict, fingerprint: dict = None) -> None:
+    """Write the manifest to the cache, replacing any previous version atomically."""
+    path = manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "format": MANIFEST_FORMAT,
+        "fingerprint": fingerprint or commands_fingerprint(),
+        "commands": manifest,
+    }
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(fingerprint: dict):
+    """Return the cached manifest, or None if it is missing or stale."""
+    try:
+        with open(manifest_path()) as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if payload.get("format") != MANIFEST_FORMAT:
+        return None
+    if payload.get("fingerprint") != fingerprint:
+        return None
+    return payload.get("commands")
+
+
+def load_manifest() -> dict:
+    """Return the command manifest, rebuilding the cache when it is stale."""
+    fingerprint = commands_fingerprint()
+    manifest = read_manifest(fingerprint)
+    if manifest is None:
+        manifest = build_manifest()
+        # A read-only home directory only costs us the cache.
+        with contextlib.suppress(OSError):
+            write_manifest(manifest, fingerprint)
+    return manifest
+
+
+if __name__ == "__main__":
+    write_manifest(build_manifest())
+    click.echo(f"Command manifest written to {manifest_path()}")
@@ -0,0 +1,258 @@
+"""Human and machine (NDJSON) output modes.
+
+``text`` is the interactive mode: the banner is shown and commands print
+free-form lines. ``json`` is the machine mode: no banner, and every line a
+command writes to stdout becomes one ``{"type": "message", "text": ...}``
+JSON object, while :func:`emit` writes structured records such as
+``{"type": "version", "version": "7.51.0"}``. Downstream tools can parse
+the stream line by line.
+
+The mode defaults to text; json is opt-in with ``--output``/``LIZZY_OUTPUT``.
+It is selected per invocation, so daemon sessions each keep their own.
+
+Commands write and prompt through :func:`echo`, :func:`prompt`,
+:func:`confirm` and :func:`getpass`, the click functions of the same name
+bound to the console of the running command: the terminal, or the client a
+daemon session is serving (see :func:`redirect`).
+"""
+
+import contextlib
+import contextvars
+import json
+import sys
+import threading
+
+import click
+
+MODES = ("text", "json")
+
+# Context variables rather than thread-locals so worker threads that run a
+# copy of the command's context (see lizzy.helpers.concurrency) write in the
+# same mode and to the same console.
+_mode = contextvars.ContextVar("lizzy_output_mode", default="text")
+_console = contextvars.ContextVar("lizzy_console", default=None)
+
+
+def set_mode(mode: str) -> contextvars.Token:
+    """Select the output mode of the running command.
+
+    Returns a token for :func:`reset_mode`. In json mode this process's
+    stdout is wrapped in an :class:`NdjsonStream`; it passes text through
+    whenever the running command is not in json mode.
+    """
+    token = _mode.set(mode)
+    if mode == "json" and not is_remote() and not isinstance(sys.stdout, NdjsonStream):
+        sys.stdout = NdjsonStream(sys.stdout)
+    return token
+
+
+def reset_mode(token: contextvars.Token) -> None:
+    """Restore the output mode that was selected before :func:`set_mode`."""
+    _mode.reset(token)
+
+
+def current_mode() -> str:
+    """Return the output mode of the running command."""
+    return _mode.get()
+
+
+def is_machine() -> bool:
+    """Return whether output is being written as NDJSON."""
+    return current_mode() == "json"
+
+
+@contextlib.contextmanager
+def redirect(console):
+    """Send the output and prompts of the current context to ``console``.
+
+    ``console`` has ``stdout`` and ``stderr`` text streams, ``isatty``, and
+    ``readline()`` and ``getpass(prompt)`` methods. Worker threads of a
+    :class:`~lizzy.helpers.concurrency.ContextThreadPoolExecutor` inherit it.
+    """
+    token = _console.set(console)
+    try:
+        yield console
+    finally:
+        _console.reset(token)
+
+
+def is_remote() -> bool:
+    """Return whether the running command is served for a daemon client."""
+    return _console.get() is not None
+
+
+def stream(err: bool = False):
+    """Return the stdout, or with ``err`` the stderr, of the running command."""
+    console = _console.get()
+    if console is None:
+        return sys.stderr if err else sys.stdout
+    return console.stderr if err else console.stdout
+
+
+def flush() -> None:
+    """Flush the stdout of the running command."""
+    stream().flush()
+
+
+def echo(*args, **kwargs) -> None:
+    """Call ``click.echo``, writing to the console of the running command."""
+    if is_remote() and kwargs.get("file") is None:
+        kwargs["file"] = stream(kwargs.pop("err", False))
+    click.echo(*args, **kwargs)
+
+
+def readline() -> str:
+    """Read a line of input from the console of the running command."""
+    console = _console.get()
+    return sys.stdin.readline() if console is None else console.readline()
+
+
+def getpass(prompt: str = "Password: ") -> str:
+    """Read a secret from the console of the running command without echoing it."""
+    console = _console.get()
+    if console is None:
+        import getpass
+
+        return getpass.getpass(prompt)
+    return console.getpass(prompt)
+
+
+def prompt(text: str, **kwargs):
+    """Call ``click.prompt``, asking the console of the running command."""
+    if not is_remote():
+        return click.prompt(text, **kwargs)
+    return _remote_prompt(text, **kwargs)
+
+
+def confirm(text: str, **kwargs) -> bool:
+    """Call ``click.confirm``, asking the console of the running command."""
+    if not is_remote():
+        return click.confirm(text, **kwargs)
+    return _remote_confirm(text, **kwargs)
+
+
+def _ask(text: str, hide_input: bool = False) -> str:
+    """Prompt a daemon client for one answer, aborting when its input ends."""
+    if hide_input:
+        return getpass(text)
+    echo(text, nl=False)
+    line = readline()
+    if not line:
+        raise click.Abort()
+    return line.rstrip("\r\n")
+
+
+def _remote_prompt(
+    text: str,
+    default=None,
+    hide_input: bool = False,
+    type=None,
+    show_default: bool = True,
+    prompt_suffix: str = ": ",
+    **kwargs,
+):
+    """Ask a daemon client the way ``click.prompt`` asks the terminal."""
+    convert = click.types.convert_type(type, default)
+    if default is not None and show_default and not hide_input:
+        text = f"{text} [{default}]"
+    while True:
+        value = _ask(f"{text}{prompt_suffix}", hide_input)
+        if not value:
+            if default is None:
+                continue
+            value = default
+        try:
+            return convert(value, None, None)
+        except click.UsageError as e:
+            echo(f"Error: {e.message}", err=True)
+
+
+def _remote_confirm(
+    text: str,
+    default: bool = False,
+    abort: bool = False,
+    show_default: bool = True,
+    prompt_suffix: str = ": ",
+    **kwargs,
+) -> bool:
+    """Ask a daemon client the way ``click.confirm`` asks the terminal."""
+    if show_default:
+        choices = "y/n" if default is None else ("Y/n" if default else "y/N")
+        text = f"{text} [{choices}]"
+    while True:
+        value = _ask(f"{text}{prompt_suffix}").strip().lower()
+        if value in ("y", "yes"):
+            answer = True
+        elif value in ("n", "no"):
+            answer = False
+        elif not value and default is not None:
+            answer = default
+        else:
+            echo("Error: invalid input", err=True)
+            continue
+        if abort and not answer:
+            raise click.Abort()
+        return answer
+
+
+def emit(record_type: str, text: str = None, **fields) -> None:
+    """Write a structured record, or its human-readable ``text`` in text mode."""
+    if is_machine():
+        out = stream()
+        raw = out.raw if isinstance(out, NdjsonStream) else out
+        out.flush()
+        raw.write(json.dumps({"type": record_type, **fields}, default=str) + "\n")
+        raw.flush()
+    elif text is not None:
+        echo(text)
+
+
+class NdjsonStream:
+    """Stdout wrapper that turns written lines into NDJSON message records.
+
+    Text is buffered per thread and emitted on every newline and on flush,
+    so ``click.echo`` calls map to one record per line. Commands not in json
+    mode write straight through.
+    """
+
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            raise TypeError("write() argument must be str")
+        if not is_machine():
+            return self.raw.write(text)
+        buffer = getattr(self._local, "buffer", "") + text
+        *lines, self._local.buffer = buffer.split("\n")
+        self._write_records(lines)
+        return len(text)
+
+    def flush(self) -> None:
+        buffer = getattr(self._local, "buffer", "")
+        if buffer:
+            self._local.buffer = ""
+            self._write_records([buffer])
+        self.raw.flush()
+
+    def _write_records(self, lines: list) -> None:
+        payload = "".join(
+            json.dumps({"type": "message", "text": line}) + "\n"
+            for line in lines
+            if line.strip()
+        )
+        if not payload:
+            return
+        with self._lock:
+            self.raw.write(payload)
+
+    def isatty(self) -> bool:
+        return not is_machine() and self.raw.isatty()
+
+    def fileno(self) -> int:
+        return self.raw.fileno()
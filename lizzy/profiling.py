@@ -0,0 +1,302 @@
+"""Run profiling for ``lizzy --profile-run``.
+
+While a profiler is active it records three kinds of spans:
+
+* ``import`` - every module imported, with its cumulative import time;
+* ``phase`` - named phases marked in the code with :func:`phase` (manifest and
+  command module loading, config loading, authentication, the command itself);
+* ``http`` - every HTTP request made through urllib3, which backs requests,
+  python-gitlab and botocore, so the aws, gitlab, terraform, datadog and
+  github helpers are all covered without touching their call sites.
+
+The result is printed as a summary table or written as JSON or as a
+speedscope (https://www.speedscope.app) trace.
+"""
+
+import builtins
+import contextlib
+import json
+import sys
+import threading
+import time
+
+FORMATS = ("table", "json", "speedscope")
+
+_active = None
+
+
+def _pool_class():
+    """Return urllib3's HTTPConnectionPool if it has been imported."""
+    return getattr(sys.modules.get("urllib3.connectionpool"), "HTTPConnectionPool", None)
+
+
+class Span:
+    """One timed interval recorded by the profiler."""
+
+    __slots__ = ("kind", "name", "start", "end", "thread", "depth", "info")
+
+    def __init__(self, kind: str, name: str, start: float, thread: str, depth: int):
+        self.kind = kind
+        self.name = name
+        self.start = start
+        self.end = start
+        self.thread = thread
+        self.depth = depth
+        self.info = {}
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+    def as_dict(self, origin: float) -> dict:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "start": round(self.start - origin, 6),
+            "seconds": round(self.seconds, 6),
+            "thread": self.thread,
+            **self.info,
+        }
+
+
+class RunProfiler:
+    """Collect import, phase and HTTP spans for one lizzy run."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.end = None
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._original_import = None
+        self._original_urlopen = None
+
+    # -- recording -----------------------------------------------------------
+
+    def _open(self, kind: str, name: str) -> Span:
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        span = Span(kind, name, time.perf_counter(), threading.current_thread().name, depth)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def _close(self, span: Span) -> None:
+        span.end = time.perf_counter()
+        self._local.depth = span.depth
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Record the wall time of a named phase."""
+        span = self._open("phase", name)
+        try:
+            yield span
+        finally:
+            self._close(span)
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        outer = getattr(self._local, "importing", False)
+        span = self._open("import", name)
+        span.info["nested"] = outer
+        self._local.importing = True
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._local.importing = outer
+            self._close(span)
+            if self._original_urlopen is None and _pool_class() is not None:
+                self._patch_urllib3()
+
+    def _urlopen(self, pool, method, url, body=None, *args, **kwargs):
+        span = self._open("http", f"{method} {pool.host}")
+        span.info.update(
+            method=method,
+            host=pool.host,
+            path=url.split("?", 1)[0],
+            sent=len(body) if isinstance(body, (bytes, str)) else 0,
+        )
+        try:
+            response = self._original_urlopen(pool, method, url, body, *args, **kwargs)
+        except Exception as e:
+            span.info["error"] = type(e).__name__
+            raise
+        finally:
+            self._close(span)
+        span.info["status"] = response.status
+        length = response.headers.get("Content-Length")
+        span.info["received"] = int(length) if length and length.isdigit() else 0
+        return response
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def _patch_urllib3(self) -> None:
+        """Wrap urllib3's urlopen, which every HTTP client in lizzy goes through."""
+        pool_class = _pool_class()
+        self._original_urlopen = pool_class.urlopen
+        profiler = self
+
+        def urlopen(pool, method, url, body=None, *args, **kwargs):
+            return profiler._urlopen(pool, method, url, body, *args, **kwargs)
+
+        pool_class.urlopen = urlopen
+
+    def start(self) -> None:
+        """Install the import hook; urllib3 is hooked once something imports it."""
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        if _pool_class() is not None:
+            self._patch_urllib3()
+
+    def stop(self) -> None:
+        """Remove the hooks and freeze the end time."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+        if self._original_urlopen is not None:
+            _pool_class().urlopen = self._original_urlopen
+        self.end = time.perf_counter()
+
+    # -- reports -------------------------------------------------------------
+
+    @property
+    def total(self) -> float:
+        return (self.end or time.perf_counter()) - self.origin
+
+    def _of_kind(self, kind: str) -> list:
+        return [span for span in self.spans if span.kind == kind]
+
+    def to_json(self) -> dict:
+        """Return every span, relative to the start of profiling."""
+        return {
+            "total": round(self.total, 6),
+            "spans": [span.as_dict(self.origin) for span in self.spans],
+        }
+
+    def to_speedscope(self) -> dict:
+        """Return the spans as a speedscope evented profile, one per thread."""
+        frames, frame_index, profiles = [], {}, []
+        threads = sorted({span.thread for span in self.spans})
+        for thread in threads or ["MainThread"]:
+            events, stack = [], []
+            spans = sorted(
+                (s for s in self.spans if s.thread == thread),
+                key=lambda s: (s.start, -s.end),
+            )
+            for span in spans:
+                label = f"{span.kind}: {span.name}"
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    frames.append({"name": label})
+                while stack and stack[-1][1] <= span.start:
+                    frame, end = stack.pop()
+                    events.append({"type": "C", "frame": frame, "at": end - self.origin})
+                # Clip to the enclosing span so the events stay properly nested.
+                end = min(span.end, stack[-1][1]) if stack else span.end
+                events.append(
+                    {"type": "O", "frame": frame_index[label], "at": span.start - self.origin}
+                )
+                stack.append((frame_index[label], end))
+            while stack:
+                frame, end = stack.pop()
+                events.append({"type": "C", "frame": frame, "at": end - self.origin})
+            profiles.append(
+                {
+                    "type": "evented",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.total,
+                    "events": events,
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": "lizzy",
+            "exporter": "lizzy --profile-run",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def summary_table(self, limit: int = 10) -> str:
+        """Return a plain-text summary of phases, imports and HTTP calls."""
+        lines = [f"Total wall time: {self.total * 1000:.1f} ms", ""]
+
+        phases = self._of_kind("phase")
+        lines.append(f"{'Phase':<48} {'ms':>10}")
+        for span in phases:
+            lines.append(f"{'  ' * span.depth + span.name:<48} {span.seconds * 1000:>10.1f}")
+        if not phases:
+            lines.append("(none)")
+
+        imports = sorted(
+            (s for s in self._of_kind("import") if not s.info["nested"]),
+            key=lambda s: s.seconds,
+            reverse=True,
+        )
+        lines += ["", f"{'Slowest imports':<48} {'ms':>10}"]
+        for span in imports[:limit]:
+            lines.append(f"{span.name:<48} {span.seconds * 1000:>10.1f}")
+        if not imports:
+            lines.append("(none)")
+
+        hosts = {}
+        for span in self._of_kind("http"):
+            host = hosts.setdefault(span.info["host"], [0, 0.0, 0, 0])
+            host[0] += 1
+            host[1] += span.seconds
+            host[2] += span.info.get("sent", 0)
+            host[3] += span.info.get("received", 0)
+        lines += [
+            "",
+            f"{'HTTP host':<36} {'calls':>6} {'ms':>10} {'avg ms':>8} {'sent':>10} {'recv':>10}",
+        ]
+        for name, (calls, seconds, sent, received) in sorted(
+            hosts.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            lines.append(
+                f"{name:<36} {calls:>6} {seconds * 1000:>10.1f} "
+                f"{seconds * 1000 / calls:>8.1f} {sent:>10} {received:>10}"
+            )
+        if not hosts:
+            lines.append("(none)")
+        return "\n".join(lines)
+
+    def write(self, fmt: str, path: str = None) -> str:
+        """Write a json or speedscope report and return the file path."""
+        if fmt == "speedscope":
+            payload, path = self.to_speedscope(), path or "lizzy-profile.speedscope.json"
+        else:
+            payload, path = self.to_json(), path or "lizzy-profile.json"
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=1)
+        return path
+
+
+def start() -> RunProfiler:
+    """Start profiling this process."""
+    global _active
+    _active = RunProfiler()
+    _active.start()
+    return _active
+
+
+def stop() -> RunProfiler:
+    """Stop profiling and return the profiler, if one was running."""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def active() -> RunProfiler:
+    """Return the running profiler, or None."""
+    return _active
+
+
+def phase(name: str):
+    """Mark a named phase; a no-op context when profiling is off."""
+    if _active is None:
+        return contextlib.nullcontext()
+    return _active.phase(name)
@@ -1,8 +1,15 @@
+import re
+from pathlib import Path
+
 from setuptools import find_packages, setup
 
+VERSION = re.search(
+    r'__version__ = "(.+)"', (Path(__file__).parent / "lizzy" / "__init__.py").read_text()
+).group(1)
+
 setup(
     name="lizzy-cli",
-    version="0.1.2",
+    version=VERSION,
     packages=find_packages(),
     install_requires=[
         "click",
@@ -12,6 +19,7 @@ setup(
         "python-gitlab",
         "PyChef>=0.3.0",
         "cryptography>=41.0.0",
+        "keyring>=24.0.0",
         "cffi>=1.16.0",
         "rsa>=4.9",
         "distro>=1.8.0",
@@ -19,7 +27,7 @@ setup(
     ],
     entry_points={
         "console_scripts": [
-            "lizzy=lizzy.cli:lizzy",
+            "lizzy=lizzy.daemon:main",
         ],
     },
     author="Joeri Abbo",
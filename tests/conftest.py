@@ -10,6 +10,30 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 
+@pytest.fixture(autouse=True, scope="session")
+def isolated_home(tmp_path_factory):
+    """Point HOME at a temporary directory so tests never touch ~/.lizzy."""
+    home = tmp_path_factory.mktemp("home")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("HOME", str(home))
+        # CliRunner output is not a terminal; keep the human output tests expect.
+        mp.setenv("LIZZY_OUTPUT", "text")
+        yield home
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    """Start every test without a cached config and in text output mode."""
+    from lizzy import output
+    from lizzy.helpers.config import _cache, set_profile
+
+    _cache.clear()
+    yield
+    _cache.clear()
+    set_profile(None)
+    output.set_mode("text")
+
+
 @pytest.fixture
 def sample_aws_accounts():
     """Fixture providing sample AWS account data."""
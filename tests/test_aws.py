@@ -5,6 +5,22 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from lizzy.helpers.aws import get_account_by_name, get_aws_accounts, get_aws_credentials
+from lizzy.helpers.config_model import build_config_model
+
+
+def service_records(*names: str) -> list:
+    """Build ACTIVE Fargate service records named after their ARNs."""
+    from lizzy.helpers.ecs import ServiceRecord
+
+    return [
+        ServiceRecord(name, name, "cluster-1", "FARGATE", "ACTIVE", f"arn/td/{name}:1")
+        for name in names
+    ]
+
+
+def config_model_with_accounts(accounts: list):
+    """Build a config model holding the given AWS accounts."""
+    return build_config_model({"aws": {"accounts": accounts}})
 
 
 class TestGetAwsAccounts:
@@ -37,39 +53,39 @@ class TestGetAwsAccounts:
 class TestGetAccountByName:
     """Test get_account_by_name function."""
 
-    @patch("lizzy.helpers.aws.get_aws_accounts")
-    def test_get_account_by_name_returns_matching_account(self, mock_get_accounts):
+    @patch("lizzy.helpers.aws.get_config_model")
+    def test_get_account_by_name_returns_matching_account(self, mock_get_model):
         """Test that get_account_by_name returns the correct account."""
         accounts = [
             {"name": "dev", "id": "123456789"},
             {"name": "prod", "id": "987654321"},
         ]
-        mock_get_accounts.return_value = accounts
+        mock_get_model.return_value = config_model_with_accounts(accounts)
 
         result = get_account_by_name("dev")
 
         assert result == {"name": "dev", "id": "123456789"}
 
-    @patch("lizzy.helpers.aws.get_aws_accounts")
+    @patch("lizzy.helpers.aws.get_config_model")
     def test_get_account_by_name_raises_error_for_missing_account(
-        self, mock_get_accounts
+        self, mock_get_model
     ):
         """Test that get_account_by_name raises ValueError for non-existent account."""
         accounts = [
             {"name": "dev", "id": "123456789"},
             {"name": "prod", "id": "987654321"},
         ]
-        mock_get_accounts.return_value = accounts
+        mock_get_model.return_value = config_model_with_accounts(accounts)
 
         with pytest.raises(ValueError) as exc_info:
             get_account_by_name("staging")
 
         assert "Account with name staging not found" in str(exc_info.value)
 
-    @patch("lizzy.helpers.aws.get_aws_accounts")
-    def test_get_account_by_name_handles_empty_list(self, mock_get_accounts):
+    @patch("lizzy.helpers.aws.get_config_model")
+    def test_get_account_by_name_handles_empty_list(self, mock_get_model):
         """Test that get_account_by_name handles empty account list."""
-        mock_get_accounts.return_value = []
+        mock_get_model.return_value = config_model_with_accounts([])
 
         with pytest.raises(ValueError):
             get_account_by_name("dev")
@@ -79,7 +95,7 @@ class TestGetAwsCredentials:
     """Test get_aws_credentials function."""
 
     @patch("lizzy.helpers.aws.get_account_by_name")
-    @patch("lizzy.helpers.aws.gimme_aws_creds.ui.CLIUserInterface")
+    @patch("lizzy.helpers.aws._ConsoleUserInterface")
     @patch("lizzy.helpers.aws.gimme_aws_creds.main.GimmeAWSCreds")
     def test_get_aws_credentials_returns_credentials_tuple(
         self, mock_gimme_creds, mock_ui, mock_get_account
@@ -113,7 +129,7 @@ class TestGetAwsCredentials:
         assert result[3] == "arn:aws:iam::123456789:role/test-role"
 
     @patch("lizzy.helpers.aws.get_account_by_name")
-    @patch("lizzy.helpers.aws.gimme_aws_creds.ui.CLIUserInterface")
+    @patch("lizzy.helpers.aws._ConsoleUserInterface")
     @patch("lizzy.helpers.aws.gimme_aws_creds.main.GimmeAWSCreds")
     def test_get_aws_credentials_formats_pattern_correctly(
         self, mock_gimme_creds, mock_ui, mock_get_account
@@ -157,11 +173,11 @@ class TestGetAwsCredentials:
 class TestGetClusters:
     """Test get_clusters function."""
 
-    @patch("lizzy.helpers.aws.boto3.client")
-    def test_get_clusters_returns_cluster_list(self, mock_boto_client):
+    @patch("lizzy.helpers.aws.aws_client")
+    def test_get_clusters_returns_cluster_list(self, mock_aws_client):
         """Test that get_clusters returns list of ECS clusters."""
         mock_ecs = MagicMock()
-        mock_boto_client.return_value = mock_ecs
+        mock_aws_client.return_value = mock_ecs
         
         mock_paginator = MagicMock()
         mock_ecs.get_paginator.return_value = mock_paginator
@@ -174,21 +190,16 @@ class TestGetClusters:
         result = get_clusters("key", "secret", "token")
         
         assert result == ["cluster-1", "cluster-2", "cluster-3"]
-        mock_boto_client.assert_called_once_with(
-            "ecs",
-            aws_access_key_id="key",
-            aws_secret_access_key="secret",
-            aws_session_token="token"
-        )
+        mock_aws_client.assert_called_once_with("ecs", "key", "secret", "token")
 
-    @patch("lizzy.helpers.aws.boto3.client")
+    @patch("lizzy.helpers.aws.aws_client")
     @patch("lizzy.helpers.aws.click.echo")
-    def test_get_clusters_handles_boto_error(self, mock_echo, mock_boto_client):
+    def test_get_clusters_handles_boto_error(self, mock_echo, mock_aws_client):
         """Test that get_clusters handles boto3 errors gracefully."""
         from botocore.exceptions import ClientError
         
         mock_ecs = MagicMock()
-        mock_boto_client.return_value = mock_ecs
+        mock_aws_client.return_value = mock_ecs
         mock_ecs.get_paginator.side_effect = ClientError(
             {"Error": {"Code": "AccessDenied", "Message": "Access denied"}},
             "ListClusters"
@@ -233,14 +244,38 @@ class TestChooseCluster:
         assert mock_prompt.call_count == 4
 
 
+    @patch("lizzy.helpers.aws.click.prompt")
+    @patch("lizzy.helpers.aws.click.echo")
+    def test_choose_cluster_accepts_a_name_at_the_prompt(self, mock_echo, mock_prompt):
+        """Test that the numbered prompt also accepts a cluster name."""
+        clusters = ["arn/cluster-1", "arn/cluster-2"]
+        mock_prompt.return_value = "cluster-2"
+
+        from lizzy.helpers.aws import choose_cluster
+
+        assert choose_cluster(clusters) == "arn/cluster-2"
+
+    def test_choose_cluster_with_selector_does_not_prompt(self):
+        """Test that a selector must match exactly one cluster."""
+        import click
+
+        from lizzy.helpers.aws import choose_cluster
+
+        clusters = ["arn/prod", "arn/prod-eu", "arn/dev"]
+        assert choose_cluster(clusters, "prod") == "arn/prod"
+        with pytest.raises(click.ClickException, match="matches 2 clusters"):
+            choose_cluster(clusters, "prod*")
+
+
 class TestGetFargateServices:
     """Test get_fargate_services function."""
 
-    @patch("lizzy.helpers.aws.boto3.client")
-    def test_get_fargate_services_returns_service_list(self, mock_boto_client):
-        """Test that get_fargate_services returns list of services."""
+    @patch("lizzy.helpers.aws.aws_client")
+    @patch("lizzy.helpers.aws.get_int", return_value=4)
+    def test_get_fargate_services_returns_service_list(self, mock_get_int, mock_aws_client):
+        """Test that get_fargate_services returns the ARNs of Fargate services only."""
         mock_ecs = MagicMock()
-        mock_boto_client.return_value = mock_ecs
+        mock_aws_client.return_value = mock_ecs
         
         mock_paginator = MagicMock()
         mock_ecs.get_paginator.return_value = mock_paginator
@@ -248,21 +283,33 @@ class TestGetFargateServices:
             {"serviceArns": ["service-1", "service-2"]},
             {"serviceArns": ["service-3"]},
         ]
+        mock_ecs.describe_services.side_effect = lambda cluster, services: {
+            "services": [
+                {
+                    "serviceArn": s,
+                    "serviceName": s,
+                    "launchType": "EC2" if s == "service-2" else "FARGATE",
+                    "status": "ACTIVE",
+                }
+                for s in services
+            ]
+        }
         
         from lizzy.helpers.aws import get_fargate_services
         result = get_fargate_services("cluster-1", "key", "secret", "token")
         
-        assert result == ["service-1", "service-2", "service-3"]
+        assert result == ["service-1", "service-3"]
         mock_paginator.paginate.assert_called_once_with(cluster="cluster-1")
 
-    @patch("lizzy.helpers.aws.boto3.client")
+    @patch("lizzy.helpers.aws.aws_client")
+    @patch("lizzy.helpers.aws.get_int", return_value=4)
     @patch("lizzy.helpers.aws.click.echo")
-    def test_get_fargate_services_handles_error(self, mock_echo, mock_boto_client):
+    def test_get_fargate_services_handles_error(self, mock_echo, mock_get_int, mock_aws_client):
         """Test that get_fargate_services handles errors gracefully."""
         from botocore.exceptions import BotoCoreError
         
         mock_ecs = MagicMock()
-        mock_boto_client.return_value = mock_ecs
+        mock_aws_client.return_value = mock_ecs
         mock_ecs.get_paginator.side_effect = BotoCoreError()
         
         from lizzy.helpers.aws import get_fargate_services
@@ -273,6 +320,41 @@ class TestGetFargateServices:
         assert "Error fetching services:" in mock_echo.call_args[0][0]
 
 
+    @patch("lizzy.helpers.aws.aws_client")
+    @patch("lizzy.helpers.aws.get_int", return_value=4)
+    def test_get_fargate_service_records_describes_fargate_services(
+        self, mock_get_int, mock_aws_client
+    ):
+        """Test that records come from a FARGATE listing and batched describes."""
+        mock_ecs = MagicMock()
+        mock_aws_client.return_value = mock_ecs
+        mock_ecs.get_paginator.return_value.paginate.return_value = [
+            {"serviceArns": [f"arn/cluster-1/svc-{i}" for i in range(12)]}
+        ]
+        mock_ecs.describe_services.side_effect = lambda cluster, services: {
+            "services": [
+                {
+                    "serviceArn": s,
+                    "serviceName": s.rsplit("/", 1)[-1],
+                    "launchType": "EC2" if s.endswith("svc-0") else "FARGATE",
+                    "status": "ACTIVE",
+                    "taskDefinition": "arn:aws:ecs:eu-west-1:1:task-definition/api:7",
+                    "desiredCount": 2,
+                    "runningCount": 2,
+                }
+                for s in services
+            ]
+        }
+
+        from lizzy.helpers.aws import get_fargate_service_records
+        records = get_fargate_service_records("cluster-1", "key", "secret", "token")
+
+        assert [r.name for r in records] == [f"svc-{i}" for i in range(1, 12)]
+        assert records[0].family == "api" and records[0].running == 2
+        mock_ecs.get_paginator.return_value.paginate.assert_called_once_with(cluster="cluster-1")
+        assert mock_ecs.describe_services.call_count == 2
+
+
 class TestChooseService:
     """Test choose_service function."""
 
@@ -294,12 +376,12 @@ class TestChooseService:
 class TestEcsForceRedeploy:
     """Test ecs_force_redeploy function."""
 
-    @patch("lizzy.helpers.aws.boto3.client")
+    @patch("lizzy.helpers.aws.aws_client")
     @patch("lizzy.helpers.aws.click.echo")
-    def test_ecs_force_redeploy_triggers_deployment(self, mock_echo, mock_boto_client):
+    def test_ecs_force_redeploy_triggers_deployment(self, mock_echo, mock_aws_client):
         """Test that ecs_force_redeploy triggers force deployment."""
         mock_ecs = MagicMock()
-        mock_boto_client.return_value = mock_ecs
+        mock_aws_client.return_value = mock_ecs
         
         mock_ecs.describe_services.return_value = {
             "services": [{"taskDefinition": "task-def-1"}]
@@ -320,29 +402,29 @@ class TestEcsForceRedeploy:
         )
         assert mock_echo.call_count >= 2
 
-    @patch("lizzy.helpers.aws.boto3.client")
-    @patch("builtins.print")
-    def test_ecs_force_redeploy_handles_service_not_found(self, mock_print, mock_boto_client):
+    @patch("lizzy.helpers.aws.aws_client")
+    @patch("click.echo")
+    def test_ecs_force_redeploy_handles_service_not_found(self, mock_echo, mock_aws_client):
         """Test that ecs_force_redeploy handles service not found."""
         mock_ecs = MagicMock()
-        mock_boto_client.return_value = mock_ecs
+        mock_aws_client.return_value = mock_ecs
         
         mock_ecs.describe_services.return_value = {"services": []}
         
         from lizzy.helpers.aws import ecs_force_redeploy
         ecs_force_redeploy("cluster-1", "service-1", "key", "secret", "token")
         
-        mock_print.assert_called_once_with("Service not found.")
+        mock_echo.assert_called_once_with("Service not found.")
         mock_ecs.update_service.assert_not_called()
 
-    @patch("lizzy.helpers.aws.boto3.client")
+    @patch("lizzy.helpers.aws.aws_client")
     @patch("lizzy.helpers.aws.click.echo")
-    def test_ecs_force_redeploy_handles_error(self, mock_echo, mock_boto_client):
+    def test_ecs_force_redeploy_handles_error(self, mock_echo, mock_aws_client):
         """Test that ecs_force_redeploy handles boto3 errors."""
         from botocore.exceptions import ClientError
         
         mock_ecs = MagicMock()
-        mock_boto_client.return_value = mock_ecs
+        mock_aws_client.return_value = mock_ecs
         mock_ecs.describe_services.side_effect = ClientError(
             {"Error": {"Code": "ServiceNotFound", "Message": "Service not found"}},
             "DescribeServices"
@@ -362,26 +444,170 @@ class TestRunAwsFargateRestart:
     @patch("lizzy.helpers.aws.get_config_accounts")
     @patch("lizzy.helpers.aws.get_clusters")
     @patch("lizzy.helpers.aws.choose_cluster")
-    @patch("lizzy.helpers.aws.get_fargate_services")
-    @patch("lizzy.helpers.aws.ecs_force_redeploy")
+    @patch("lizzy.helpers.aws.get_fargate_service_records")
+    @patch("lizzy.helpers.aws.aws_client")
+    @patch("lizzy.helpers.aws.get_int", return_value=8)
+    @patch("lizzy.helpers.aws.force_redeploy_services")
     @patch("lizzy.helpers.aws.click.echo")
     def test_run_aws_fargate_restart_all_services(
-        self, mock_echo, mock_redeploy, mock_get_services, mock_choose_cluster,
-        mock_get_clusters, mock_get_accounts, mock_get_creds
+        self, mock_echo, mock_redeploy_all, mock_get_int, mock_aws_client, mock_get_services,
+        mock_choose_cluster, mock_get_clusters, mock_get_accounts, mock_get_creds
     ):
-        """Test that run_aws_fargate_restart restarts all services when all_services=True."""
+        """Test that all services are redeployed concurrently with one shared client."""
+        from lizzy.helpers.ecs import RedeployResult
+
         mock_get_accounts.return_value = "dev"
         mock_get_creds.return_value = ("key", "secret", "token", "arn")
         mock_get_clusters.return_value = ["cluster-1"]
         mock_choose_cluster.return_value = "cluster-1"
-        mock_get_services.return_value = ["service-1", "service-2"]
-        
+        mock_get_services.return_value = service_records("service-1", "service-2")
+        mock_redeploy_all.return_value = [
+            RedeployResult("service-1", True),
+            RedeployResult("service-2", True),
+        ]
+
         from lizzy.helpers.aws import run_aws_fargate_restart
         run_aws_fargate_restart(all_services=True)
-        
-        assert mock_redeploy.call_count == 2
-        mock_redeploy.assert_any_call("cluster-1", "service-1", "key", "secret", "token")
-        mock_redeploy.assert_any_call("cluster-1", "service-2", "key", "secret", "token")
+
+        mock_aws_client.assert_called_once()
+        ecs, cluster, services = mock_redeploy_all.call_args[0]
+        assert ecs is mock_aws_client.return_value
+        assert (cluster, services) == ("cluster-1", ["service-1", "service-2"])
+        assert mock_redeploy_all.call_args.kwargs["max_workers"] == 8
+        assert mock_redeploy_all.call_args.kwargs["task_definitions"] == {
+            "service-1": "arn/td/service-1:1",
+            "service-2": "arn/td/service-2:1",
+        }
+        mock_get_int.assert_called_once_with("aws.redeploy_workers", 8)
+        mock_echo.assert_any_call("Force redeploy triggered for all services.")
+
+    @patch("lizzy.helpers.aws.get_aws_credentials")
+    @patch("lizzy.helpers.aws.get_config_accounts")
+    @patch("lizzy.helpers.aws.get_clusters")
+    @patch("lizzy.helpers.aws.choose_cluster")
+    @patch("lizzy.helpers.aws.aws_client")
+    @patch("lizzy.helpers.aws.get_int", return_value=8)
+    @patch("lizzy.helpers.aws.force_redeploy_services")
+    @patch("lizzy.helpers.aws.click.echo")
+    def test_run_aws_fargate_restart_keeps_capacity_provider_services(
+        self, mock_echo, mock_redeploy_all, mock_get_int, mock_aws_client,
+        mock_choose_cluster, mock_get_clusters, mock_get_accounts, mock_get_creds
+    ):
+        """Test that FARGATE_SPOT services are restarted and EC2 services are not."""
+        from lizzy.helpers.ecs import RedeployResult
+
+        mock_get_accounts.return_value = "dev"
+        mock_get_creds.return_value = ("key", "secret", "token", "arn")
+        mock_get_clusters.return_value = ["cluster-1"]
+        mock_choose_cluster.return_value = "cluster-1"
+        mock_ecs = mock_aws_client.return_value
+        mock_ecs.get_paginator.return_value.paginate.return_value = [
+            {"serviceArns": ["arn/cluster-1/web", "arn/cluster-1/spot", "arn/cluster-1/ec2"]}
+        ]
+        launch = {
+            "web": {"launchType": "FARGATE"},
+            "spot": {"capacityProviderStrategy": [{"capacityProvider": "FARGATE_SPOT"}]},
+            "ec2": {"launchType": "EC2"},
+        }
+        mock_ecs.describe_services.side_effect = lambda cluster, services: {
+            "services": [
+                {
+                    "serviceArn": s,
+                    "serviceName": s.rsplit("/", 1)[-1],
+                    "status": "ACTIVE",
+                    "taskDefinition": f"arn/td/{s.rsplit('/', 1)[-1]}:1",
+                    **launch[s.rsplit("/", 1)[-1]],
+                }
+                for s in services
+            ]
+        }
+        mock_redeploy_all.return_value = [
+            RedeployResult("web", True),
+            RedeployResult("spot", True),
+        ]
+
+        from lizzy.helpers.aws import run_aws_fargate_restart
+        run_aws_fargate_restart(all_services=True)
+
+        _, _, services = mock_redeploy_all.call_args[0]
+        assert services == ["arn/cluster-1/web", "arn/cluster-1/spot"]
+        mock_ecs.get_paginator.return_value.paginate.assert_called_once_with(cluster="cluster-1")
+
+    @patch("lizzy.helpers.aws.get_aws_credentials")
+    @patch("lizzy.helpers.aws.get_config_accounts")
+    @patch("lizzy.helpers.aws.get_clusters")
+    @patch("lizzy.helpers.aws.choose_cluster")
+    @patch("lizzy.helpers.aws.get_fargate_service_records")
+    @patch("lizzy.helpers.aws.aws_client")
+    @patch("lizzy.helpers.aws.get_int", return_value=8)
+    @patch("lizzy.helpers.aws.force_redeploy_services")
+    @patch("lizzy.helpers.aws.click.echo")
+    def test_run_aws_fargate_restart_all_services_reports_failures(
+        self, mock_echo, mock_redeploy_all, mock_get_int, mock_aws_client, mock_get_services,
+        mock_choose_cluster, mock_get_clusters, mock_get_accounts, mock_get_creds
+    ):
+        """Test that failed redeploys make the command fail."""
+        import click
+
+        from lizzy.helpers.ecs import RedeployResult
+
+        mock_get_accounts.return_value = "dev"
+        mock_get_creds.return_value = ("key", "secret", "token", "arn")
+        mock_get_clusters.return_value = ["cluster-1"]
+        mock_choose_cluster.return_value = "cluster-1"
+        mock_get_services.return_value = service_records("service-1", "service-2")
+        mock_redeploy_all.return_value = [
+            RedeployResult("service-1", True),
+            RedeployResult("service-2", False, "service not found"),
+        ]
+
+        from lizzy.helpers.aws import run_aws_fargate_restart
+        with pytest.raises(click.ClickException, match="1 of 2 services"):
+            run_aws_fargate_restart(all_services=True)
+
+    @patch("lizzy.helpers.aws.get_aws_credentials")
+    @patch("lizzy.helpers.aws.get_config_accounts")
+    @patch("lizzy.helpers.aws.get_clusters")
+    @patch("lizzy.helpers.aws.choose_cluster")
+    @patch("lizzy.helpers.aws.get_fargate_service_records")
+    @patch("lizzy.helpers.aws.aws_client")
+    @patch("lizzy.helpers.aws.get_int", side_effect=lambda setting, default: default)
+    @patch("lizzy.helpers.aws.restart_in_waves")
+    @patch("lizzy.helpers.aws.click.echo")
+    def test_run_aws_fargate_restart_in_waves(
+        self, mock_echo, mock_waves, mock_get_int, mock_aws_client, mock_get_services,
+        mock_choose_cluster, mock_get_clusters, mock_get_accounts, mock_get_creds
+    ):
+        """Test that a wave size restarts in waves and fails on an aborted run."""
+        import click
+
+        from lizzy.helpers.ecs import RedeployResult, WaveReport
+
+        mock_get_accounts.return_value = "dev"
+        mock_get_creds.return_value = ("key", "secret", "token", "arn")
+        mock_get_clusters.return_value = ["cluster-1"]
+        mock_choose_cluster.return_value = "cluster-1"
+        mock_get_services.return_value = service_records("service-1", "service-2")
+        mock_waves.return_value = WaveReport(
+            (
+                RedeployResult("service-1", False, "deployment failed"),
+                RedeployResult("service-2", False, "skipped", 0),
+            ),
+            waves=2,
+            elapsed=60.0,
+            aborted=True,
+        )
+
+        from lizzy.helpers.aws import run_aws_fargate_restart
+        with pytest.raises(click.ClickException, match="aborted"):
+            run_aws_fargate_restart(all_services=True, wave_size=1, wait_timeout=120)
+
+        ecs, cluster, services, wave_size = mock_waves.call_args[0]
+        assert ecs is mock_aws_client.return_value
+        assert (cluster, services, wave_size) == ("cluster-1", ["service-1", "service-2"], 1)
+        assert mock_waves.call_args.kwargs["timeout"] == 120
+        assert mock_waves.call_args.kwargs["abort_on_failure"] is True
+        mock_echo.assert_any_call("0/2 services stable in 60s (0.0 services/min)")
 
     @patch("lizzy.helpers.aws.get_aws_credentials")
     @patch("lizzy.helpers.aws.get_config_accounts")
@@ -404,7 +630,7 @@ class TestRunAwsFargateRestart:
     @patch("lizzy.helpers.aws.get_config_accounts")
     @patch("lizzy.helpers.aws.get_clusters")
     @patch("lizzy.helpers.aws.choose_cluster")
-    @patch("lizzy.helpers.aws.get_fargate_services")
+    @patch("lizzy.helpers.aws.get_fargate_service_records")
     @patch("lizzy.helpers.aws.choose_service")
     @patch("lizzy.helpers.aws.ecs_force_redeploy")
     @patch("lizzy.helpers.aws.click.echo")
@@ -417,20 +643,20 @@ class TestRunAwsFargateRestart:
         mock_get_creds.return_value = ("key", "secret", "token", "arn")
         mock_get_clusters.return_value = ["cluster-1"]
         mock_choose_cluster.return_value = "cluster-1"
-        mock_get_services.return_value = ["service-1", "service-2"]
+        mock_get_services.return_value = service_records("service-1", "service-2")
         mock_choose_service.return_value = "service-1"
         
         from lizzy.helpers.aws import run_aws_fargate_restart
         run_aws_fargate_restart(all_services=False)
         
         mock_redeploy.assert_called_once_with("cluster-1", "service-1", "key", "secret", "token")
-        mock_choose_service.assert_called_once_with(["service-1", "service-2"])
+        mock_choose_service.assert_called_once_with(["service-1", "service-2"], None)
 
     @patch("lizzy.helpers.aws.get_aws_credentials")
     @patch("lizzy.helpers.aws.get_config_accounts")
     @patch("lizzy.helpers.aws.get_clusters")
     @patch("lizzy.helpers.aws.choose_cluster")
-    @patch("lizzy.helpers.aws.get_fargate_services")
+    @patch("lizzy.helpers.aws.get_fargate_service_records")
     @patch("lizzy.helpers.aws.click.echo")
     def test_run_aws_fargate_restart_no_services(
         self, mock_echo, mock_get_services, mock_choose_cluster,
@@ -447,3 +673,371 @@ class TestRunAwsFargateRestart:
         run_aws_fargate_restart()
         
         mock_echo.assert_any_call("No services found in the selected cluster.")
+
+
+class TestAwsClientFactory:
+    """Test the cached boto3 session and client factory."""
+
+    def test_client_is_cached_per_account_region_and_service(self):
+        """Test that repeated lookups reuse the same client."""
+        from lizzy.helpers.aws import AwsClientFactory
+
+        factory = AwsClientFactory(max_pool_connections=5)
+        factory.register("dev", "key", "secret", "token")
+
+        ecs = factory.client("ecs", "dev", "eu-west-1")
+
+        assert factory.client("ecs", "dev", "eu-west-1") is ecs
+        assert factory.client("ecs", "dev", "us-east-1") is not ecs
+        assert factory.client("sts", "dev", "eu-west-1") is not ecs
+        assert ecs.meta.config.max_pool_connections == 5
+
+    def test_new_credentials_replace_cached_clients(self):
+        """Test that registering other credentials for an account rebuilds its clients."""
+        from lizzy.helpers.aws import AwsClientFactory
+
+        factory = AwsClientFactory(max_pool_connections=5)
+        factory.register("dev", "key-1", "secret", "token")
+        old = factory.client("ecs", "dev", "eu-west-1")
+
+        factory.register("dev", "key-2", "secret", "token")
+
+        assert factory.client("ecs", "dev", "eu-west-1") is not old
+        assert factory.account_for("key-1") == "dev"
+        assert factory.account_for("key-2") == "dev"
+
+    def test_expiring_credentials_are_refreshed(self):
+        """Test that credentials with an expiration refresh through the callback."""
+        from lizzy.helpers.aws import AwsClientFactory
+
+        refresh = MagicMock(
+            return_value=("key-2", "secret-2", "token-2", "2999-01-01T00:00:00Z")
+        )
+        factory = AwsClientFactory(max_pool_connections=5)
+        factory.register(
+            "dev", "key-1", "secret", "token", "2000-01-01T00:00:00Z", refresh=refresh
+        )
+
+        credentials = factory.session("dev", "eu-west-1").get_credentials()
+
+        assert credentials.method == "lizzy"
+        assert credentials.get_frozen_credentials().access_key == "key-2"
+        refresh.assert_called_once()
+        assert factory.account_for("key-2") == "dev"
+
+    @patch("lizzy.helpers.aws.get_client_factory")
+    def test_aws_client_registers_unknown_keys(self, mock_get_factory):
+        """Test that raw credentials are registered under their access key."""
+        from lizzy.helpers.aws import AwsClientFactory, aws_client
+
+        factory = AwsClientFactory(max_pool_connections=5)
+        mock_get_factory.return_value = factory
+
+        client = aws_client("ecs", "key", "secret", "token", region="eu-west-1")
+
+        assert aws_client("ecs", "key", "secret", "token", region="eu-west-1") is client
+        assert factory.account_for("key") == "key"
+
+
+def fake_ecs(clusters: dict) -> MagicMock:
+    """Return an ECS client mock with the given {cluster: [service, ...]} layout."""
+    ecs = MagicMock()
+
+    def get_paginator(name):
+        paginator = MagicMock()
+        if name == "list_clusters":
+            paginator.paginate.return_value = [{"clusterArns": list(clusters)}]
+        else:
+            paginator.paginate.side_effect = lambda cluster: [
+                {"serviceArns": [f"{cluster}/{s}" for s in clusters[cluster]]}
+            ]
+        return paginator
+
+    ecs.get_paginator.side_effect = get_paginator
+    ecs.describe_services.side_effect = lambda cluster, services: {
+        "services": [
+            {
+                "serviceArn": s,
+                "serviceName": s.rsplit("/", 1)[-1],
+                "launchType": "FARGATE",
+                "status": "ACTIVE",
+                "taskDefinition": "td",
+            }
+            for s in services
+        ]
+    }
+    return ecs
+
+
+class TestRunAwsFargateRestartMatching:
+    """Test the multi-account, multi-region restart."""
+
+    @patch("lizzy.helpers.aws.get_config_model")
+    def test_select_accounts_by_name_or_id_glob(self, mock_get_model, sample_aws_accounts):
+        """Test that accounts are selected by name or id pattern."""
+        from lizzy.helpers.aws import select_accounts
+
+        mock_get_model.return_value = config_model_with_accounts(sample_aws_accounts)
+
+        assert [a.name for a in select_accounts(("*d*",))] == ["dev", "prod"]
+        assert [a.name for a in select_accounts(("234567890",))] == ["staging"]
+
+    @patch("lizzy.helpers.aws.get_config_model")
+    def test_select_accounts_without_match_fails(self, mock_get_model, sample_aws_accounts):
+        """Test that an unmatched selector is an error."""
+        import click
+
+        from lizzy.helpers.aws import select_accounts
+
+        mock_get_model.return_value = config_model_with_accounts(sample_aws_accounts)
+
+        with pytest.raises(click.ClickException):
+            select_accounts(("qa-*",))
+
+    @patch("lizzy.helpers.aws.get_config_model")
+    @patch("lizzy.helpers.aws.authenticate_accounts", return_value={})
+    @patch("lizzy.helpers.aws.get_client_factory")
+    @patch("lizzy.helpers.aws.get_int", return_value=4)
+    @patch("lizzy.helpers.aws.click.echo")
+    def test_restarts_matching_services_in_every_account_and_region(
+        self, mock_echo, mock_get_int, mock_get_factory, mock_auth, mock_get_model, sample_aws_accounts
+    ):
+        """Test that every selected account and region is restarted and reported."""
+        from lizzy.helpers.aws import run_aws_fargate_restart_matching
+
+        mock_get_model.return_value = config_model_with_accounts(sample_aws_accounts)
+        clients = {}
+
+        def client(service, account, region):
+            return clients.setdefault(
+                (account, region),
+                fake_ecs({"arn/main": ["api-1", "api-2", "worker"], "arn/batch": ["api-3"]}),
+            )
+
+        mock_get_factory.return_value.client.side_effect = client
+
+        results = run_aws_fargate_restart_matching(
+            ("dev", "prod"),
+            ("api-*",),
+            regions=("eu-west-1", "us-east-1"),
+            cluster_patterns=("main",),
+        )
+
+        mock_auth.assert_called_once_with(["dev", "prod"])
+        assert set(clients) == {
+            ("dev", "eu-west-1"), ("dev", "us-east-1"),
+            ("prod", "eu-west-1"), ("prod", "us-east-1"),
+        }
+        assert len(results) == 4
+        assert all(r.restarted == 2 and r.failed == 0 for r in results)
+        for ecs in clients.values():
+            restarted = {c.kwargs["service"] for c in ecs.update_service.call_args_list}
+            assert restarted == {"arn/main/api-1", "arn/main/api-2"}
+        mock_echo.assert_any_call("Total: 8 services restarted, 0 failures.")
+
+    @patch("lizzy.helpers.aws.get_config_model")
+    @patch("lizzy.helpers.aws.authenticate_accounts", return_value={"prod": "okta down"})
+    @patch("lizzy.helpers.aws.get_client_factory")
+    @patch("lizzy.helpers.aws.get_int", return_value=4)
+    @patch("lizzy.helpers.aws.click.echo")
+    def test_failed_authentication_is_reported(
+        self, mock_echo, mock_get_int, mock_get_factory, mock_auth, mock_get_model, sample_aws_accounts
+    ):
+        """Test that an account failing to authenticate fails the run but not the others."""
+        import click
+
+        from lizzy.helpers.aws import run_aws_fargate_restart_matching
+
+        mock_get_model.return_value = config_model_with_accounts(sample_aws_accounts)
+        mock_get_factory.return_value.client.return_value = fake_ecs({"arn/main": ["api"]})
+
+        with pytest.raises(click.ClickException, match="1 restarts failed"):
+            run_aws_fargate_restart_matching(("dev", "prod"), ("api",), regions=("eu-west-1",))
+
+        mock_echo.assert_any_call(
+            "prod: 0 restarted, 1 failed (authentication failed: okta down)"
+        )
+
+
+    @patch("lizzy.helpers.aws.get_config_model")
+    @patch("lizzy.helpers.aws.authenticate_accounts", return_value={})
+    @patch("lizzy.helpers.aws.get_client_factory")
+    @patch("lizzy.helpers.aws.get_int", side_effect=lambda setting, default: default)
+    @patch("lizzy.helpers.aws.click.echo")
+    def test_plan_and_restart_act_on_the_same_services(
+        self, mock_echo, mock_get_int, mock_get_factory, mock_auth, mock_get_model, sample_aws_accounts
+    ):
+        """Test that EC2 and DRAINING services are neither planned nor restarted."""
+        from lizzy.helpers.aws import run_aws_fargate_restart_matching
+
+        mock_get_model.return_value = config_model_with_accounts(sample_aws_accounts)
+        ecs = fake_ecs({"arn/main": ["api-1", "api-ec2", "api-old"]})
+        describe = ecs.describe_services.side_effect
+
+        def describe_services(cluster, services):
+            response = describe(cluster, services)
+            for service in response["services"]:
+                if service["serviceName"] == "api-ec2":
+                    service["launchType"] = "EC2"
+                if service["serviceName"] == "api-old":
+                    service["status"] = "DRAINING"
+            return response
+
+        ecs.describe_services.side_effect = describe_services
+        mock_get_factory.return_value.client.return_value = ecs
+
+        regions = ("eu-west-1",)
+        plan = run_aws_fargate_restart_matching(("dev",), ("api-*",), regions, plan=True)
+        results = run_aws_fargate_restart_matching(("dev",), ("api-*",), regions)
+
+        assert [service.record.arn for service in plan.services] == ["arn/main/api-1"]
+        assert [r.service for target in results for r in target.results] == ["arn/main/api-1"]
+        ecs.update_service.assert_called_once()
+
+
+class TestAuthenticateAccounts:
+    """Test the single-login authentication of several accounts."""
+
+    @patch("lizzy.helpers.aws.get_client_factory")
+    @patch("lizzy.helpers.aws.credential_cache.enabled", return_value=False)
+    @patch("lizzy.helpers.aws.get_account_by_name")
+    @patch("lizzy.helpers.aws._ConsoleUserInterface")
+    @patch("lizzy.helpers.aws.gimme_aws_creds.main.GimmeAWSCreds")
+    def test_one_login_covers_every_account(
+        self, mock_gimme_creds, mock_ui, mock_get_account, mock_enabled, mock_get_factory
+    ):
+        """Test that all accounts share one gimme-aws-creds flow."""
+        from lizzy.helpers.aws import authenticate_accounts
+
+        ids = {"dev": "111111111111", "prod": "222222222222", "qa": "333333333333"}
+        mock_get_account.side_effect = lambda name: {"name": name, "id": ids[name]}
+        mock_gimme_creds.return_value.iter_selected_aws_credentials.return_value = iter(
+            [
+                {
+                    "credentials": {
+                        "aws_access_key_id": f"key-{account_id}",
+                        "aws_secret_access_key": "secret",
+                        "aws_session_token": "token",
+                    },
+                    "role": {"arn": f"arn:aws:iam::{account_id}:role/admin"},
+                }
+                for account_id in (ids["dev"], ids["prod"])
+            ]
+        )
+
+        errors = authenticate_accounts(["dev", "prod", "qa"])
+
+        mock_gimme_creds.assert_called_once()
+        assert mock_ui.call_args.kwargs["argv"][-1] == (
+            "/:(111111111111|222222222222|333333333333):/"
+        )
+        assert errors == {"qa": "no role matched the account"}
+        registered = [c.args[:2] for c in mock_get_factory.return_value.register.call_args_list]
+        assert registered == [("dev", "key-111111111111"), ("prod", "key-222222222222")]
+
+
+class TestRunAwsInventory:
+    """Test listing services from the local inventory."""
+
+    @patch("lizzy.helpers.aws.Inventory")
+    @patch("lizzy.helpers.aws.get_config_model")
+    @patch("lizzy.helpers.aws.authenticate_accounts", return_value={})
+    @patch("lizzy.helpers.aws.get_client_factory")
+    @patch("lizzy.helpers.aws.get_int", side_effect=lambda setting, default: default)
+    @patch("lizzy.helpers.aws.click.echo")
+    def test_refreshes_stale_regions_then_serves_the_snapshot(
+        self, mock_echo, mock_get_int, mock_get_factory, mock_authenticate, mock_get_model,
+        mock_inventory, sample_aws_accounts, tmp_path
+    ):
+        """Test that only stale regions are refreshed and offline skips AWS."""
+        from lizzy.helpers.aws import run_aws_inventory
+        from lizzy.helpers.inventory import Inventory
+
+        mock_get_model.return_value = config_model_with_accounts(sample_aws_accounts)
+        mock_inventory.return_value = Inventory(tmp_path / "inventory.sqlite3")
+        mock_get_factory.return_value.client.return_value = fake_ecs({"arn/main": ["api", "worker"]})
+
+        records = run_aws_inventory(("dev",), ("eu-west-1",), service_patterns=("api",))
+        assert [r.name for r in records] == ["api"]
+        mock_authenticate.assert_called_once_with({"dev": ["eu-west-1"]})
+
+        records = run_aws_inventory(("dev",), ("eu-west-1",), offline=True)
+        assert [r.name for r in records] == ["api", "worker"]
+        run_aws_inventory(("dev",), ("eu-west-1",))
+        mock_authenticate.assert_called_once()
+        mock_echo.assert_any_call("dev / eu-west-1 / main / worker: FARGATE 0/0 running")
+
+
+    @patch("lizzy.helpers.aws.Inventory")
+    @patch("lizzy.helpers.aws.get_config_model")
+    @patch("lizzy.helpers.aws.authenticate_accounts", return_value={"prod": "MFA denied"})
+    @patch("lizzy.helpers.aws.get_client_factory")
+    @patch("lizzy.helpers.aws.get_int", side_effect=lambda setting, default: default)
+    @patch("lizzy.helpers.aws.click.echo")
+    def test_logs_in_once_and_skips_accounts_that_failed(
+        self, mock_echo, mock_get_int, mock_get_factory, mock_authenticate, mock_get_model,
+        mock_inventory, sample_aws_accounts, tmp_path
+    ):
+        """Test that stale accounts share one login and failed ones are reported."""
+        from lizzy.helpers.aws import run_aws_inventory
+        from lizzy.helpers.inventory import Inventory
+
+        mock_get_model.return_value = config_model_with_accounts(sample_aws_accounts)
+        mock_inventory.return_value = Inventory(tmp_path / "inventory.sqlite3")
+        mock_get_factory.return_value.client.return_value = fake_ecs({"arn/main": ["api"]})
+
+        records = run_aws_inventory(("dev", "prod"), ("eu-west-1",))
+
+        mock_authenticate.assert_called_once_with(
+            {"dev": ["eu-west-1"], "prod": ["eu-west-1"]}
+        )
+        mock_get_factory.return_value.client.assert_called_once_with("ecs", "dev", "eu-west-1")
+        assert [r.name for r in records] == ["api"]
+        mock_echo.assert_any_call(
+            "Inventory refresh failed for prod: authentication failed: MFA denied", err=True
+        )
+
+class TestRestartPlan:
+    """Test the --plan dry run."""
+
+    @patch("lizzy.helpers.aws.get_aws_credentials")
+    @patch("lizzy.helpers.aws.get_config_accounts")
+    @patch("lizzy.helpers.aws.get_clusters")
+    @patch("lizzy.helpers.aws.choose_cluster")
+    @patch("lizzy.helpers.aws.get_fargate_service_records")
+    @patch("lizzy.helpers.aws.aws_client")
+    @patch("lizzy.helpers.aws.get_int", side_effect=lambda setting, default: default)
+    @patch("lizzy.helpers.aws.force_redeploy_services")
+    @patch("lizzy.helpers.aws.click.echo")
+    def test_plan_reports_without_redeploying(
+        self, mock_echo, mock_redeploy_all, mock_get_int, mock_aws_client, mock_get_services,
+        mock_choose_cluster, mock_get_clusters, mock_get_accounts, mock_get_creds
+    ):
+        """Test that --plan prints an estimate and never calls update_service."""
+        from lizzy.helpers.ecs import ServiceRecord
+
+        mock_get_accounts.return_value = "dev"
+        mock_get_creds.return_value = ("key", "secret", "token", "arn")
+        mock_get_clusters.return_value = ["cluster-1"]
+        mock_choose_cluster.return_value = "cluster-1"
+        mock_get_services.return_value = [
+            ServiceRecord("arn/api", "api", "arn/cluster-1", "FARGATE", "ACTIVE", "td:1", desired=4),
+            ServiceRecord(
+                "arn/worker", "worker", "arn/cluster-1", "FARGATE", "ACTIVE", "td:1",
+                desired=2, max_percent=100,
+            ),
+        ]
+
+        from lizzy.helpers.aws import run_aws_fargate_restart
+        run_aws_fargate_restart(all_services=True, plan=True)
+
+        mock_redeploy_all.assert_not_called()
+        mock_aws_client.return_value.update_service.assert_not_called()
+        mock_echo.assert_any_call(
+            "cluster-1 / worker: 2 tasks (100%/100%), blocked: 100%-100% leaves no room "
+            "to replace tasks"
+        )
+        mock_echo.assert_any_call(
+            "Plan: 2 services, 6 tasks to replace, ~3 min, API calls: 1 describe_services, "
+            "2 update_service. 1 services cannot be restarted."
+        )
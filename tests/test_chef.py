@@ -107,8 +107,8 @@ class TestGetChefEnvironment:
         assert "No Chef environments configured" in str(exc_info.value)
 
     @patch("lizzy.helpers.chef.get_chef_environments")
-    @patch("lizzy.helpers.chef.click.echo")
-    @patch("lizzy.helpers.chef.click.prompt")
+    @patch("lizzy.helpers.chef.output.echo")
+    @patch("lizzy.helpers.chef.output.prompt")
     def test_get_chef_environment_prompts_for_multiple_environments(
         self, mock_prompt, mock_echo, mock_get_environments
     ):
@@ -123,8 +123,8 @@ class TestGetChefEnvironment:
         mock_prompt.assert_called_once_with("Select an environment by number", type=int)
 
     @patch("lizzy.helpers.chef.get_chef_environments")
-    @patch("lizzy.helpers.chef.click.echo")
-    @patch("lizzy.helpers.chef.click.prompt")
+    @patch("lizzy.helpers.chef.output.echo")
+    @patch("lizzy.helpers.chef.output.prompt")
     def test_get_chef_environment_raises_error_for_invalid_selection(
         self, mock_prompt, mock_echo, mock_get_environments
     ):
@@ -145,8 +145,8 @@ class TestUpdateDatadogVersion:
     @patch("lizzy.helpers.chef.chef.Environment")
     @patch("lizzy.helpers.chef.get_chef_environment")
     @patch("lizzy.helpers.chef.get_latest_datadog_version")
-    @patch("lizzy.helpers.chef.click.echo")
-    @patch("lizzy.helpers.chef.click.confirm")
+    @patch("lizzy.helpers.chef.output.echo")
+    @patch("lizzy.helpers.chef.output.confirm")
     def test_update_datadog_version_with_latest_version(
         self, mock_confirm, mock_echo, mock_get_latest, mock_get_env, 
         mock_environment, mock_setup_api
@@ -172,9 +172,9 @@ class TestUpdateDatadogVersion:
     @patch("lizzy.helpers.chef.setup_chef_api")
     @patch("lizzy.helpers.chef.chef.Environment")
     @patch("lizzy.helpers.chef.get_chef_environment")
-    @patch("lizzy.helpers.chef.click.echo")
-    @patch("lizzy.helpers.chef.click.confirm")
-    @patch("lizzy.helpers.chef.click.prompt")
+    @patch("lizzy.helpers.chef.output.echo")
+    @patch("lizzy.helpers.chef.output.confirm")
+    @patch("lizzy.helpers.chef.output.prompt")
     def test_update_datadog_version_with_manual_version(
         self, mock_prompt, mock_confirm, mock_echo, mock_get_env, 
         mock_environment, mock_setup_api
@@ -200,8 +200,8 @@ class TestUpdateDatadogVersion:
     @patch("lizzy.helpers.chef.chef.Environment")
     @patch("lizzy.helpers.chef.get_chef_environment")
     @patch("lizzy.helpers.chef.get_latest_datadog_version")
-    @patch("lizzy.helpers.chef.click.echo")
-    @patch("lizzy.helpers.chef.click.confirm")
+    @patch("lizzy.helpers.chef.output.echo")
+    @patch("lizzy.helpers.chef.output.confirm")
     def test_update_datadog_version_handles_fetch_failure(
         self, mock_confirm, mock_echo, mock_get_latest, mock_get_env, 
         mock_environment, mock_setup_api
@@ -229,8 +229,8 @@ class TestUpdateChefVersion:
     @patch("lizzy.helpers.chef.chef.Environment")
     @patch("lizzy.helpers.chef.get_chef_environment")
     @patch("lizzy.helpers.chef.get_latest_chef_version")
-    @patch("lizzy.helpers.chef.click.echo")
-    @patch("lizzy.helpers.chef.click.confirm")
+    @patch("lizzy.helpers.chef.output.echo")
+    @patch("lizzy.helpers.chef.output.confirm")
     def test_update_chef_version_with_latest_version(
         self, mock_confirm, mock_echo, mock_get_latest, mock_get_env, 
         mock_environment, mock_setup_api
@@ -256,9 +256,9 @@ class TestUpdateChefVersion:
     @patch("lizzy.helpers.chef.setup_chef_api")
     @patch("lizzy.helpers.chef.chef.Environment")
     @patch("lizzy.helpers.chef.get_chef_environment")
-    @patch("lizzy.helpers.chef.click.echo")
-    @patch("lizzy.helpers.chef.click.confirm")
-    @patch("lizzy.helpers.chef.click.prompt")
+    @patch("lizzy.helpers.chef.output.echo")
+    @patch("lizzy.helpers.chef.output.confirm")
+    @patch("lizzy.helpers.chef.output.prompt")
     def test_update_chef_version_creates_missing_attributes(
         self, mock_prompt, mock_confirm, mock_echo, mock_get_env, 
         mock_environment, mock_setup_api
@@ -2,10 +2,11 @@
 
 from unittest.mock import MagicMock, patch
 
+import click
 import pytest
 from click.testing import CliRunner
 
-from lizzy.cli import lizzy
+from lizzy.cli import LazyGroup, lizzy
 
 
 class TestCLICommands:
@@ -49,6 +50,15 @@ class TestCLICommands:
         assert "fargate-restart" in result.output
         assert "fargate-restart-all" in result.output
 
+    @patch('lizzy.cli.set_profile')
+    @patch('lizzy.helpers.config.edit_config')
+    def test_profile_option_selects_config_profile(self, mock_edit_config, mock_set_profile):
+        """Test that --profile is passed on to the config layer."""
+        result = self.runner.invoke(lizzy, ['--profile', 'work', 'self', 'config'])
+
+        assert result.exit_code == 0
+        mock_set_profile.assert_called_once_with('work')
+
     def test_invalid_command_shows_error(self):
         """Test that invalid commands show proper error."""
         result = self.runner.invoke(lizzy, ['invalid-command'])
@@ -64,8 +74,8 @@ class TestAWSCommands:
         """Set up test fixtures."""
         self.runner = CliRunner()
 
-    @patch('commands.aws_commands.get_aws_credentials')
-    @patch('commands.aws_commands.get_config_accounts')
+    @patch('lizzy.helpers.aws.get_aws_credentials')
+    @patch('lizzy.helpers.aws.get_config_accounts')
     def test_aws_authenticate_command(self, mock_get_accounts, mock_get_creds):
         """Test AWS authenticate command."""
         mock_get_accounts.return_value = "dev"
@@ -89,7 +99,21 @@ class TestAWSCommands:
         result = self.runner.invoke(lizzy, ['aws', 'fargate-restart'])
         
         assert result.exit_code == 0
-        mock_restart.assert_called_once_with(all_services=False)
+        mock_restart.assert_called_once_with(
+            all_services=False, cluster=None, service=None, plan=False
+        )
+
+    @patch('lizzy.helpers.aws.run_aws_fargate_restart')
+    def test_aws_fargate_restart_with_selectors(self, mock_restart):
+        """Test that --cluster and --service skip the prompts."""
+        result = self.runner.invoke(
+            lizzy, ['aws', 'fargate-restart', '--cluster', 'prod', '--service', 'api-*']
+        )
+
+        assert result.exit_code == 0
+        mock_restart.assert_called_once_with(
+            all_services=False, cluster='prod', service='api-*', plan=False
+        )
 
     @patch('lizzy.helpers.aws.run_aws_fargate_restart')
     def test_aws_fargate_restart_all_command(self, mock_restart):
@@ -97,7 +121,74 @@ class TestAWSCommands:
         result = self.runner.invoke(lizzy, ['aws', 'fargate-restart-all'])
         
         assert result.exit_code == 0
-        mock_restart.assert_called_once_with(all_services=True)
+        mock_restart.assert_called_once_with(
+            all_services=True, wave_size=None, wait_timeout=900, abort_on_failure=True,
+            cluster=None, families=(), plan=False,
+        )
+
+    @patch('lizzy.helpers.aws.run_aws_fargate_restart')
+    def test_aws_fargate_restart_all_in_waves(self, mock_restart):
+        """Test that wave options are passed on to the restart."""
+        result = self.runner.invoke(lizzy, [
+            'aws', 'fargate-restart-all',
+            '--wave-size', '3', '--wait-timeout', '60', '--continue-on-failure',
+        ])
+
+        assert result.exit_code == 0
+        mock_restart.assert_called_once_with(
+            all_services=True, wave_size=3, wait_timeout=60, abort_on_failure=False,
+            cluster=None, families=(), plan=False,
+        )
+
+    @patch('lizzy.helpers.aws.run_aws_inventory')
+    def test_aws_inventory_command(self, mock_inventory):
+        """Test that inventory filters are passed on."""
+        result = self.runner.invoke(lizzy, [
+            'aws', 'inventory', '--service', 'api-*', '--launch-type', 'FARGATE', '--offline',
+        ])
+
+        assert result.exit_code == 0
+        mock_inventory.assert_called_once_with(
+            ('*',),
+            (),
+            cluster_patterns=('*',),
+            service_patterns=('api-*',),
+            launch_type='FARGATE',
+            refresh=False,
+            offline=True,
+        )
+
+    @patch('lizzy.helpers.aws.run_aws_watch')
+    def test_aws_watch_command(self, mock_watch):
+        """Test that watch options are passed on."""
+        result = self.runner.invoke(lizzy, [
+            'aws', 'watch', '--cluster', 'prod', '--service', 'api-*', '--forever',
+        ])
+
+        assert result.exit_code == 0
+        mock_watch.assert_called_once_with(
+            'prod', ('api-*',), interval=5, timeout=None, until_stable=False
+        )
+
+    @patch('lizzy.helpers.aws.run_aws_fargate_restart_matching')
+    def test_aws_fargate_restart_matching_command(self, mock_restart):
+        """Test that selectors are passed on to the fan-out restart."""
+        result = self.runner.invoke(lizzy, [
+            'aws', 'fargate-restart-matching',
+            '--service', 'api-*', '--account', 'prod-*',
+            '--region', 'eu-west-1', '--region', 'us-east-1', '--plan',
+        ])
+
+        assert result.exit_code == 0
+        mock_restart.assert_called_once_with(
+            ('prod-*',),
+            ('api-*',),
+            regions=('eu-west-1', 'us-east-1'),
+            cluster_patterns=('*',),
+            account_concurrency=4,
+            workers=None,
+            plan=True,
+        )
 
     def test_aws_group_help(self):
         """Test AWS group help displays correctly."""
@@ -199,7 +290,19 @@ class TestGitlabCommands:
         result = self.runner.invoke(lizzy, ['gitlab', 'remove-merged-branches'])
         
         assert result.exit_code == 0
-        mock_remove_branches.assert_called_once()
+        mock_remove_branches.assert_called_once_with(dry_run=False, protect=())
+
+    @patch('lizzy.helpers.gitlab.remove_merged_branches')
+    def test_gitlab_remove_merged_branches_dry_run(self, mock_remove_branches):
+        """Test GitLab remove merged branches command with --dry-run and --protect."""
+        result = self.runner.invoke(
+            lizzy,
+            ['gitlab', 'remove-merged-branches', '--dry-run', '--protect', 'release/*'],
+        )
+
+        assert result.exit_code == 0
+        mock_remove_branches.assert_called_once_with(dry_run=True, protect=('release/*',))
+        assert "Removed merged branches" not in result.output
 
 
 class TestChefCommands:
@@ -311,8 +414,8 @@ class TestSpaceSyntaxCommands:
         """Set up test fixtures."""
         self.runner = CliRunner()
 
-    @patch('commands.aws_commands.get_aws_credentials')
-    @patch('commands.aws_commands.get_config_accounts')
+    @patch('lizzy.helpers.aws.get_aws_credentials')
+    @patch('lizzy.helpers.aws.get_config_accounts')
     def test_space_syntax_aws_authenticate(self, mock_get_accounts, mock_get_creds):
         """Test that space syntax works for AWS authenticate."""
         mock_get_accounts.return_value = "dev"
@@ -339,4 +442,53 @@ class TestSpaceSyntaxCommands:
         result = self.runner.invoke(lizzy, ['self config'])
         
         assert result.exit_code == 0
-        mock_edit_config.assert_called_once()
\ No newline at end of file
+        mock_edit_config.assert_called_once()
+
+    def test_space_syntax_resolves_to_grouped_command(self):
+        """Test that a flat alias resolves to the grouped command object."""
+        ctx = lizzy.make_context("lizzy", ["--help"], resilient_parsing=True)
+
+        alias = lizzy.get_command(ctx, "aws fargate-restart")
+        grouped = lizzy.get_command(ctx, "aws").get_command(ctx, "fargate-restart")
+
+        assert alias is grouped
+
+    def test_space_syntax_aliases_are_not_registered(self):
+        """Test that flat aliases do not create duplicate command objects."""
+        ctx = lizzy.make_context("lizzy", ["--help"], resilient_parsing=True)
+        lizzy.get_command(ctx, "aws authenticate")
+
+        assert not any(" " in name for name in lizzy.commands)
+
+    def test_space_syntax_unknown_alias_shows_error(self):
+        """Test that an alias for an unknown group is rejected."""
+        result = self.runner.invoke(lizzy, ['nope authenticate'])
+
+        assert result.exit_code != 0
+        assert "No such command" in result.output
+
+
+class TestLazyGroupHelpRows:
+    """Test LazyGroup.help_rows."""
+
+    def test_lists_manifest_entries_aliases_and_loaded_commands(self):
+        """Test that rows come from the manifest without importing modules."""
+        manifest = {
+            "tools": {
+                "module": "commands.not_a_module",
+                "help": "Manage tools.",
+                "commands": {"run": {"help": "Run a tool."}},
+            }
+        }
+        group = LazyGroup(name="root", manifest_loader=lambda: manifest)
+        group.add_command(click.Command("local", help="A local command."))
+        group.add_command(click.Command("secret", hidden=True))
+
+        with click.Context(group) as ctx:
+            rows = group.help_rows(ctx)
+
+        assert rows == [
+            ("local", "A local command."),
+            ("tools", "Manage tools."),
+            ("tools run", "Run a tool."),
+        ]
@@ -0,0 +1,18 @@
+"""Tests for lizzy.helpers.concurrency module."""
+
+import contextvars
+
+from lizzy.helpers.concurrency import ContextThreadPoolExecutor
+
+request = contextvars.ContextVar("request", default=None)
+
+
+def test_workers_see_the_submitting_context():
+    """Test that submit and map run tasks in a copy of the caller's context."""
+    request.set("first")
+    with ContextThreadPoolExecutor(max_workers=2) as pool:
+        submitted = pool.submit(request.get).result()
+        mapped = list(pool.map(lambda _: request.get(), range(3)))
+
+    assert submitted == "first"
+    assert mapped == ["first"] * 3
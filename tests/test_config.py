@@ -1,18 +1,42 @@
 """Tests for lizzy.helpers.config module."""
 
+import json
+import os
 from pathlib import Path
 from unittest.mock import MagicMock, mock_open, patch
 
+import pytest
+
 from lizzy.helpers.config import (
+    ConfigError,
+    _cache,
     config_dir,
     config_path,
     edit_config,
     example_config_path,
+    get_bool,
     get_config,
+    get_dict,
+    get_int,
+    get_list,
     get_setting,
+    get_str,
+    profile_path,
+    reload,
+    set_profile,
+    snapshot_path,
 )
 
 
+@pytest.fixture
+def config_file(tmp_path):
+    """Point config_path at a real temporary config file."""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"gitlab": {"api_token": "first"}}))
+    with patch("lizzy.helpers.config.config_path", return_value=path):
+        yield path
+
+
 class TestConfigPaths:
     """Test configuration path functions."""
 
@@ -183,3 +207,233 @@ class TestGetSetting:
 
         result = get_setting("gitlab")
         assert result == {"api_token": "test_token", "username": "test_user"}
+
+    @patch("lizzy.helpers.config.get_config")
+    def test_get_setting_returns_default_for_missing_key(self, mock_get_config):
+        """Test that get_setting returns the default for missing keys."""
+        mock_get_config.return_value = {"gitlab": {"api_token": "test_token"}}
+
+        assert get_setting("gitlab.username", default="anon") == "anon"
+        assert get_setting("gitlab.api_token.nested") is None
+
+
+class TestConfigCache:
+    """Test the process-wide config cache."""
+
+    def test_get_config_parses_file_once(self, config_file):
+        """Test that repeated lookups reuse the parsed config."""
+        with patch("lizzy.helpers.config.json.load", wraps=json.load) as mock_load:
+            for _ in range(5):
+                assert get_setting("gitlab.api_token") == "first"
+
+        assert mock_load.call_count == 1
+
+    def test_get_config_reloads_after_file_change(self, config_file):
+        """Test that a changed mtime or size invalidates the cache."""
+        assert get_setting("gitlab.api_token") == "first"
+
+        config_file.write_text(json.dumps({"gitlab": {"api_token": "second!"}}))
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert get_setting("gitlab.api_token") == "second!"
+
+    def test_reload_rereads_config(self, config_file):
+        """Test that reload drops the cache even when the file looks unchanged."""
+        get_config()
+
+        with patch("lizzy.helpers.config.json.load", return_value={"x": 1}):
+            assert reload() == {"x": 1}
+
+        assert get_config() == {"x": 1}
+
+
+class TestTypedAccessors:
+    """Test typed config accessors."""
+
+    @patch("lizzy.helpers.config.get_config")
+    def test_typed_accessors_return_values(self, mock_get_config):
+        """Test that typed accessors return values of the expected type."""
+        mock_get_config.return_value = {
+            "gitlab": {"api_token": "token", "components": [], "concurrency": 4},
+            "aws": {"cache": True, "accounts": {}},
+        }
+
+        assert get_str("gitlab.api_token") == "token"
+        assert get_list("gitlab.components") == []
+        assert get_int("gitlab.concurrency") == 4
+        assert get_bool("aws.cache") is True
+        assert get_dict("aws.accounts") == {}
+
+    @patch("lizzy.helpers.config.get_config")
+    def test_typed_accessors_return_default_when_missing(self, mock_get_config):
+        """Test that typed accessors fall back to the default."""
+        mock_get_config.return_value = {}
+
+        assert get_int("gitlab.concurrency", 8) == 8
+        assert get_str("gitlab.api_token") is None
+
+    @patch("lizzy.helpers.config.get_config")
+    def test_typed_accessors_reject_wrong_type(self, mock_get_config):
+        """Test that typed accessors raise ConfigError on a type mismatch."""
+        mock_get_config.return_value = {"gitlab": {"concurrency": True}}
+
+        with pytest.raises(ConfigError) as exc_info:
+            get_int("gitlab.concurrency")
+
+        assert "gitlab.concurrency must be of type int" in str(exc_info.value)
+
+
+class TestConfigSnapshot:
+    """Test compiled config snapshots."""
+
+    def test_first_load_writes_snapshot(self, config_file):
+        """Test that parsing the JSON writes a snapshot next to it."""
+        get_config()
+
+        assert snapshot_path(config_file).exists()
+
+    def test_snapshot_is_only_readable_by_its_owner(self, config_file):
+        """Test that the snapshot holding API tokens is written with mode 0600."""
+        get_config()
+
+        assert snapshot_path(config_file).stat().st_mode & 0o777 == 0o600
+
+    def test_env_overrides_are_not_snapshotted(self, config_file, monkeypatch):
+        """Test that secrets passed via LIZZY__ variables never reach the disk."""
+        monkeypatch.setenv("LIZZY__GITLAB__API_TOKEN", "supersecret")
+
+        assert get_setting("gitlab.api_token") == "supersecret"
+        assert not snapshot_path(config_file).exists()
+
+    def test_cold_load_uses_snapshot(self, config_file):
+        """Test that a fresh process loads the snapshot instead of the JSON."""
+        get_config()
+        _cache.clear()
+
+        with patch("lizzy.helpers.config.json.load") as mock_load:
+            assert get_setting("gitlab.api_token") == "first"
+
+        mock_load.assert_not_called()
+
+    def test_snapshot_is_ignored_when_json_changes(self, config_file):
+        """Test that a snapshot for an older version of the JSON is not used."""
+        get_config()
+        _cache.clear()
+
+        config_file.write_text(json.dumps({"gitlab": {"api_token": "second!"}}))
+
+        assert get_setting("gitlab.api_token") == "second!"
+
+    def test_cold_load_uses_merged_profile_snapshot(self, config_file, tmp_path):
+        """Test that a profile's merged config is snapshotted, not each file."""
+        overlay = tmp_path / "work.json"
+        overlay.write_text(json.dumps({"gitlab": {"username": "worker"}}))
+        set_profile("work")
+        with patch("lizzy.helpers.config.profile_path", return_value=overlay):
+            get_config()
+            _cache.clear()
+
+            with patch("lizzy.helpers.config.json.load") as mock_load:
+                assert get_setting("gitlab.api_token") == "first"
+                assert get_setting("gitlab.username") == "worker"
+
+        mock_load.assert_not_called()
+        assert snapshot_path(config_file, "work").exists()
+        assert not snapshot_path(config_file).exists()
+
+    def test_invalid_config_is_not_snapshotted(self, config_file):
+        """Test that only configs passing validation are snapshotted."""
+        config_file.write_text(json.dumps({"gitlab": {"components": [{}]}}))
+
+        assert get_setting("gitlab.components") == ({},)
+        assert not snapshot_path(config_file).exists()
+
+    def test_corrupt_snapshot_falls_back_to_json(self, config_file):
+        """Test that an unreadable snapshot is treated as missing."""
+        snapshot_path(config_file).write_bytes(b"garbage")
+
+        assert get_setting("gitlab.api_token") == "first"
+
+    def test_snapshots_can_be_disabled(self, config_file, monkeypatch):
+        """Test that LIZZY_CONFIG_SNAPSHOT=0 skips writing snapshots."""
+        monkeypatch.setenv("LIZZY_CONFIG_SNAPSHOT", "0")
+
+        get_config()
+
+        assert not snapshot_path(config_file).exists()
+
+
+class TestConfigProfiles:
+    """Test profile overlays and environment overrides."""
+
+    @pytest.fixture
+    def work_profile(self, config_file, tmp_path):
+        """Create a 'work' profile overlay next to the config file."""
+        path = tmp_path / "profiles" / "work.json"
+        path.parent.mkdir()
+        path.write_text(
+            json.dumps(
+                {
+                    "gitlab": {"username": "worker"},
+                    "terraform": {"organization": "work-org"},
+                }
+            )
+        )
+        with patch("lizzy.helpers.config.profile_path", return_value=path):
+            yield path
+
+    def test_profile_path_is_in_profiles_dir(self):
+        """Test that profiles live in ~/.lizzy/profiles."""
+        assert profile_path("work").parent == config_dir() / "profiles"
+
+    def test_profile_overlay_is_deep_merged(self, work_profile):
+        """Test that a profile overlays the base config key by key."""
+        set_profile("work")
+
+        assert get_setting("gitlab.api_token") == "first"
+        assert get_setting("gitlab.username") == "worker"
+        assert get_setting("terraform.organization") == "work-org"
+
+    def test_profile_from_environment(self, work_profile, monkeypatch):
+        """Test that LIZZY_PROFILE selects the profile."""
+        monkeypatch.setenv("LIZZY_PROFILE", "work")
+
+        assert get_setting("gitlab.username") == "worker"
+
+    def test_missing_profile_raises_config_error(self, config_file, tmp_path):
+        """Test that selecting an unknown profile is reported."""
+        set_profile("missing")
+
+        with patch(
+            "lizzy.helpers.config.profile_path",
+            return_value=tmp_path / "profiles" / "missing.json",
+        ), pytest.raises(ConfigError, match="profile 'missing' not found"):
+            get_config()
+
+    def test_environment_overrides_win(self, work_profile, monkeypatch):
+        """Test that LIZZY__ variables override files, parsing JSON values."""
+        set_profile("work")
+        monkeypatch.setenv("LIZZY__GITLAB__USERNAME", "env-user")
+        monkeypatch.setenv("LIZZY__GITLAB__CONCURRENCY", "16")
+
+        assert get_setting("gitlab.username") == "env-user"
+        assert get_int("gitlab.concurrency") == 16
+
+    def test_merged_config_is_immutable(self, config_file):
+        """Test that the merged snapshot cannot be modified."""
+        config = get_config()
+
+        with pytest.raises(TypeError):
+            config["gitlab"]["api_token"] = "changed"
+
+    def test_merge_is_cached_per_profile(self, work_profile):
+        """Test that the merge runs once per profile and source version."""
+        first = get_config()
+        assert get_config() is first
+
+        set_profile("work")
+        work = get_config()
+
+        assert work is not first
+        assert get_config() is work
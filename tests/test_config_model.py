@@ -0,0 +1,120 @@
+"""Tests for lizzy.helpers.config_model module."""
+
+from unittest.mock import patch
+
+import pytest
+
+from lizzy.helpers.config import ConfigError
+from lizzy.helpers.config_model import (
+    AwsAccount,
+    GitlabComponent,
+    build_config_model,
+    get_config_model,
+    validate_components,
+)
+
+
+class TestBuildConfigModel:
+    """Test build_config_model function."""
+
+    def test_build_config_model_indexes_accounts_and_components(self, sample_config):
+        """Test that accounts and components can be looked up by name."""
+        model = build_config_model(sample_config)
+
+        assert model.account("prod") == AwsAccount(name="prod", id="987654321")
+        assert model.component("component1").branch == "develop"
+        assert [a.name for a in model.accounts] == ["dev", "prod"]
+
+    def test_build_config_model_handles_missing_sections(self):
+        """Test that an empty config builds an empty model."""
+        model = build_config_model({})
+
+        assert model.accounts == ()
+        assert model.components == ()
+        assert model.environments == ()
+
+    def test_missing_lookup_raises_value_error(self, sample_config):
+        """Test that unknown names raise ValueError."""
+        model = build_config_model(sample_config)
+
+        with pytest.raises(ValueError, match="Account with name staging not found"):
+            model.account("staging")
+        with pytest.raises(ValueError, match="Component with name nope not found"):
+            model.component("nope")
+
+    def test_build_config_model_reports_every_schema_error(self):
+        """Test that all schema problems are reported in one ConfigError."""
+        config = {
+            "aws": {"accounts": [{"name": "dev"}, "prod", {"name": "dev", "id": "1"}]},
+            "gitlab": {
+                "components": [{"name": "a"}, {"name": "a"}, {}],
+                "environments": "prod",
+            },
+        }
+
+        with pytest.raises(ConfigError) as exc_info:
+            build_config_model(config)
+
+        message = str(exc_info.value)
+        assert "aws.accounts[0].id must be a string" in message
+        assert "aws.accounts[1] must be an object" in message
+        assert "gitlab.components[1] (a): duplicate component name" in message
+        assert "gitlab.components[2].name must be a non-empty string" in message
+        assert "gitlab.environments must be a list of strings" in message
+
+    def test_as_dict_round_trips(self):
+        """Test that model entries convert back to config file form."""
+        component = GitlabComponent(name="api", branch="develop")
+
+        assert component.as_dict() == {"name": "api", "branch": "develop"}
+        assert AwsAccount(name="dev", id="1").as_dict() == {"name": "dev", "id": "1"}
+
+
+class TestValidateComponents:
+    """Test validate_components function."""
+
+    def test_validate_components_requires_keys(self):
+        """Test that missing required keys are reported by component."""
+        raw = [
+            {"name": "api", "project_name_with_namespace": "group/api"},
+            {"name": "web"},
+        ]
+
+        with pytest.raises(ConfigError) as exc_info:
+            validate_components(raw, required=("project_name_with_namespace",))
+
+        assert "gitlab.components[1] (web) is missing project_name_with_namespace" in str(
+            exc_info.value
+        )
+
+    def test_validate_components_handles_none(self):
+        """Test that a missing components setting is an empty tuple."""
+        assert validate_components(None) == ()
+
+    def test_validate_components_ignores_unknown_keys(self):
+        """Test that extra keys in a component entry are ignored."""
+        components = validate_components([{"name": "api", "owner": "team"}])
+
+        assert components == (GitlabComponent(name="api"),)
+
+
+class TestGetConfigModel:
+    """Test get_config_model function."""
+
+    @patch("lizzy.helpers.config_model.get_config")
+    def test_get_config_model_is_cached_per_config(self, mock_get_config, sample_config):
+        """Test that the model is only rebuilt when the config object changes."""
+        mock_get_config.return_value = sample_config
+
+        with patch(
+            "lizzy.helpers.config_model.build_config_model",
+            wraps=build_config_model,
+        ) as mock_build:
+            first = get_config_model()
+            second = get_config_model()
+            mock_get_config.return_value = {"aws": {"accounts": []}}
+            third = get_config_model()
+
+        assert first is second
+        assert third.accounts == ()
+        assert mock_build.call_count == 2
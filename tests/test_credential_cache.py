@@ -0,0 +1,133 @@
+"""Tests for lizzy.helpers.credential_cache module."""
+
+import stat
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from cryptography.fernet import Fernet
+
+from lizzy.helpers import credential_cache
+from lizzy.helpers.credential_cache import (
+    CredentialCache,
+    KeyringUnavailableError,
+    encryption_key,
+    is_fresh,
+    open_cache,
+)
+
+
+def gimme_entry(expires_in: timedelta = timedelta(hours=1), role: str = "arn:role/dev"):
+    """Return gimme-aws-creds output expiring after ``expires_in``."""
+    return {
+        "credentials": {
+            "aws_access_key_id": "AKIAEXAMPLE",
+            "aws_secret_access_key": "very-secret",
+            "aws_session_token": "token",
+            "expiration": (datetime.now(UTC) + expires_in).isoformat(),
+        },
+        "role": {"arn": role},
+    }
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Return a credential cache in a temporary directory."""
+    return CredentialCache(tmp_path / "sts.enc", key=Fernet.generate_key())
+
+
+class TestCredentialCache:
+    """Test CredentialCache class."""
+
+    def test_round_trip_by_account_and_role(self, cache):
+        """Test that stored credentials are found by account id and role ARN."""
+        with cache.locked():
+            assert cache.put("123456789", gimme_entry())
+
+            assert cache.get("123456789")["credentials"]["aws_access_key_id"] == "AKIAEXAMPLE"
+            assert cache.get("123456789", "arn:role/dev") is not None
+            assert cache.get("123456789", "arn:role/other") is None
+            assert cache.get("987654321") is None
+
+    def test_secrets_are_encrypted_on_disk(self, cache):
+        """Test that the cache file holds no plaintext secrets and is private."""
+        cache.put("123456789", gimme_entry())
+
+        assert b"very-secret" not in cache.path.read_bytes()
+        assert stat.S_IMODE(cache.path.stat().st_mode) == 0o600
+
+    def test_credentials_close_to_expiry_are_not_served(self, cache):
+        """Test that entries are refreshed before the session token expires."""
+        cache.put("123456789", gimme_entry(timedelta(minutes=10)))
+
+        assert cache.get("123456789") is None
+
+    def test_entries_without_expiration_are_not_cached(self, cache):
+        """Test that credentials of unknown lifetime are never stored."""
+        entry = gimme_entry()
+        del entry["credentials"]["expiration"]
+
+        assert not cache.put("123456789", entry)
+        assert cache.get("123456789") is None
+
+    def test_unreadable_cache_is_treated_as_empty(self, cache):
+        """Test that a cache encrypted with another key is ignored."""
+        cache.put("123456789", gimme_entry())
+
+        other = CredentialCache(cache.path, key=Fernet.generate_key())
+        assert other.get("123456789") is None
+
+    def test_is_fresh_accepts_zulu_timestamps(self):
+        """Test that STS style UTC timestamps are parsed."""
+        later = datetime.now(UTC) + timedelta(hours=1)
+        entry = {"credentials": {"expiration": later.strftime("%Y-%m-%dT%H:%M:%SZ")}}
+
+        assert is_fresh(entry)
+
+
+class TestEncryptionKey:
+    """Test encryption_key function."""
+
+    def test_no_keyring_disables_the_cache(self, tmp_path, capsys, monkeypatch):
+        """Test that without a keyring nothing is cached and a warning is shown."""
+        monkeypatch.setattr(credential_cache, "_warned", False)
+        with patch("keyring.get_password", side_effect=RuntimeError("no backend")), patch(
+            "lizzy.helpers.credential_cache.cache_dir", return_value=tmp_path
+        ):
+            with pytest.raises(KeyringUnavailableError, match="no backend"):
+                encryption_key()
+            assert open_cache() is None
+            assert open_cache() is None
+
+        assert capsys.readouterr().err.count("AWS credentials are not cached") == 1
+        assert list(tmp_path.iterdir()) == []
+
+    def test_uses_keyring_when_available(self):
+        """Test that the key is created in and read from the keyring."""
+        store = {}
+        with patch("keyring.get_password", side_effect=lambda s, u: store.get((s, u))), patch(
+            "keyring.set_password", side_effect=lambda s, u, p: store.update({(s, u): p})
+        ):
+            key = encryption_key()
+            assert encryption_key() == key
+        assert list(store.values()) == [key.decode()]
+
+
+@patch("lizzy.helpers.aws.get_account_by_name", return_value={"name": "dev", "id": "123456789"})
+@patch("lizzy.helpers.aws.gimme_aws_creds.ui.CLIUserInterface")
+@patch("lizzy.helpers.aws.gimme_aws_creds.main.GimmeAWSCreds")
+def test_get_aws_credentials_logs_in_once(mock_gimme, mock_ui, mock_account, tmp_path):
+    """Test that a second lookup is served from the cache without Okta."""
+    from lizzy.helpers.aws import get_aws_credentials
+
+    mock_gimme.return_value = MagicMock(
+        iter_selected_aws_credentials=lambda: iter([gimme_entry()])
+    )
+    cache = CredentialCache(tmp_path / "sts.enc", key=Fernet.generate_key())
+
+    with patch("lizzy.helpers.aws.credential_cache.open_cache", return_value=cache):
+        first = get_aws_credentials("dev")
+        second = get_aws_credentials("dev")
+
+    assert first == second
+    assert mock_gimme.call_count == 1
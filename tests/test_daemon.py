@@ -0,0 +1,243 @@
+"""Tests for lizzy.daemon module."""
+
+import contextlib
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from lizzy import daemon, output
+from lizzy.helpers.concurrency import ContextThreadPoolExecutor
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Return a context manager serving daemon requests from a thread."""
+
+    @contextlib.contextmanager
+    def serving():
+        path = str(tmp_path / "daemon.sock")
+        srv = daemon.make_server(path, idle_timeout=0)
+        thread = threading.Thread(
+            target=srv.serve_forever, kwargs={"poll_interval": 0.05}
+        )
+        thread.start()
+        try:
+            yield srv, path
+        finally:
+            srv.shutdown()
+            thread.join()
+            srv.server_close()
+
+    return serving
+
+
+def run(argv, path, stdin=""):
+    """Run argv through the client and return (exit code, stdout, stderr)."""
+    out, err = io.StringIO(), io.StringIO()
+    code = daemon.run_client(argv, path, stdin=io.StringIO(stdin), stdout=out, stderr=err)
+    return code, out.getvalue(), err.getvalue()
+
+
+class TestShouldForward:
+    """Test which invocations go to the daemon."""
+
+    def test_forwards_regular_commands(self, monkeypatch):
+        """Test that ordinary commands are forwarded."""
+        monkeypatch.delenv("LIZZY_NO_DAEMON", raising=False)
+        assert daemon.should_forward(["aws", "authenticate"])
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            [],
+            ["--profile", "prod", "aws"],
+            ["daemon", "stop"],
+            ["self", "config"],
+            ["aws", "--help"],
+        ],
+    )
+    def test_runs_locally(self, argv, monkeypatch):
+        """Test that root options, help and local-only groups run in-process."""
+        monkeypatch.delenv("LIZZY_NO_DAEMON", raising=False)
+        assert not daemon.should_forward(argv)
+
+    def test_opt_out(self, monkeypatch):
+        """Test that LIZZY_NO_DAEMON disables forwarding."""
+        monkeypatch.setenv("LIZZY_NO_DAEMON", "1")
+        assert not daemon.should_forward(["aws", "authenticate"])
+
+
+class TestClient:
+    """Test the client without a daemon."""
+
+    def test_run_client_without_daemon_returns_none(self, tmp_path):
+        """Test that a missing socket makes the caller run locally."""
+        assert daemon.run_client(["aws"], str(tmp_path / "missing.sock")) is None
+
+    def test_request_without_daemon_returns_none(self, tmp_path):
+        """Test that control requests report a missing daemon."""
+        assert daemon.request({"op": "ping"}, str(tmp_path / "missing.sock")) is None
+
+
+class TestServer:
+    """Test requests served by the daemon."""
+
+    def test_ping_reports_status(self, server):
+        """Test that ping returns the daemon status."""
+        with server() as (_, path):
+            status = daemon.request({"op": "ping"}, path)
+            assert status["requests"] == 0
+            assert status["active"] == 0
+
+    def test_run_streams_output_and_exit_code(self, server):
+        """Test that command output and the exit code reach the client."""
+        with server() as (_, path):
+            code, out, err = run(["aws"], path)
+            assert code == 2
+            assert "Build by Joeri Abbo" in out
+            assert "authenticate" in err
+
+    def test_help_is_left_to_the_client(self, server):
+        """Test that --help, which click prints to sys.stdout, runs locally."""
+        with server() as (_, path):
+            assert run(["aws", "--help"], path)[0] is None
+
+    def test_server_leaves_process_streams_alone(self, server):
+        """Test that serving does not swap sys streams or patch thread pools."""
+        streams = sys.stdin, sys.stdout, sys.stderr
+        submit = ThreadPoolExecutor.submit
+        with server() as (_, path):
+            run(["aws"], path)
+            assert (sys.stdin, sys.stdout, sys.stderr) == streams
+            assert ThreadPoolExecutor.submit is submit
+
+    def test_run_reports_usage_errors(self, server):
+        """Test that click errors are written to stderr with their exit code."""
+        with server() as (_, path):
+            code, _, err = run(["no-such-command"], path)
+            assert code == 2
+            assert "No such command" in err
+
+    def test_prompts_are_answered_by_the_client(self, server):
+        """Test that prompts read the client's stdin."""
+        with server() as (_, path):
+
+            def ask():
+                output.echo(output.prompt("Name"))
+
+            with patch("lizzy.daemon._run_command", side_effect=lambda argv: ask() or 0):
+                code, out, _ = run(["anything"], path, stdin="lizard\n")
+            assert code == 0
+            assert "Name: " in out
+            assert out.endswith("lizard\n")
+
+    def test_hidden_prompts_are_read_by_the_client(self, server):
+        """Test that secrets are prompted for by the client, not echoed by the daemon."""
+        with server() as (_, path):
+
+            def login():
+                output.echo(f"Got {len(output.getpass('Okta password: '))} characters")
+
+            with patch("lizzy.daemon._run_command", side_effect=lambda argv: login() or 0):
+                code, out, err = run(["anything"], path, stdin="hunter2\n")
+            assert code == 0
+            assert out == "Got 7 characters\n"
+            assert err == "Okta password: "
+
+    def test_hidden_prompts_use_getpass_on_the_terminal(self, server, monkeypatch):
+        """Test that the client turns echo off with getpass for its own stdin."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO())
+        with server() as (_, path):
+            with (
+                patch("getpass.getpass", return_value="hunter2") as mock_getpass,
+                patch(
+                    "lizzy.daemon._run_command",
+                    side_effect=lambda argv: output.echo(output.getpass("Password: ")) or 0,
+                ),
+            ):
+                out, err = io.StringIO(), io.StringIO()
+                code = daemon.run_client(["anything"], path, stdout=out, stderr=err)
+            assert code == 0
+            assert out.getvalue() == "hunter2\n"
+            mock_getpass.assert_called_once_with("Password: ", stream=err)
+
+    def test_worker_threads_write_to_their_own_session(self, server):
+        """Test that thread pools of concurrent commands reach the right client."""
+        both_running = threading.Barrier(2, timeout=5)
+
+        def fan_out(argv):
+            both_running.wait()
+            with ContextThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(lambda index: output.echo(f"{argv[0]}-{index}"), range(4)))
+            return 0
+
+        with server() as (_, path), patch("lizzy.daemon._run_command", side_effect=fan_out):
+            results = {}
+
+            def client(name):
+                results[name] = run([name], path)
+
+            clients = [
+                threading.Thread(target=client, args=(name,)) for name in ("first", "second")
+            ]
+            for client in clients:
+                client.start()
+            for client in clients:
+                client.join()
+
+        for name in ("first", "second"):
+            code, out, _ = results[name]
+            assert code == 0
+            assert sorted(out.splitlines()) == [f"{name}-{index}" for index in range(4)]
+
+    def test_different_config_selection_falls_back(self, server, monkeypatch):
+        """Test that a client with other LIZZY__ overrides runs locally."""
+        with server() as (_, path):
+            monkeypatch.setattr(
+                daemon, "client_fingerprint", lambda: {"profile": "other", "env": []}
+            )
+            assert run(["aws"], path)[0] is None
+
+    @pytest.mark.parametrize(
+        "name, value",
+        [("AWS_PROFILE", "other"), ("AWS_DEFAULT_REGION", "us-east-1"), ("OKTA_USERNAME", "x")],
+    )
+    def test_different_aws_environment_falls_back(self, server, monkeypatch, name, value):
+        """Test that a client with other AWS or Okta settings runs locally."""
+        fingerprint = daemon.client_fingerprint()
+        monkeypatch.setitem(
+            fingerprint, "environ", sorted([*fingerprint["environ"], [name, value]])
+        )
+        with server() as (_, path):
+            monkeypatch.setattr(daemon, "client_fingerprint", lambda: fingerprint)
+            assert run(["aws"], path)[0] is None
+
+    def test_different_working_directory_falls_back(self, server, monkeypatch, tmp_path):
+        """Test that a client in another directory runs locally."""
+        fingerprint = {**daemon.client_fingerprint(), "cwd": str(tmp_path)}
+        with server() as (_, path):
+            monkeypatch.setattr(daemon, "client_fingerprint", lambda: fingerprint)
+            assert run(["aws"], path)[0] is None
+
+    def test_shutdown(self, server):
+        """Test that shutdown stops serving requests."""
+        with server() as (srv, path):
+            assert daemon.request({"op": "shutdown"}, path) == {"ok": True}
+            time.sleep(0.2)
+            srv.server_close()
+            assert daemon.request({"op": "ping"}, path) is None
+
+
+def test_idle_daemon_shuts_down(tmp_path):
+    """Test that the daemon exits after the idle timeout."""
+    srv = daemon.make_server(str(tmp_path / "daemon.sock"), idle_timeout=0.1)
+    thread = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05})
+    thread.start()
+    thread.join(timeout=5)
+    srv.server_close()
+    assert not thread.is_alive()
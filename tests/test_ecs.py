@@ -0,0 +1,441 @@
+"""Tests for lizzy.helpers.ecs module."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from lizzy.helpers.ecs import (
+    ServiceRecord,
+    call_with_retry,
+    chunked,
+    deployment_state,
+    describe_services,
+    force_redeploy_services,
+    plan_restart,
+    replacement_rounds,
+    restart_in_waves,
+    select_records,
+    wait_for_stable,
+    watch_services,
+)
+
+
+def client_error(code: str, operation: str = "UpdateService") -> ClientError:
+    """Build a botocore ClientError with the given error code."""
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+
+def ecs_with_services(names: list) -> MagicMock:
+    """Return an ECS client mock that knows the given services."""
+    ecs = MagicMock()
+    ecs.describe_services.side_effect = lambda cluster, services: {
+        "services": [
+            {"serviceName": s.rsplit("/", 1)[-1], "taskDefinition": f"td-{s}"}
+            for s in services
+            if s.rsplit("/", 1)[-1] in names
+        ]
+    }
+    return ecs
+
+
+class TestCallWithRetry:
+    """Test call_with_retry function."""
+
+    def test_retries_throttled_calls(self):
+        """Test that throttling errors are retried with a jittered sleep."""
+        operation = MagicMock(side_effect=[client_error("ThrottlingException"), "ok"])
+        sleep = MagicMock()
+
+        assert call_with_retry(operation, sleep=sleep, cluster="c") == ("ok", 2)
+        operation.assert_called_with(cluster="c")
+        assert 0 <= sleep.call_args[0][0] <= 0.5
+
+    def test_raises_other_errors_immediately(self):
+        """Test that non-throttling errors are not retried."""
+        operation = MagicMock(side_effect=client_error("ServiceNotFoundException"))
+
+        with pytest.raises(ClientError):
+            call_with_retry(operation, sleep=MagicMock())
+        assert operation.call_count == 1
+
+    def test_gives_up_after_max_attempts(self):
+        """Test that persistent throttling is eventually raised."""
+        operation = MagicMock(side_effect=client_error("Throttling"))
+
+        with pytest.raises(ClientError):
+            call_with_retry(operation, max_attempts=3, sleep=MagicMock())
+        assert operation.call_count == 3
+
+
+class TestDescribeServices:
+    """Test describe_services function."""
+
+    def test_batches_in_groups_of_ten(self):
+        """Test that at most ten services are described per call."""
+        names = [f"svc-{i}" for i in range(25)]
+        ecs = ecs_with_services(names)
+
+        described = describe_services(ecs, "cluster-1", names)
+
+        batch_sizes = [len(c.kwargs["services"]) for c in ecs.describe_services.call_args_list]
+        assert batch_sizes == [10, 10, 5]
+        assert set(described) == set(names)
+
+    def test_chunked_keeps_order(self):
+        """Test that chunked yields consecutive slices."""
+        assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+
+class TestForceRedeployServices:
+    """Test force_redeploy_services function."""
+
+    def test_redeploys_every_service_with_its_task_definition(self):
+        """Test that each service is updated once with forceNewDeployment."""
+        arns = [f"arn:aws:ecs:eu-west-1:1:service/cluster-1/svc-{i}" for i in range(12)]
+        ecs = ecs_with_services([a.rsplit("/", 1)[-1] for a in arns])
+        progress = MagicMock()
+
+        results = force_redeploy_services(ecs, "cluster-1", arns, max_workers=4, progress=progress)
+
+        assert [r.service for r in results] == arns
+        assert all(r.ok for r in results)
+        assert ecs.update_service.call_count == 12
+        ecs.update_service.assert_any_call(
+            cluster="cluster-1",
+            service=arns[0],
+            taskDefinition=f"td-{arns[0]}",
+            forceNewDeployment=True,
+        )
+        assert [c.args[1] for c in progress.call_args_list] == list(range(1, 13))
+
+    def test_reports_missing_and_failing_services(self):
+        """Test that failures are reported per service without stopping the rest."""
+        ecs = ecs_with_services(["svc-ok", "svc-broken"])
+
+        def update_service(service, **kwargs):
+            if service == "svc-broken":
+                raise client_error("InvalidParameterException")
+
+        ecs.update_service.side_effect = update_service
+
+        results = force_redeploy_services(
+            ecs, "cluster-1", ["svc-ok", "svc-broken", "svc-gone"], sleep=MagicMock()
+        )
+
+        assert [(r.service, r.ok) for r in results] == [
+            ("svc-ok", True),
+            ("svc-broken", False),
+            ("svc-gone", False),
+        ]
+        assert results[2].error == "service not found"
+
+    def test_describe_failure_fails_every_service(self):
+        """Test that a failing describe call is reported for each service."""
+        ecs = MagicMock()
+        ecs.describe_services.side_effect = client_error("AccessDeniedException")
+
+        results = force_redeploy_services(ecs, "cluster-1", ["a", "b"])
+
+        assert [r.ok for r in results] == [False, False]
+        ecs.update_service.assert_not_called()
+
+
+def described(name: str, deployments: int = 1, running: int = 2, rollout: str = None) -> dict:
+    """Build a describe_services entry with the given deployment state."""
+    return {
+        "serviceName": name,
+        "taskDefinition": f"td-{name}",
+        "desiredCount": 2,
+        "runningCount": running,
+        "deployments": [
+            {"rolloutState": rollout} if rollout else {} for _ in range(deployments)
+        ],
+    }
+
+
+class FakeClock:
+    """Monotonic clock advanced by the sleep calls it is paired with."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestWaitForStable:
+    """Test deployment_state and wait_for_stable functions."""
+
+    def test_deployment_state(self):
+        """Test stable, pending and failed classification."""
+        assert deployment_state(described("a")) == "stable"
+        assert deployment_state(described("a", deployments=2)) == "pending"
+        assert deployment_state(described("a", running=1)) == "pending"
+        assert deployment_state(described("a", rollout="FAILED")) == "failed"
+
+    def test_polls_until_stable(self):
+        """Test that only pending services are described again."""
+        ecs = MagicMock()
+        ecs.describe_services.side_effect = [
+            {"services": [described("a"), described("b", deployments=2)]},
+            {"services": [described("b")]},
+        ]
+        clock = FakeClock()
+
+        states = wait_for_stable(
+            ecs, "c", ["a", "b"], poll_interval=5, sleep=clock.sleep, clock=clock
+        )
+
+        assert states == {"a": "stable", "b": "stable"}
+        assert ecs.describe_services.call_args.kwargs["services"] == ["b"]
+        assert clock.now == 5
+
+    def test_times_out(self):
+        """Test that services still rolling out at the deadline time out."""
+        ecs = MagicMock()
+        ecs.describe_services.return_value = {"services": [described("a", deployments=2)]}
+        clock = FakeClock()
+
+        states = wait_for_stable(
+            ecs, "c", ["a", "gone"], timeout=30, poll_interval=10,
+            sleep=clock.sleep, clock=clock,
+        )
+
+        assert states == {"a": "timeout", "gone": "missing"}
+        assert ecs.describe_services.call_count == 4
+
+
+class TestRestartInWaves:
+    """Test restart_in_waves function."""
+
+    def test_restarts_wave_by_wave(self):
+        """Test that each wave is redeployed and waited for before the next."""
+        ecs = MagicMock()
+        ecs.describe_services.side_effect = lambda cluster, services: {
+            "services": [described(s) for s in services]
+        }
+        clock = FakeClock()
+        waves = []
+
+        report = restart_in_waves(
+            ecs, "c", ["a", "b", "c"], wave_size=2, max_workers=2,
+            wave_progress=lambda *args: waves.append(args[:2]),
+            sleep=clock.sleep, clock=clock,
+        )
+
+        assert [r.service for r in report.results] == ["a", "b", "c"]
+        assert report.stable == 3 and report.waves == 2 and not report.aborted
+        assert waves == [(1, 2), (2, 2)]
+        assert ecs.update_service.call_count == 3
+
+    def test_aborts_after_failed_wave(self):
+        """Test that later waves are skipped once a wave fails."""
+        ecs = MagicMock()
+        ecs.describe_services.side_effect = lambda cluster, services: {
+            "services": [
+                described(s, rollout="FAILED" if s == "b" else None) for s in services
+            ]
+        }
+        clock = FakeClock()
+
+        report = restart_in_waves(
+            ecs, "c", ["a", "b", "c"], wave_size=2, sleep=clock.sleep, clock=clock
+        )
+
+        assert report.aborted
+        assert [r.ok for r in report.results] == [True, False, False]
+        assert report.results[1].error == "deployment failed"
+        assert report.results[2].attempts == 0
+        assert ecs.update_service.call_count == 2
+
+    def test_continue_on_failure(self):
+        """Test that abort_on_failure=False runs every wave."""
+        ecs = MagicMock()
+        ecs.describe_services.side_effect = lambda cluster, services: {
+            "services": [
+                described(s, rollout="FAILED" if s == "a" else None) for s in services
+            ]
+        }
+        clock = FakeClock()
+
+        report = restart_in_waves(
+            ecs, "c", ["a", "b"], wave_size=1, abort_on_failure=False,
+            sleep=clock.sleep, clock=clock,
+        )
+
+        assert not report.aborted
+        assert [r.ok for r in report.results] == [False, True]
+
+
+class TestServiceRecord:
+    """Test ServiceRecord and select_records."""
+
+    def test_from_description_maps_capacity_providers_to_fargate(self):
+        """Test that FARGATE_SPOT capacity provider services count as Fargate."""
+        record = ServiceRecord.from_description(
+            {
+                "serviceName": "api",
+                "capacityProviderStrategy": [
+                    {"capacityProvider": "FARGATE"},
+                    {"capacityProvider": "FARGATE_SPOT"},
+                ],
+                "taskDefinition": "arn:aws:ecs:eu-west-1:1:task-definition/api-web:3",
+            }
+        )
+
+        assert record.launch_type == "FARGATE"
+        assert record.family == "api-web"
+
+    def test_select_records_by_status_and_family(self):
+        """Test that inactive services and other families are dropped."""
+        records = [
+            ServiceRecord("a", "a", "c", "FARGATE", "ACTIVE", "td/api:1"),
+            ServiceRecord("b", "b", "c", "FARGATE", "DRAINING", "td/api:1"),
+            ServiceRecord("c", "c", "c", "FARGATE", "ACTIVE", "td/worker:1"),
+        ]
+
+        assert [r.arn for r in select_records(records)] == ["a", "c"]
+        assert [r.arn for r in select_records(records, families=("api*",))] == ["a"]
+
+    def test_force_redeploy_with_known_task_definitions_skips_describe(self):
+        """Test that known task definitions avoid describe_services calls."""
+        ecs = MagicMock()
+
+        results = force_redeploy_services(
+            ecs, "c", ["a", "b"], task_definitions={"a": "td:1"}
+        )
+
+        ecs.describe_services.assert_not_called()
+        assert [r.ok for r in results] == [True, False]
+        ecs.update_service.assert_called_once_with(
+            cluster="c", service="a", taskDefinition="td:1", forceNewDeployment=True
+        )
+
+
+class TestPlanRestart:
+    """Test replacement_rounds and plan_restart functions."""
+
+    def test_replacement_rounds_follow_the_deployment_configuration(self):
+        """Test rolling steps for common min healthy / max percent settings."""
+        assert replacement_rounds(4, 100, 200) == 1
+        assert replacement_rounds(4, 50, 100) == 2
+        assert replacement_rounds(3, 100, 150) == 3
+        assert replacement_rounds(0, 100, 200) == 0
+        assert replacement_rounds(2, 100, 100) is None
+
+    def test_plan_concurrent_restart(self):
+        """Test that concurrent restarts take as long as the slowest service."""
+        records = [
+            ServiceRecord("a", "a", "c", desired=4),
+            ServiceRecord("b", "b", "c", desired=4, min_healthy_percent=50, max_percent=100),
+            ServiceRecord("d", "d", "c", desired=2, max_percent=100),
+        ]
+
+        plan = plan_restart(records, round_seconds=60)
+
+        assert plan.tasks == 10
+        assert plan.seconds == 120
+        assert [p.blocked for p in plan.services] == [False, False, True]
+        assert plan.api_calls == {"describe_services": 1, "update_service": 3}
+
+    def test_plan_waves_add_up_and_budget_polls(self):
+        """Test that waves run one after the other and poll for stability."""
+        records = [ServiceRecord(str(i), str(i), "c", desired=2) for i in range(3)]
+
+        plan = plan_restart(records, wave_size=2, round_seconds=60, poll_interval=15)
+
+        assert plan.waves == 2
+        assert plan.seconds == 120
+        assert plan.api_calls == {"describe_services": 1 + 5 + 5, "update_service": 3}
+
+
+def watched(name: str, running: int, deployments: int = 2, events=()) -> dict:
+    """Build a described service mid-deployment with the given events (newest first)."""
+    return {
+        "serviceName": name,
+        "desiredCount": 2,
+        "runningCount": running,
+        "pendingCount": 2 - running,
+        "deployments": [{"status": "PRIMARY"}] + [{"status": "ACTIVE"}] * (deployments - 1),
+        "events": [{"id": event, "message": event} for event in events],
+    }
+
+
+class TestWatchServices:
+    """Test watch_services function."""
+
+    def test_reports_changes_and_new_events_until_stable(self):
+        """Test that only changes and events logged while watching are reported."""
+        ecs = MagicMock()
+        ecs.describe_services.side_effect = [
+            {"services": [watched("a", 0, events=["e2", "e1"])]},
+            {"services": [watched("a", 0, events=["e2", "e1"])]},
+            {"services": [watched("a", 2, deployments=1, events=["e4", "e3", "e2", "e1"])]},
+        ]
+        clock = FakeClock()
+        changes = []
+
+        statuses = watch_services(
+            ecs, "c", ["a"], lambda *change: changes.append(change),
+            interval=4, sleep=clock.sleep, clock=clock,
+        )
+
+        assert statuses["a"]["state"] == "stable"
+        assert [(c[1]["running"], [e["id"] for e in c[2]]) for c in changes] == [
+            (0, []),
+            (2, ["e3", "e4"]),
+        ]
+        # Quiet polls back off by half: 4s after the change, then 6s.
+        assert clock.now == 10
+
+    def test_reports_the_first_event_of_a_service_without_history(self):
+        """Test that a service with no events at the start reports its first one."""
+        ecs = MagicMock()
+        ecs.describe_services.side_effect = [
+            {"services": [watched("a", 0)]},
+            {"services": [watched("a", 1, events=["e1"])]},
+            {"services": [watched("a", 2, deployments=1, events=["e2", "e1"])]},
+        ]
+        clock = FakeClock()
+        changes = []
+
+        watch_services(
+            ecs, "c", ["a"], lambda *change: changes.append(change),
+            interval=4, sleep=clock.sleep, clock=clock,
+        )
+
+        assert [(c[1]["running"], [e["id"] for e in c[2]]) for c in changes] == [
+            (0, []),
+            (1, ["e1"]),
+            (2, ["e2"]),
+        ]
+
+    def test_batches_many_services_per_poll(self):
+        """Test that hundreds of services cost one call per ten per poll."""
+        names = [f"s{i}" for i in range(250)]
+        ecs = MagicMock()
+        ecs.describe_services.side_effect = lambda cluster, services: {
+            "services": [watched(s, 2, deployments=1) for s in services]
+        }
+
+        watch_services(ecs, "c", names, lambda *change: None, sleep=MagicMock())
+
+        assert ecs.describe_services.call_count == 25
+
+    def test_stops_at_timeout(self):
+        """Test that watching a stuck deployment ends at the timeout."""
+        ecs = MagicMock()
+        ecs.describe_services.return_value = {"services": [watched("a", 1)]}
+        clock = FakeClock()
+
+        statuses = watch_services(
+            ecs, "c", ["a"], lambda *change: None,
+            interval=5, max_interval=20, timeout=60, sleep=clock.sleep, clock=clock,
+        )
+
+        assert statuses["a"]["state"] == "pending"
+        assert clock.now == 60
@@ -1,37 +1,92 @@
 """Tests for lizzy.helpers.gitlab module."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
+import click
 import pytest
+import requests
 
+from lizzy.helpers.config import ConfigError
 from lizzy.helpers.gitlab import (
+    DEFAULT_MAX_RETRIES,
+    GitlabClientFactory,
+    GitlabRetry,
+    GraphQLError,
+    RateLimiter,
+    cleanup_merged_branches,
     develop_to_main,
     fetch_approved_merge_requests,
+    get_client_factory,
+    graphql_merge_candidates,
     main_to_develop,
     remove_merged_branches,
+    scan_group_merge_requests,
+    scan_projects,
     setup_gitlab,
 )
 
 
+@pytest.fixture(autouse=True)
+def default_int_settings():
+    """Serve the defaults of integer GitLab settings; tests patch get_setting only."""
+    with patch(
+        "lizzy.helpers.gitlab.get_int", side_effect=lambda setting, default: default
+    ) as mock_get_int:
+        yield mock_get_int
+
+
 class TestSetupGitlab:
     """Test setup_gitlab function."""
 
+    @patch("lizzy.helpers.gitlab.get_client_factory")
     @patch("lizzy.helpers.gitlab.get_setting")
     @patch("lizzy.helpers.gitlab.gitlab.Gitlab")
-    def test_setup_gitlab_returns_gitlab_instance(self, mock_gitlab, mock_get_setting):
+    def test_setup_gitlab_returns_gitlab_instance(
+        self, mock_gitlab, mock_get_setting, mock_get_client_factory
+    ):
         """Test that setup_gitlab returns a configured GitLab instance."""
-        mock_get_setting.return_value = "test_token_123"
+        mock_get_setting.side_effect = lambda key: {"gitlab.api_token": "test_token_123"}.get(key)
+        mock_get_client_factory.return_value = GitlabClientFactory()
         mock_gl_instance = MagicMock()
         mock_gitlab.return_value = mock_gl_instance
 
         result = setup_gitlab()
 
         assert result == mock_gl_instance
-        mock_get_setting.assert_called_once_with("gitlab.api_token")
+        mock_get_setting.assert_any_call("gitlab.api_token")
         mock_gitlab.assert_called_once_with(
-            "https://gitlab.com", private_token="test_token_123"
+            "https://gitlab.com", private_token="test_token_123", session=ANY
         )
 
+    @patch("lizzy.helpers.gitlab.get_client_factory")
+    @patch("lizzy.helpers.gitlab.get_setting")
+    def test_setup_gitlab_reuses_one_client(self, mock_get_setting, mock_get_client_factory):
+        """Test that the client is shared and its pool grows with the workers."""
+        mock_get_setting.side_effect = lambda key: {
+            "gitlab.api_token": "test_token_123",
+            "gitlab.url": "https://gitlab.example.com",
+        }.get(key)
+        mock_get_client_factory.return_value = GitlabClientFactory()
+
+        first = setup_gitlab()
+        second = setup_gitlab(workers=32)
+
+        assert first is second
+        assert first.url == "https://gitlab.example.com"
+        adapter = first.session.get_adapter("https://gitlab.example.com/api/v4")
+        assert adapter._pool_maxsize == 32
+        assert adapter.max_retries.status_forcelist == (429, 502, 503)
+
+    @patch("lizzy.helpers.gitlab.get_int", return_value=0)
+    def test_zero_retries_disables_retrying(self, mock_get_int, monkeypatch):
+        """Test that gitlab.max_retries is read as an int, so 0 is kept."""
+        monkeypatch.setattr("lizzy.helpers.gitlab._client_factory", None)
+
+        factory = get_client_factory()
+
+        mock_get_int.assert_called_once_with("gitlab.max_retries", DEFAULT_MAX_RETRIES)
+        assert factory.max_retries == 0
+
     @patch("lizzy.helpers.gitlab.get_setting")
     def test_setup_gitlab_raises_error_when_token_missing(self, mock_get_setting):
         """Test that setup_gitlab raises ValueError when API token is missing."""
@@ -48,9 +103,9 @@ class TestDevelopToMain:
 
     @patch("lizzy.helpers.gitlab.get_setting")
     @patch("lizzy.helpers.gitlab.setup_gitlab")
-    @patch("builtins.print")
+    @patch("click.echo")
     def test_develop_to_main_creates_merge_requests(
-        self, mock_print, mock_setup_gitlab, mock_get_setting
+        self, mock_echo, mock_setup_gitlab, mock_get_setting
     ):
         """Test that develop_to_main creates merge requests for all components."""
         components = [
@@ -90,9 +145,9 @@ class TestDevelopToMain:
 
     @patch("lizzy.helpers.gitlab.get_setting")
     @patch("lizzy.helpers.gitlab.setup_gitlab")
-    @patch("builtins.print")
+    @patch("click.echo")
     def test_develop_to_main_handles_errors(
-        self, mock_print, mock_setup_gitlab, mock_get_setting
+        self, mock_echo, mock_setup_gitlab, mock_get_setting
     ):
         """Test that develop_to_main handles errors gracefully."""
         components = [
@@ -111,7 +166,7 @@ class TestDevelopToMain:
         develop_to_main()
 
         # Verify error was printed
-        error_calls = [c for c in mock_print.call_args_list if "Failed" in str(c)]
+        error_calls = [c for c in mock_echo.call_args_list if "Failed" in str(c)]
         assert len(error_calls) > 0
 
     @patch("lizzy.helpers.gitlab.get_setting")
@@ -130,14 +185,32 @@ class TestDevelopToMain:
         mock_gl.projects.get.assert_not_called()
 
 
+    @patch("lizzy.helpers.gitlab.get_setting")
+    @patch("lizzy.helpers.gitlab.setup_gitlab")
+    def test_develop_to_main_rejects_invalid_components_up_front(
+        self, mock_setup_gitlab, mock_get_setting
+    ):
+        """Test that schema errors are raised before any GitLab call."""
+        mock_get_setting.return_value = [
+            {"name": "component1", "project_name_with_namespace": "group/project1"},
+            {"name": "component2"},
+        ]
+
+        with pytest.raises(ConfigError) as exc_info:
+            develop_to_main()
+
+        assert "component2" in str(exc_info.value)
+        mock_setup_gitlab.assert_not_called()
+
+
 class TestMainToDevelop:
     """Test main_to_develop function."""
 
     @patch("lizzy.helpers.gitlab.get_setting")
     @patch("lizzy.helpers.gitlab.setup_gitlab")
-    @patch("builtins.print")
+    @patch("click.echo")
     def test_main_to_develop_creates_merge_requests(
-        self, mock_print, mock_setup_gitlab, mock_get_setting
+        self, mock_echo, mock_setup_gitlab, mock_get_setting
     ):
         """Test that main_to_develop creates merge requests for all components."""
         components = [
@@ -176,7 +249,9 @@ class TestRemoveMergedBranches:
         self, mock_echo, mock_setup_gitlab, mock_get_setting
     ):
         """Test that remove_merged_branches deletes merged branches."""
-        mock_get_setting.return_value = "group_id_123"
+        mock_get_setting.side_effect = lambda key: {
+            "gitlab.approval_group_id": "group_id_123",
+        }.get(key)
 
         mock_gl = MagicMock()
         mock_setup_gitlab.return_value = mock_gl
@@ -223,7 +298,9 @@ class TestRemoveMergedBranches:
         self, mock_echo, mock_setup_gitlab, mock_get_setting
     ):
         """Test that remove_merged_branches handles deletion errors gracefully."""
-        mock_get_setting.return_value = "group_id_123"
+        mock_get_setting.side_effect = lambda key: {
+            "gitlab.approval_group_id": "group_id_123",
+        }.get(key)
 
         mock_gl = MagicMock()
         mock_setup_gitlab.return_value = mock_gl
@@ -249,6 +326,118 @@ class TestRemoveMergedBranches:
         error_calls = [c for c in mock_echo.call_args_list if "Failed" in str(c)]
         assert len(error_calls) > 0
 
+    @staticmethod
+    def branches(*specs) -> list:
+        """Return branches from ``(name, merged, protected, default)`` tuples."""
+        branches = []
+        for name, merged, protected, default in specs:
+            branch = MagicMock(merged=merged, protected=protected, default=default)
+            branch.name = name
+            branches.append(branch)
+        return branches
+
+    def cleanup(self, gl, branches, **kwargs):
+        project = MagicMock(id=1)
+        project.name = "Test Project"
+        gl.projects.get.return_value.branches.list.return_value = branches
+        (cleanup,) = cleanup_merged_branches(gl, [project], **kwargs)
+        return cleanup
+
+    def test_bulk_delete_when_gitlab_would_remove_the_same_branches(self):
+        """Test that one delete_merged_branches call replaces per-branch deletes."""
+        gl = MagicMock()
+        cleanup = self.cleanup(
+            gl,
+            self.branches(
+                ("main", False, True, True),
+                ("feature/a", True, False, False),
+                ("feature/b", True, False, False),
+            ),
+        )
+
+        proj = gl.projects.get.return_value
+        proj.delete_merged_branches.assert_called_once_with()
+        proj.branches.delete.assert_not_called()
+        assert cleanup.bulk
+        assert cleanup.deleted == ["feature/a", "feature/b"]
+
+    def test_rechecks_branches_right_before_the_bulk_delete(self):
+        """Test that a branch merged after planning turns the bulk into single deletes."""
+        gl = MagicMock()
+        planned = self.branches(("feature/a", True, False, False))
+        current = self.branches(
+            ("feature/a", True, False, False), ("release/1.0", True, False, False)
+        )
+        project = MagicMock(id=1)
+        project.name = "Test Project"
+        proj = gl.projects.get.return_value
+        proj.branches.list.side_effect = [planned, current]
+
+        (cleanup,) = cleanup_merged_branches(gl, [project], protected=("release/*",))
+
+        proj.delete_merged_branches.assert_not_called()
+        proj.branches.delete.assert_called_once_with("feature/a")
+        assert cleanup.deleted == ["feature/a"]
+        assert not cleanup.bulk
+
+    def test_falls_back_when_a_kept_branch_is_unprotected_in_gitlab(self):
+        """Test that a merged branch matching a pattern blocks the bulk delete."""
+        gl = MagicMock()
+        cleanup = self.cleanup(
+            gl,
+            self.branches(
+                ("release/1.0", True, False, False),
+                ("feature/a", True, False, False),
+            ),
+            protected=("main", "release/*"),
+        )
+
+        proj = gl.projects.get.return_value
+        proj.delete_merged_branches.assert_not_called()
+        proj.branches.delete.assert_called_once_with("feature/a")
+        assert cleanup.kept == ["release/1.0"]
+        assert not cleanup.bulk
+
+    def test_dry_run_only_lists(self):
+        """Test that a dry run counts merged branches without deleting."""
+        gl = MagicMock()
+        cleanup = self.cleanup(
+            gl,
+            self.branches(("feature/a", True, False, False), ("feature/b", False, False, False)),
+            dry_run=True,
+        )
+
+        proj = gl.projects.get.return_value
+        proj.delete_merged_branches.assert_not_called()
+        proj.branches.delete.assert_not_called()
+        assert cleanup.merged == ["feature/a"]
+        assert cleanup.deleted == []
+
+    @patch("lizzy.helpers.gitlab.get_setting")
+    @patch("lizzy.helpers.gitlab.setup_gitlab")
+    @patch("click.echo")
+    def test_summary_per_project(self, mock_echo, mock_setup_gitlab, mock_get_setting):
+        """Test that a summary line is printed per project and in total."""
+        mock_get_setting.side_effect = lambda key: {
+            "gitlab.approval_group_id": "group_id_123",
+        }.get(key)
+        gl = mock_setup_gitlab.return_value
+        projects = []
+        for name in ("p1", "p2"):
+            project = MagicMock()
+            project.name = name
+            projects.append(project)
+        gl.groups.get.return_value.projects.list.return_value = projects
+        gl.projects.get.return_value.branches.list.return_value = self.branches(
+            ("feature/a", True, True, False)
+        )
+
+        remove_merged_branches(dry_run=True, protect=("hotfix/*",))
+
+        mock_echo.assert_any_call("p1: 1 merged branches would be removed, 0 kept")
+        mock_echo.assert_any_call("p2: 1 merged branches would be removed, 0 kept")
+        mock_echo.assert_any_call("Dry run: 2 merged branches would be removed in 2 projects.")
+
 
 class TestFetchApprovedMergeRequests:
     """Test fetch_approved_merge_requests function."""
@@ -256,9 +445,9 @@ class TestFetchApprovedMergeRequests:
     @patch("lizzy.helpers.gitlab.get_setting")
     @patch("lizzy.helpers.gitlab.setup_gitlab")
     @patch("click.echo")
-    @patch("builtins.input")
+    @patch("lizzy.helpers.gitlab.output.confirm")
     def test_fetch_approved_merge_requests_merges_on_confirmation(
-        self, mock_input, mock_echo, mock_setup_gitlab, mock_get_setting
+        self, mock_confirm, mock_echo, mock_setup_gitlab, mock_get_setting
     ):
         """Test that fetch_approved_merge_requests merges on user confirmation."""
         mock_get_setting.side_effect = lambda key: {
@@ -299,7 +488,7 @@ class TestFetchApprovedMergeRequests:
         mock_approvals.approved_by = [{"user": {"username": "approver"}}]
         mock_mr_detail.approvals.get.return_value = mock_approvals
 
-        mock_input.return_value = "y"
+        mock_confirm.return_value = True
 
         fetch_approved_merge_requests(yolo=False)
 
@@ -351,6 +540,32 @@ class TestFetchApprovedMergeRequests:
 
         mock_mr_detail.merge.assert_called_once()
 
+    @patch("lizzy.helpers.gitlab.get_setting")
+    @patch("lizzy.helpers.gitlab.setup_gitlab")
+    @patch("click.echo")
+    def test_yolo_merge_failure_does_not_stop_the_run(
+        self, mock_echo, mock_setup_gitlab, mock_get_setting
+    ):
+        """Test that a failed auto-merge is reported and the next MR still merges."""
+        mock_get_setting.side_effect = lambda key: {
+            "gitlab.approval_group_id": "group_123",
+            "gitlab.username": "testuser",
+        }.get(key)
+        gl, registry = mock_setup_gitlab.return_value, {}
+        gl.projects.get.side_effect = registry.__getitem__
+        gl.groups.get.return_value.projects.list.return_value = [
+            project_with_mrs(registry, 1, "p1", [1]),
+            project_with_mrs(registry, 2, "p2", [1]),
+        ]
+        failing = registry[1].mergerequests.get.return_value
+        failing.merge.side_effect = Exception("405: Method Not Allowed")
+
+        fetch_approved_merge_requests(yolo=True)
+
+        mock_echo.assert_any_call("Failed to merge MR p1 !1: 405: Method Not Allowed")
+        registry[2].mergerequests.get.return_value.merge.assert_called_once()
+        mock_echo.assert_any_call("Merged MR: p2 !1")
+
     @patch("lizzy.helpers.gitlab.get_setting")
     @patch("lizzy.helpers.gitlab.setup_gitlab")
     @patch("click.echo")
@@ -392,3 +607,307 @@ class TestFetchApprovedMergeRequests:
         fetch_approved_merge_requests(yolo=True)
 
         mock_mr_detail.merge.assert_not_called()
+
+
+def project_with_mrs(registry: dict, project_id: int, name: str, mrs: list) -> MagicMock:
+    """Register a project whose open MRs are approved, green and by ``testuser``."""
+    project = MagicMock(id=project_id)
+    project.name = name
+    proj = MagicMock()
+    proj.mergerequests.list.return_value = [
+        MagicMock(
+            iid=iid,
+            title=f"{name} !{iid}",
+            web_url=f"https://gitlab.com/{name}/-/merge_requests/{iid}",
+            author={"username": "testuser"},
+        )
+        for iid in mrs
+    ]
+    detail = proj.mergerequests.get.return_value
+    detail.pipelines.list.return_value = [MagicMock(status="success")]
+    detail.approvals.get.return_value.approved_by = [{"user": {"username": "approver"}}]
+    registry[project_id] = proj
+    return project
+
+
+class TestScanProjects:
+    """Test the concurrent merge request scanner."""
+
+    @patch("click.echo")
+    def test_candidates_and_messages_keep_project_order(self, mock_echo):
+        """Test that results do not depend on which scan finishes first."""
+        gl, registry = MagicMock(), {}
+        gl.projects.get.side_effect = registry.__getitem__
+        projects = [project_with_mrs(registry, i, f"p{i}", [i * 10, i * 10 + 1]) for i in range(20)]
+
+        candidates = scan_projects(gl, projects, "testuser", concurrency=8)
+
+        assert [c.iid for c in candidates] == [i * 10 + j for i in range(20) for j in (0, 1)]
+        found = [c.args[0] for c in mock_echo.call_args_list if c.args[0].startswith("Found project")]
+        assert found == [f"Found project: p{i}, scanning for approved MRs..." for i in range(20)]
+
+    @patch("click.echo")
+    def test_project_errors_do_not_stop_the_scan(self, mock_echo):
+        """Test that a failing project is reported and the others are scanned."""
+        gl, registry = MagicMock(), {}
+        gl.projects.get.side_effect = registry.__getitem__
+        projects = [project_with_mrs(registry, 1, "ok", [1])]
+        broken = MagicMock(id=2)
+        broken.name = "broken"
+        projects.append(broken)
+
+        candidates = scan_projects(gl, projects, "testuser")
+
+        assert [c.project for c in candidates] == ["ok"]
+        mock_echo.assert_any_call("Error processing project broken: 2")
+
+
+class TestScanGroupMergeRequests:
+    """Test the group-level merge request query."""
+
+    @staticmethod
+    def group_with_mrs(registry: dict, mrs: list) -> MagicMock:
+        """Return a group listing ``(project_id, path, iid)`` MRs by ``testuser``."""
+        group = MagicMock()
+        group.mergerequests.list.return_value = [
+            MagicMock(
+                project_id=project_id,
+                iid=iid,
+                title=f"{path} !{iid}",
+                web_url=f"https://gitlab.com/{path}/-/merge_requests/{iid}",
+                author={"username": "testuser"},
+                references={"full": f"{path}!{iid}"},
+            )
+            for project_id, path, iid in mrs
+        ]
+        for project_id, path, _ in mrs:
+            if project_id not in registry:
+                project_with_mrs(registry, project_id, path, [])
+        return group
+
+    @patch("click.echo")
+    def test_one_listing_replaces_the_project_scan(self, mock_echo):
+        """Test that only the user's open MRs are listed and checked."""
+        gl, registry = MagicMock(), {}
+        gl.projects.get.side_effect = lambda project_id, lazy=False: registry[project_id]
+        group = self.group_with_mrs(
+            registry, [(2, "group/b", 5), (1, "group/a", 9), (1, "group/a", 3)]
+        )
+
+        candidates = scan_group_merge_requests(gl, group, "testuser", concurrency=4)
+
+        group.mergerequests.list.assert_called_once_with(
+            state="opened", author_username="testuser", all=True
+        )
+        group.projects.list.assert_not_called()
+        assert [(c.project, c.iid) for c in candidates] == [
+            ("group/a", 3),
+            ("group/a", 9),
+            ("group/b", 5),
+        ]
+        assert all(call.kwargs == {"lazy": True} for call in gl.projects.get.call_args_list)
+
+    @patch("click.echo")
+    def test_merge_request_errors_do_not_stop_the_scan(self, mock_echo):
+        """Test that a failing MR is reported and the others are checked."""
+        gl, registry = MagicMock(), {}
+        gl.projects.get.side_effect = lambda project_id, lazy=False: registry[project_id]
+        group = self.group_with_mrs(registry, [(1, "group/a", 1), (2, "group/b", 2)])
+        del registry[2]
+
+        candidates = scan_group_merge_requests(gl, group, "testuser")
+
+        assert [c.project for c in candidates] == ["group/a"]
+        mock_echo.assert_any_call("Error processing MR group/b !2: 2")
+
+    @patch("lizzy.helpers.gitlab.get_setting")
+    @patch("lizzy.helpers.gitlab.setup_gitlab")
+    @patch("click.echo")
+    def test_setting_selects_the_group_query(self, mock_echo, mock_setup_gitlab, mock_get_setting):
+        """Test that gitlab.merge_request_query switches to the group listing."""
+        mock_get_setting.side_effect = lambda key: {
+            "gitlab.approval_group_id": "group_123",
+            "gitlab.username": "testuser",
+            "gitlab.merge_request_query": "group",
+        }.get(key)
+        gl, registry = mock_setup_gitlab.return_value, {}
+        gl.projects.get.side_effect = lambda project_id, lazy=False: registry[project_id]
+        group = self.group_with_mrs(registry, [(1, "group/a", 1)])
+        gl.groups.get.return_value = group
+
+        fetch_approved_merge_requests(yolo=True)
+
+        group.projects.list.assert_not_called()
+        registry[1].mergerequests.get.return_value.merge.assert_called_once()
+
+    @patch("lizzy.helpers.gitlab.get_setting")
+    @patch("lizzy.helpers.gitlab.setup_gitlab")
+    def test_unknown_query_is_rejected(self, mock_setup_gitlab, mock_get_setting):
+        """Test that an unknown gitlab.merge_request_query is a usage error."""
+        mock_get_setting.side_effect = lambda key: {
+            "gitlab.merge_request_query": "everything",
+        }.get(key)
+
+        with pytest.raises(click.ClickException, match="merge_request_query"):
+            fetch_approved_merge_requests()
+
+
+def graphql_node(path: str, iid: int, status="SUCCESS", approvers=("approver",)) -> dict:
+    """Return a GraphQL merge request node by ``testuser``."""
+    return {
+        "iid": str(iid),
+        "title": f"{path} !{iid}",
+        "webUrl": f"https://gitlab.com/{path}/-/merge_requests/{iid}",
+        "project": {"fullPath": path},
+        "author": {"username": "testuser"},
+        "headPipeline": {"status": status} if status else None,
+        "approvedBy": {"nodes": [{"username": name} for name in approvers]},
+    }
+
+
+def graphql_page(nodes: list, cursor: str = None) -> MagicMock:
+    """Return a GraphQL response holding one page of merge requests."""
+    page = {
+        "pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor},
+        "nodes": nodes,
+    }
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"data": {"group": {"mergeRequests": page}}}
+    return response
+
+
+class TestGraphqlMergeCandidates:
+    """Test the GraphQL merge request backend."""
+
+    @patch("click.echo")
+    def test_pages_are_batched_and_filtered(self, mock_echo):
+        """Test that pipeline and approvals come from the batched pages."""
+        gl = MagicMock(url="https://gitlab.com", private_token="token")
+        gl.session.post.side_effect = [
+            graphql_page(
+                [
+                    graphql_node("group/b", 2),
+                    graphql_node("group/a", 7, status="FAILED"),
+                ],
+                cursor="c1",
+            ),
+            graphql_page(
+                [
+                    graphql_node("group/a", 3),
+                    graphql_node("group/a", 4, approvers=("testuser",)),
+                    graphql_node("group/c", 1, status=None),
+                ]
+            ),
+        ]
+
+        candidates = graphql_merge_candidates(gl, "group", "testuser")
+
+        assert [(c.project, c.iid, c.approver) for c in candidates] == [
+            ("group/a", 3, "approver"),
+            ("group/b", 2, "approver"),
+        ]
+        assert gl.session.post.call_count == 2
+        url = gl.session.post.call_args.args[0]
+        variables = gl.session.post.call_args.kwargs["json"]["variables"]
+        assert url == "https://gitlab.com/api/graphql"
+        assert variables["after"] == "c1"
+        mock_echo.assert_any_call("MR group/a !7 has failed jobs, skipping")
+        mock_echo.assert_any_call("No pipelines for MR group/c !1")
+        gl.projects.get.assert_any_call("group/a", lazy=True)
+
+    def test_graphql_errors_raise(self):
+        """Test that errors in the payload raise GraphQLError."""
+        gl = MagicMock(url="https://gitlab.com", private_token="token")
+        gl.session.post.return_value.status_code = 200
+        gl.session.post.return_value.json.return_value = {
+            "errors": [{"message": "Field 'approvedBy' doesn't exist"}]
+        }
+
+        with pytest.raises(GraphQLError, match="approvedBy"):
+            graphql_merge_candidates(gl, "group", "testuser")
+
+    def test_non_json_response_raises(self):
+        """Test that an HTML page instead of JSON raises GraphQLError."""
+        gl = MagicMock(url="https://gitlab.com", private_token="token")
+        gl.session.post.return_value.status_code = 200
+        gl.session.post.return_value.json.side_effect = ValueError("Expecting value")
+
+        with pytest.raises(GraphQLError, match="invalid JSON response"):
+            graphql_merge_candidates(gl, "group", "testuser")
+
+    @patch("lizzy.helpers.gitlab.get_setting")
+    @patch("lizzy.helpers.gitlab.setup_gitlab")
+    @patch("click.echo")
+    def test_falls_back_to_rest(self, mock_echo, mock_setup_gitlab, mock_get_setting):
+        """Test that a failing GraphQL API falls back to the REST scan."""
+        mock_get_setting.side_effect = lambda key: {
+            "gitlab.approval_group_id": "group_123",
+            "gitlab.username": "testuser",
+            "gitlab.backend": "graphql",
+        }.get(key)
+        gl, registry = mock_setup_gitlab.return_value, {}
+        gl.session.post.return_value.status_code = 404
+        gl.projects.get.side_effect = registry.__getitem__
+        gl.groups.get.return_value.projects.list.return_value = [
+            project_with_mrs(registry, 1, "p1", [1])
+        ]
+
+        fetch_approved_merge_requests(yolo=True)
+
+        mock_echo.assert_any_call("GraphQL query failed (HTTP 404), falling back to REST.")
+        registry[1].mergerequests.get.return_value.merge.assert_called_once()
+
+
+class TestGitlabRetry:
+    """Test the retry policy of the pooled session."""
+
+    def test_retries_only_idempotent_requests_on_bad_gateway(self):
+        """Test that 502/503 are retried for GET but not for POST."""
+        retry = GitlabRetry(total=3, status_forcelist=(429, 502, 503))
+
+        assert retry.is_retry("GET", 502)
+        assert retry.is_retry("GET", 503)
+        assert not retry.is_retry("POST", 502)
+        assert not retry.is_retry("GET", 500)
+
+    def test_retries_rate_limited_requests_of_any_method(self):
+        """Test that a 429 is retried, even for POST, until retries run out."""
+        assert GitlabRetry(total=3, status_forcelist=(429,)).is_retry("POST", 429)
+        assert not GitlabRetry(total=0, status_forcelist=(429,)).is_retry("POST", 429)
+
+
+class TestRateLimiter:
+    """Test the RateLimiter class."""
+
+    def test_pauses_until_reset_when_nearly_exhausted(self):
+        """Test that a low RateLimit-Remaining pauses workers until the reset."""
+        sleep = MagicMock()
+        limiter = RateLimiter(reserve=10, clock=lambda: 1000.0, sleep=sleep)
+
+        limiter.observe(MagicMock(status_code=200, headers={"RateLimit-Remaining": "50", "RateLimit-Reset": "1060"}))
+        limiter.wait()
+        sleep.assert_not_called()
+
+        limiter.observe(MagicMock(status_code=200, headers={"RateLimit-Remaining": "3", "RateLimit-Reset": "1060"}))
+        limiter.wait()
+        sleep.assert_called_once_with(60.0)
+
+    def test_honours_retry_after(self):
+        """Test that a 429 pauses workers for Retry-After seconds."""
+        sleep = MagicMock()
+        limiter = RateLimiter(clock=lambda: 1000.0, sleep=sleep)
+
+        limiter.observe(MagicMock(status_code=429, headers={"Retry-After": "7"}))
+        limiter.wait()
+
+        sleep.assert_called_once_with(7.0)
+
+    def test_install_replaces_an_earlier_limiter(self):
+        """Test that the shared session keeps only the latest limiter's hook."""
+        gl = MagicMock(session=requests.Session())
+        first, second = RateLimiter(), RateLimiter()
+
+        first.install(gl)
+        second.install(gl)
+
+        assert gl.session.hooks["response"] == [second.observe]
@@ -0,0 +1,96 @@
+"""Tests for lizzy.helpers.inventory module."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from lizzy.helpers.ecs import ServiceRecord
+from lizzy.helpers.inventory import Inventory
+
+
+def fake_ecs(clusters: dict) -> MagicMock:
+    """Return an ECS client mock serving ``{cluster: {service: launch_type}}``."""
+    ecs = MagicMock()
+
+    def paginator(name):
+        pages = MagicMock()
+        if name == "list_clusters":
+            pages.paginate.return_value = [{"clusterArns": list(clusters)}]
+        else:
+            pages.paginate.side_effect = lambda cluster: [
+                {"serviceArns": [f"{cluster}/{s}" for s in clusters[cluster]]}
+            ]
+        return pages
+
+    ecs.get_paginator.side_effect = paginator
+    ecs.describe_services.side_effect = lambda cluster, services: {
+        "services": [
+            {
+                "serviceArn": s,
+                "serviceName": s.rsplit("/", 1)[-1],
+                "launchType": clusters[cluster][s.rsplit("/", 1)[-1]],
+                "status": "ACTIVE",
+                "taskDefinition": "td:1",
+                "desiredCount": 2,
+                "runningCount": 1,
+                "pendingCount": 1,
+            }
+            for s in services
+        ]
+    }
+    return ecs
+
+
+class Clock:
+    """Settable wall clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def inventory(tmp_path, clock):
+    """Return an inventory in a temporary directory."""
+    return Inventory(tmp_path / "cache" / "inventory.sqlite3", clock=clock)
+
+
+class TestInventory:
+    """Test the Inventory class."""
+
+    def test_refresh_stores_clusters_and_services(self, inventory):
+        """Test that a refresh snapshots every cluster and described service."""
+        ecs = fake_ecs({"arn/main": {"api": "FARGATE", "legacy": "EC2"}, "arn/batch": {"job": "FARGATE"}})
+
+        assert inventory.refresh(ecs, "dev", "eu-west-1") == 3
+
+        assert inventory.services("dev", "eu-west-1", cluster="arn/main") == [
+            ServiceRecord("arn/main/api", "api", "arn/main", "FARGATE", "ACTIVE", "td:1", 2, 1, 1),
+            ServiceRecord("arn/main/legacy", "legacy", "arn/main", "EC2", "ACTIVE", "td:1", 2, 1, 1),
+        ]
+        assert [r.name for r in inventory.services("dev", "eu-west-1", launch_type="FARGATE")] == ["job", "api"]
+        assert [r.name for r in inventory.services("dev", "eu-west-1", patterns=("j*",))] == ["job"]
+        assert inventory.services("dev", "us-east-1") == []
+
+    def test_is_stale_honours_ttl(self, inventory, clock):
+        """Test that a scope is stale until refreshed and again after the TTL."""
+        assert inventory.is_stale("dev", ttl=60)
+        inventory.refresh(fake_ecs({"arn/main": {"api": "FARGATE"}}), "dev")
+        clock.now += 30
+        assert not inventory.is_stale("dev", ttl=60)
+        clock.now += 60
+        assert inventory.is_stale("dev", ttl=60)
+
+    def test_refresh_replaces_the_previous_snapshot(self, inventory):
+        """Test that services gone from AWS are dropped on refresh."""
+        inventory.refresh(fake_ecs({"arn/main": {"api": "FARGATE", "old": "FARGATE"}}), "dev")
+        inventory.refresh(fake_ecs({"arn/main": {"api": "FARGATE"}}), "dev")
+
+        assert [r.name for r in inventory.services("dev")] == ["api"]
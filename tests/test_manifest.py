@@ -0,0 +1,107 @@
+"""Tests for lizzy.manifest module."""
+
+from unittest.mock import patch
+
+import pytest
+
+from lizzy.manifest import (
+    build_manifest,
+    commands_fingerprint,
+    load_manifest,
+    manifest_path,
+    read_manifest,
+    write_manifest,
+)
+
+
+@pytest.fixture
+def manifest_file(tmp_path):
+    """Redirect the manifest cache to a temporary file."""
+    path = tmp_path / "manifest.json"
+    with patch("lizzy.manifest.manifest_path", return_value=path):
+        yield path
+
+
+class TestBuildManifest:
+    """Test build_manifest function."""
+
+    def test_build_manifest_describes_groups_and_subcommands(self):
+        """Test that groups list their subcommands, help and owning module."""
+        manifest = build_manifest()
+
+        aws = manifest["aws"]
+        assert aws["module"] == "commands.aws_commands"
+        assert aws["help"].startswith("Manage AWS operations")
+        assert set(aws["commands"]) == {
+            "authenticate",
+            "fargate-restart",
+            "fargate-restart-all",
+            "fargate-restart-matching",
+            "inventory",
+            "watch",
+        }
+
+    def test_build_manifest_records_options(self):
+        """Test that command options are recorded."""
+        manifest = build_manifest()
+
+        options = manifest["datadog"]["commands"]["bump-components"]["options"]
+        assert options[0]["name"] == "version"
+        assert options[0]["opts"] == ["--version"]
+        assert options[0]["help"] == "Datadog version to bump to"
+
+
+class TestManifestCache:
+    """Test manifest caching and invalidation."""
+
+    def test_manifest_path_is_in_config_dir(self):
+        """Test that the manifest is cached under ~/.lizzy."""
+        assert manifest_path().parent.name == ".lizzy"
+
+    def test_load_manifest_writes_cache_on_first_run(self, manifest_file):
+        """Test that the first load builds and caches the manifest."""
+        manifest = load_manifest()
+
+        assert manifest_file.exists()
+        assert read_manifest(commands_fingerprint()) == manifest
+
+    def test_load_manifest_reuses_fresh_cache(self, manifest_file):
+        """Test that a fresh cache is used without rebuilding."""
+        write_manifest({"cached": {"module": "commands.x", "help": ""}})
+
+        with patch("lizzy.manifest.build_manifest") as mock_build:
+            manifest = load_manifest()
+
+        mock_build.assert_not_called()
+        assert manifest == {"cached": {"module": "commands.x", "help": ""}}
+
+    def test_read_manifest_rejects_changed_module_mtime(self, manifest_file):
+        """Test that touching a command module invalidates the cache."""
+        fingerprint = commands_fingerprint()
+        write_manifest({}, fingerprint)
+        changed = {
+            "version": fingerprint["version"],
+            "modules": {**fingerprint["modules"], "aws_commands.py": 0},
+        }
+
+        assert read_manifest(changed) is None
+
+    def test_read_manifest_rejects_changed_version(self, manifest_file):
+        """Test that a package version bump invalidates the cache."""
+        fingerprint = commands_fingerprint()
+        write_manifest({}, fingerprint)
+
+        assert read_manifest({**fingerprint, "version": "0.0.0"}) is None
+
+    def test_read_manifest_handles_corrupt_cache(self, manifest_file):
+        """Test that a corrupt cache is treated as missing."""
+        manifest_file.write_text("{not json")
+
+        assert read_manifest(commands_fingerprint()) is None
+
+    def test_load_manifest_survives_unwritable_cache(self, manifest_file):
+        """Test that failing to write the cache still returns a manifest."""
+        with patch("lizzy.manifest.write_manifest", side_effect=OSError):
+            manifest = load_manifest()
+
+        assert "aws" in manifest
@@ -0,0 +1,196 @@
+"""Tests for lizzy.output module."""
+
+import io
+import json
+from unittest.mock import patch
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from lizzy import output
+from lizzy.cli import ASCII_ART, lizzy
+
+
+def records(text: str) -> list:
+    """Parse NDJSON output into a list of records."""
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class TestMode:
+    """Test output mode selection."""
+
+    def test_defaults_to_text(self):
+        """Test that machine output has to be asked for."""
+        assert output.current_mode() == "text"
+
+    def test_reset_restores_the_previous_mode(self):
+        """Test that a mode only lasts until its token is reset."""
+        token = output.set_mode("json")
+        assert output.is_machine()
+
+        output.reset_mode(token)
+
+        assert output.current_mode() == "text"
+
+
+class TestNdjsonStream:
+    """Test the NDJSON stdout wrapper."""
+
+    def test_lines_become_message_records(self):
+        """Test that each written line is one record and blank lines are dropped."""
+        raw = io.StringIO()
+        output.set_mode("json")
+        stream = output.NdjsonStream(raw)
+
+        stream.write("first\n\nsecond")
+        stream.flush()
+
+        assert records(raw.getvalue()) == [
+            {"type": "message", "text": "first"},
+            {"type": "message", "text": "second"},
+        ]
+
+    def test_passes_through_in_text_mode(self):
+        """Test that text mode output is written unchanged."""
+        raw = io.StringIO()
+        output.set_mode("text")
+        output.NdjsonStream(raw).write("plain\n")
+
+        assert raw.getvalue() == "plain\n"
+
+
+class FakeConsole:
+    """Console answering prompts from a list of lines."""
+
+    isatty = False
+
+    def __init__(self, *lines, secret=""):
+        self.stdout = io.StringIO()
+        self.stderr = io.StringIO()
+        self.lines = list(lines)
+        self.secret = secret
+        self.secret_prompts = []
+
+    def readline(self) -> str:
+        return self.lines.pop(0) if self.lines else ""
+
+    def getpass(self, prompt: str) -> str:
+        self.secret_prompts.append(prompt)
+        return self.secret
+
+
+class TestConsole:
+    """Test output and prompts redirected to a console."""
+
+    def test_echo_writes_to_the_console(self):
+        """Test that echo and emit follow the redirected console."""
+        console = FakeConsole()
+        with output.redirect(console):
+            output.echo("out")
+            output.echo("err", err=True)
+            output.emit("version", "Version 1", version="1")
+
+        assert console.stdout.getvalue() == "out\nVersion 1\n"
+        assert console.stderr.getvalue() == "err\n"
+
+    def test_prompt_converts_and_retries(self):
+        """Test that invalid answers are reported and asked again."""
+        console = FakeConsole("abc\n", "3\n")
+        with output.redirect(console):
+            assert output.prompt("Pick", type=int) == 3
+
+        assert console.stdout.getvalue() == "Pick: Pick: "
+        assert "not a valid integer" in console.stderr.getvalue()
+
+    def test_prompt_uses_the_default_for_an_empty_answer(self):
+        """Test that Enter picks the shown default."""
+        console = FakeConsole("\n")
+        with output.redirect(console):
+            assert output.prompt("Region", default="eu-west-1") == "eu-west-1"
+
+        assert console.stdout.getvalue() == "Region [eu-west-1]: "
+
+    def test_hidden_prompt_uses_getpass(self):
+        """Test that hidden input is read through the console's getpass."""
+        console = FakeConsole(secret="hunter2")
+        with output.redirect(console):
+            assert output.prompt("Password", hide_input=True) == "hunter2"
+
+        assert console.secret_prompts == ["Password: "]
+
+    @pytest.mark.parametrize("answer, expected", [("y\n", True), ("no\n", False), ("\n", False)])
+    def test_confirm(self, answer, expected):
+        """Test that confirm accepts y/n and defaults to no."""
+        with output.redirect(FakeConsole(answer)):
+            assert output.confirm("Continue?") is expected
+
+    def test_confirm_aborts(self):
+        """Test that abort=True raises on a negative answer."""
+        with output.redirect(FakeConsole("n\n")), pytest.raises(click.Abort):
+            output.confirm("Continue?", abort=True)
+
+    def test_end_of_input_aborts(self):
+        """Test that a closed client stdin aborts the prompt."""
+        with output.redirect(FakeConsole()), pytest.raises(click.Abort):
+            output.prompt("Name")
+
+    @patch("click.prompt", return_value="local")
+    def test_prompt_without_console_uses_click(self, mock_prompt):
+        """Test that the terminal is asked through click.prompt."""
+        assert output.prompt("Name", default="x") == "local"
+        mock_prompt.assert_called_once_with("Name", default="x")
+
+
+class TestMachineModeCLI:
+    """Test the --output option of the root group."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.runner = CliRunner()
+
+    @patch("lizzy.helpers.datadog.get_fetch_versions")
+    def test_json_output_is_ndjson_without_banner(self, mock_get_versions):
+        """Test that every stdout line is a JSON record and the banner is skipped."""
+        mock_get_versions.return_value = ["7.50.0", "7.51.0"]
+
+        result = self.runner.invoke(
+            lizzy, ["--output", "json", "datadog", "fetch-versions"]
+        )
+
+        assert result.exit_code == 0
+        assert "Build by Joeri Abbo" not in result.output
+        assert records(result.output) == [
+            {"type": "message", "text": "Fetching Datadog versions..."},
+            {"type": "version", "version": "7.50.0"},
+            {"type": "version", "version": "7.51.0"},
+        ]
+
+    def test_piped_output_stays_text(self, monkeypatch):
+        """Test that a non-terminal stdout does not switch to machine mode."""
+        monkeypatch.delenv("LIZZY_OUTPUT")
+
+        result = self.runner.invoke(lizzy, ["self", "config", "--help"])
+
+        assert ASCII_ART.strip() in result.output
+
+    def test_mode_does_not_outlive_the_invocation(self):
+        """Test that --output json is reset once the command finishes."""
+        self.runner.invoke(lizzy, ["--output", "json"])
+
+        assert output.current_mode() == "text"
+
+    def test_no_command_lists_commands_as_records(self):
+        """Test that machine mode lists commands instead of rendering help."""
+        result = self.runner.invoke(lizzy, ["--output", "json"])
+
+        assert result.exit_code == 0
+        names = [r["name"] for r in records(result.output) if r["type"] == "command"]
+        assert "aws" in names
+        assert "aws authenticate" in names
+
+    def test_text_output_shows_banner(self):
+        """Test that text mode keeps the banner."""
+        result = self.runner.invoke(lizzy, ["--output", "text", "self", "config", "--help"])
+
+        assert "Build by Joeri Abbo" in result.output
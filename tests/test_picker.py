@@ -0,0 +1,66 @@
+"""Tests for lizzy.helpers.picker module."""
+
+from unittest.mock import patch
+
+import click
+import pytest
+
+from lizzy.helpers.picker import FuzzyIndex, pick, resolve
+
+SERVICES = [
+    "arn:aws:ecs:eu-west-1:1:service/prod/api-gateway",
+    "arn:aws:ecs:eu-west-1:1:service/prod/payments-api",
+    "arn:aws:ecs:eu-west-1:1:service/prod/worker",
+    "arn:aws:ecs:eu-west-1:1:service/prod/api",
+]
+
+
+class TestFuzzyIndex:
+    """Test the FuzzyIndex class."""
+
+    def test_substring_matches_rank_prefix_and_short_names_first(self):
+        """Test that substring matches are ranked by prefix, then length."""
+        names = [c.rsplit("/", 1)[-1] for c in FuzzyIndex(SERVICES).search("api")]
+
+        assert names == ["api", "api-gateway", "payments-api"]
+
+    def test_falls_back_to_subsequence_matches(self):
+        """Test that abbreviations match through the subsequence fallback."""
+        index = FuzzyIndex(SERVICES)
+
+        assert index.search("apgw") == [SERVICES[0]]
+        assert index.search("wk") == [SERVICES[2]]
+        assert index.search("zzz") == []
+
+    def test_empty_query_keeps_order(self):
+        """Test that an empty query returns every candidate."""
+        assert FuzzyIndex(SERVICES).search("", limit=2) == SERVICES[:2]
+
+
+class TestResolve:
+    """Test the resolve function."""
+
+    def test_exact_name_wins_over_glob(self):
+        """Test that an exact name selects one service even if it is a prefix."""
+        assert resolve(SERVICES, "api") == [SERVICES[3]]
+        assert resolve(SERVICES, "api*") == [SERVICES[0], SERVICES[3]]
+        assert resolve(SERVICES, SERVICES[2]) == [SERVICES[2]]
+
+
+class TestPick:
+    """Test the keystroke picker."""
+
+    @patch("lizzy.helpers.picker.output.echo")
+    @patch("lizzy.helpers.picker.click.getchar")
+    def test_typing_narrows_and_enter_picks(self, mock_getchar, mock_echo):
+        """Test that typed characters filter and arrows move the selection."""
+        mock_getchar.side_effect = list("api") + ["\x1b[B", "\r"]
+
+        assert pick(SERVICES, "Select a service") == SERVICES[0]
+
+    @patch("lizzy.helpers.picker.output.echo")
+    @patch("lizzy.helpers.picker.click.getchar", return_value="\x03")
+    def test_ctrl_c_aborts(self, mock_getchar, mock_echo):
+        """Test that Ctrl-C aborts the picker."""
+        with pytest.raises(click.Abort):
+            pick(SERVICES, "Select a service")
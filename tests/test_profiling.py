@@ -0,0 +1,165 @@
+"""Tests for lizzy.profiling module."""
+
+import http.server
+import json
+import sys
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from lizzy import profiling
+from lizzy.cli import lizzy
+
+
+@pytest.fixture
+def profiler():
+    """Run a profiler for the duration of a test."""
+    running = profiling.start()
+    yield running
+    profiling.stop()
+
+
+@pytest.fixture
+def http_server():
+    """Serve a small JSON body on localhost."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = b'{"ok": true}'
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+class TestRunProfiler:
+    """Test span recording."""
+
+    def test_phase_is_noop_when_not_profiling(self):
+        """Test that phase() does nothing without an active profiler."""
+        with profiling.phase("idle"):
+            pass
+        assert profiling.active() is None
+
+    def test_phases_record_nesting(self, profiler):
+        """Test that nested phases record their depth."""
+        with profiling.phase("outer"), profiling.phase("inner"):
+            pass
+
+        outer, inner = profiler.spans
+        assert (outer.name, outer.depth) == ("outer", 0)
+        assert (inner.name, inner.depth) == ("inner", 1)
+        assert outer.start <= inner.start <= inner.end <= outer.end
+
+    def test_records_new_imports(self, profiler):
+        """Test that modules imported while profiling are recorded."""
+        sys.modules.pop("colorsys", None)
+        import colorsys  # noqa: F401
+
+        assert "colorsys" in [s.name for s in profiler.spans if s.kind == "import"]
+
+    def test_records_http_calls(self, profiler, http_server):
+        """Test that HTTP requests are timed with their byte counts."""
+        import requests
+
+        requests.get(f"{http_server}/tags?page=1")
+
+        (call,) = [s for s in profiler.spans if s.kind == "http"]
+        assert call.info["method"] == "GET"
+        assert call.info["path"] == "/tags"
+        assert call.info["status"] == 200
+        assert call.info["received"] == len(b'{"ok": true}')
+
+    def test_stop_restores_hooks(self, http_server):
+        """Test that stopping the profiler removes its hooks."""
+        import builtins
+
+        import urllib3.connectionpool
+
+        original_import = builtins.__import__
+        original_urlopen = urllib3.connectionpool.HTTPConnectionPool.urlopen
+        profiling.start()
+        profiling.stop()
+
+        assert builtins.__import__ is original_import
+        assert urllib3.connectionpool.HTTPConnectionPool.urlopen is original_urlopen
+
+
+class TestReports:
+    """Test report formats."""
+
+    def test_summary_table_lists_phases_and_hosts(self, profiler, http_server):
+        """Test that the table has a row per phase and per HTTP host."""
+        import requests
+
+        with profiling.phase("fetch"):
+            requests.get(http_server)
+        profiling.stop()
+
+        table = profiler.summary_table()
+        assert "fetch" in table
+        assert "127.0.0.1" in table
+
+    def test_speedscope_events_are_balanced(self, profiler):
+        """Test that every opened frame is closed in order."""
+        with profiling.phase("outer"), profiling.phase("inner"):
+            pass
+        profiling.stop()
+
+        trace = profiler.to_speedscope()
+        stack = []
+        for event in trace["profiles"][0]["events"]:
+            if event["type"] == "O":
+                stack.append(event["frame"])
+            else:
+                assert stack.pop() == event["frame"]
+        assert stack == []
+        assert [f["name"] for f in trace["shared"]["frames"]] == [
+            "phase: outer",
+            "phase: inner",
+        ]
+
+
+class TestProfileRunOption:
+    """Test the --profile-run root option."""
+
+    def test_prints_table_to_stderr(self):
+        """Test that the default report is a table on stderr."""
+        result = CliRunner().invoke(lizzy, ["--profile-run", "aws", "--help"])
+
+        assert result.exit_code == 0
+        assert "Total wall time" in result.stderr
+        assert "command" in result.stderr
+        assert profiling.active() is None
+
+    def test_writes_json_trace(self, tmp_path):
+        """Test that --profile-format json writes the spans to a file."""
+        path = tmp_path / "profile.json"
+        result = CliRunner().invoke(
+            lizzy,
+            [
+                "--profile-run",
+                "--profile-format",
+                "json",
+                "--profile-output",
+                str(path),
+                "aws",
+                "--help",
+            ],
+        )
+
+        assert result.exit_code == 0
+        names = [span["name"] for span in json.loads(path.read_text())["spans"]]
+        assert "command" in names
@@ -0,0 +1,59 @@
+"""Cold-start benchmarks for the lizzy CLI."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Generous enough for a loaded CI runner, far below the ~0.5s that importing
+# boto3 and gimme_aws_creds costs on a developer laptop.
+STARTUP_BUDGET_SECONDS = 0.25
+
+HEAVY_MODULES = ["boto3", "botocore", "gimme_aws_creds", "gitlab", "chef"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from lizzy.cli import lizzy
+try:
+    lizzy.main(args={args!r}, prog_name="lizzy", standalone_mode=False)
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+sys.stderr.write(json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+"""
+
+
+def run_probe(args: list) -> dict:
+    """Run the CLI in a fresh interpreter and return its timing and imports."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(args=args, heavy=HEAVY_MODULES)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stderr.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("args", [["--help"], ["aws", "--help"]])
+class TestColdStart:
+    """Enforce the cold-start budget for help output."""
+
+    def test_help_does_not_import_heavy_modules(self, args):
+        """Test that rendering help never imports SDK helper modules."""
+        probe = run_probe(args)
+
+        assert probe["heavy"] == []
+
+    def test_help_within_startup_budget(self, args):
+        """Test that rendering help stays within the cold-start budget."""
+        # Best of three to smooth out interpreter and filesystem noise.
+        elapsed = min(run_probe(args)["elapsed"] for _ in range(3))
+
+        assert elapsed < STARTUP_BUDGET_SECONDS
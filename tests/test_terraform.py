@@ -108,10 +108,9 @@ class TestGetWorkspaces:
 
     @patch("lizzy.helpers.terraform.get_organization")
     @patch("lizzy.helpers.terraform.get_request")
-    @patch("builtins.print")
     @patch("click.echo")
     def test_get_workspaces_returns_all_workspaces(
-        self, mock_echo, mock_print, mock_get_request, mock_get_org
+        self, mock_echo, mock_get_request, mock_get_org
     ):
         """Test that get_workspaces returns all workspaces with pagination."""
         mock_get_org.return_value = "test-org"
@@ -141,9 +140,9 @@ class TestGetWorkspaces:
 
     @patch("lizzy.helpers.terraform.get_organization")
     @patch("lizzy.helpers.terraform.get_request")
-    @patch("builtins.print")
+    @patch("click.echo")
     def test_get_workspaces_handles_single_page(
-        self, mock_print, mock_get_request, mock_get_org
+        self, mock_echo, mock_get_request, mock_get_org
     ):
         """Test that get_workspaces handles single page response."""
         mock_get_org.return_value = "test-org"